@@ -0,0 +1,237 @@
+"""Benchmark offline dos comandos da planilha, com uma aba sintética.
+
+Gera abas falsas (1k, 10k e 100k linhas por padrão), executa a lógica dos
+comandos de `SpreadsheetCommands` com uma worksheet e uma interação falsas e
+mede a latência e o pico de memória de cada comando. Também compara a memória
+retida pelas linhas como listas de listas com a da `TabelaColunar`. Não acessa a rede.
+
+Uso:
+    python -m benchmarks.benchmark_planilha --linhas 1000 10000 --saida resultado.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+# As assinaturas e o snapshot salvo do benchmark não devem tocar nos arquivos reais
+os.environ.setdefault("ASSINATURAS_DB", ":memory:")
+os.environ.setdefault("SNAPSHOT_DB", os.path.join(tempfile.mkdtemp(), "snapshot.db"))  # SQLite em memória não é compartilhado entre conexões
+
+from cogs.spreadsheet_cmds import SpreadsheetCommands  # noqa: E402
+from planilha import IndiceDePlanilha, TabelaColunar  # noqa: E402
+
+# --- Distribuições da aba sintética ---
+# Pesos aproximados de uma aba real: a maior parte já foi entregue.
+STATUS = {
+    "01 Escanear": 4, "03 Traduzir": 10, "04 Revisar": 4, "04 Revisão": 4, "05 Imprimir": 5,
+    "07 Assinar Digitalmente": 2, "08 Assinar e Imprimir": 2, "09 Pronto": 6, "10 Numerar": 1,
+    "11 Entregue": 40, "12 Enviar e-mail": 3, "13 Stand by": 1, "14 Aguardando Orig.": 1,
+    "15 Cart.Tradução ": 2, "16 Cart. Original": 1, "17 Conferência": 2, "18 Tradução Externa": 2,
+    "19 Embalar": 3, "20 Cancelado": 3,
+}
+NOMES = ["João", "Maria", "José", "Ana", "Antônio", "Francisca", "Conceição", "Luís", "Márcia", "Sebastião", "Lúcia", "Empresa"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Pereira", "Conceição", "Araújo", "Gonçalves", "Ltda", "Ribeiro"]
+
+
+def gerar_linhas(quantidade: int, semente: int = 42) -> list[list[str]]:
+    """Aba no mesmo formato de `get_all_values()`: cabeçalho + linhas de A a H."""
+    aleatorio = random.Random(semente)
+    hoje = date.today()
+    status, pesos = list(STATUS), list(STATUS.values())
+    linhas = [["Entrada", "Entrega", "Cliente", "Orçamento", "Qtd. Documentos", "Valor", "Obs.", "Status"]]
+    for i in range(quantidade):
+        entrega = hoje + timedelta(days=round(aleatorio.gauss(0, 12)))
+        sorteio = aleatorio.random()
+        if sorteio < 0.02:
+            data_entrega = ""  # Sem data
+        elif sorteio < 0.025:
+            data_entrega = "a combinar"  # Texto inválido
+        else:
+            data_entrega = entrega.strftime("%d/%m")
+        cliente = f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.randint(1, quantidade // 3 + 1)}"
+        linhas.append([
+            (entrega - timedelta(days=7)).strftime("%d/%m"),
+            data_entrega,
+            cliente,
+            str(10000 + i),
+            str(min(int(aleatorio.expovariate(0.4)) + 1, 40)),
+            f"{aleatorio.randint(50, 3000)},00",
+            "",
+            aleatorio.choices(status, pesos)[0],
+        ])
+    return linhas
+
+
+# --- Objetos falsos ---
+class WorksheetFalsa:
+    """Imita as leituras do gspread usadas pelo bot, a partir de uma lista em memória."""
+
+    def __init__(self, linhas: list[list[str]]):
+        self.linhas = linhas
+        self.title = "BENCH"
+
+    def get_all_values(self):
+        return [list(linha) for linha in self.linhas]
+
+    def batch_get(self, intervalos, **kwargs):
+        resultado = []
+        for intervalo in intervalos:
+            if ":" in intervalo:  # Colunas inteiras, ex: "A:H"
+                inicio, fim = (ord(c) - ord("A") for c in intervalo.split(":"))
+                valores = [linha[inicio:fim + 1] for linha in self.linhas]
+            else:  # Uma célula, ex: "D12" (vazia ou fora da aba vem como [])
+                coluna, numero = ord(intervalo[0]) - ord("A"), int(intervalo[1:])
+                valor = self.linhas[numero - 1][coluna] if numero <= len(self.linhas) else ""
+                valores = [[valor]] if valor else []
+            resultado.append(valores)
+        return resultado
+
+    def cell(self, linha, coluna):
+        class Celula:
+            value = self.linhas[linha - 1][coluna - 1]
+        return Celula()
+
+
+class _Resposta:
+    async def defer(self, **kwargs):
+        pass
+
+    async def send_message(self, *args, **kwargs):
+        pass
+
+
+class _Followup:
+    def __init__(self):
+        self.enviadas: list[dict] = []  # Argumentos de cada mensagem enviada
+
+    async def send(self, *args, **kwargs):
+        self.enviadas.append({"conteudo": args[0] if args else kwargs.get("content"), **kwargs})
+        return None
+
+
+class _Usuario:
+    id = 1
+    mention = "<@1>"
+
+
+class InteracaoFalsa:
+    def __init__(self):
+        self.response = _Resposta()
+        self.followup = _Followup()
+        self.user = _Usuario()
+        self.channel_id = 1
+        self.guild_id = 1
+        self.extras = {}
+
+
+# --- Medição ---
+async def medir(funcao, repeticoes: int) -> dict:
+    """Latência sem o tracemalloc (que deixa tudo mais lento) e, numa execução à parte, o pico de memória."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        await funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tracemalloc.start()
+    await funcao()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "mediana_ms": round(statistics.median(tempos), 3),
+        "min_ms": round(min(tempos), 3),
+        "max_ms": round(max(tempos), 3),
+        "pico_memoria_kb": round(pico / 1024, 1),
+    }
+
+
+def medir_memoria_retida(linhas: list[list[str]]) -> dict:
+    """Memória que fica ocupada depois de montar cada formato (e não o pico durante a montagem).
+
+    As linhas passam por JSON para que cada célula seja uma string nova, como as que chegam da API.
+    """
+    serializado = json.dumps(linhas)
+
+    def retida(montar) -> float:
+        tracemalloc.start()
+        resultado = montar()  # noqa: F841 (mantido vivo até a medição)
+        atual = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return round(atual / 1024, 1)
+
+    tabela = TabelaColunar(json.loads(serializado))
+    return {
+        "listas_kb": retida(lambda: json.loads(serializado)),
+        "colunar_kb": retida(lambda: TabelaColunar(json.loads(serializado))),
+        "indices_kb": retida(lambda: IndiceDePlanilha(tabela)),
+        "estimativa_colunar_kb": round(tabela.memoria() / 1024, 1),
+    }
+
+
+async def rodar(quantidade: int, repeticoes: int) -> dict:
+    linhas = gerar_linhas(quantidade)
+    cog = SpreadsheetCommands(bot=None)
+    cog.worksheet = WorksheetFalsa(linhas)
+    data_limite = (date.today() + timedelta(days=7)).strftime("%d/%m")
+    id_existente = linhas[len(linhas) // 2][3]
+
+    async def carregar():
+        cog.sincronizador.esquecer()  # Força um download completo
+        snapshot = await cog.cache.atualizar()
+        snapshot.indice.preparar_autocomplete()
+        snapshot.painel
+
+    comandos = {
+        "verificar": lambda: SpreadsheetCommands.verificar.callback(cog, InteracaoFalsa()),
+        "atrasados": lambda: SpreadsheetCommands.atrasados.callback(cog, InteracaoFalsa()),
+        "listar_status": lambda: SpreadsheetCommands.listar_status.callback(cog, InteracaoFalsa(), "03 Traduzir"),
+        "traducoes_ate": lambda: SpreadsheetCommands.traducoes_ate.callback(cog, InteracaoFalsa(), data_limite),
+        "buscar_orcamento": lambda: SpreadsheetCommands.buscar_orcamento.callback(cog, InteracaoFalsa(), id_existente),
+        "painel": lambda: SpreadsheetCommands.painel.callback(cog, InteracaoFalsa()),
+    }
+
+    resultados = {"memoria_retida": medir_memoria_retida(linhas), "carregar_snapshot": await medir(carregar, repeticoes)}
+    for nome, comando in comandos.items():
+        resultados[nome] = await medir(comando, repeticoes)
+    cog.acesso.fechar()
+    return resultados
+
+
+async def principal(argumentos) -> dict:
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "repeticoes": argumentos.repeticoes,
+        "resultados": {},
+    }
+    for quantidade in argumentos.linhas:
+        print(f"Medindo aba com {quantidade} linhas...", file=sys.stderr)
+        relatorio["resultados"][str(quantidade)] = await rodar(quantidade, argumentos.repeticoes)
+    return relatorio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline dos comandos da planilha.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1000, 10000, 100000], help="Tamanhos das abas sintéticas.")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções de cada comando por tamanho.")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: imprime na tela).")
+    argumentos = parser.parse_args()
+
+    relatorio = asyncio.run(principal(argumentos))
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if argumentos.saida:
+        with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
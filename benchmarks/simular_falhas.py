@@ -0,0 +1,148 @@
+"""Simula o Google Sheets instável para conferir as novas tentativas, o disjuntor e o snapshot de reserva.
+
+Envolve a worksheet falsa do benchmark em uma `WorksheetInstavel`, que injeta
+latência e erros 429/503 (no mesmo formato do `APIError` do gspread), e roda
+o /verificar em três fases:
+
+- instavel: parte das chamadas falha; as novas tentativas devem esconder isso.
+- fora_do_ar: todas falham; o disjuntor abre e o último snapshot é servido com aviso.
+- recuperacao: o Google volta; o circuito fecha e os dados voltam a ser atualizados.
+
+Os tempos (esperas, disjuntor, idade do snapshot) são encurtados para a simulação
+rodar em poucos segundos. Não acessa a rede.
+
+Uso:
+    python -m benchmarks.simular_falhas --taxa-de-falha 0.3 --latencia 0.01
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+# As assinaturas e o snapshot salvo da simulação não devem tocar nos arquivos reais
+os.environ.setdefault("ASSINATURAS_DB", ":memory:")
+os.environ.setdefault("SNAPSHOT_DB", os.path.join(tempfile.mkdtemp(), "snapshot.db"))  # SQLite em memória não é compartilhado entre conexões
+
+from benchmarks.benchmark_planilha import InteracaoFalsa, WorksheetFalsa, gerar_linhas  # noqa: E402
+from cogs.spreadsheet_cmds import SpreadsheetCommands  # noqa: E402
+from planilha import DisjuntorDeCircuito, PoliticaDeRetentativa  # noqa: E402
+
+
+# --- Falhas Injetadas ---
+class ErroSimuladoDaApi(Exception):
+    """Imita o `APIError` do gspread: `code` e `response` (com Retry-After, se informado)."""
+
+    def __init__(self, codigo: int, retry_after: float | None = None):
+        super().__init__(f"APIError: [{codigo}] erro simulado")
+        self.code = codigo
+        cabecalhos = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=codigo, headers=cabecalhos)
+
+
+class WorksheetInstavel:
+    """Envolve uma worksheet e injeta latência e falhas em cada chamada.
+
+    As chamadas rodam nas threads do `AcessoPlanilha`, por isso a latência usa `time.sleep`.
+    Com `fora_do_ar`, todas as chamadas falham.
+    """
+
+    def __init__(self, worksheet, taxa_de_falha: float = 0.0, latencia: float = 0.0,
+                 codigos: tuple[int, ...] = (429, 503), semente: int = 0):
+        self.worksheet = worksheet
+        self.title = worksheet.title
+        self.taxa_de_falha = taxa_de_falha
+        self.latencia = latencia
+        self.codigos = codigos
+        self.fora_do_ar = False
+        self.chamadas = 0
+        self.falhas = 0
+        self._aleatorio = random.Random(semente)
+
+    def _talvez_falhar(self):
+        self.chamadas += 1
+        if self.latencia:
+            time.sleep(self.latencia)
+        if self.fora_do_ar or self._aleatorio.random() < self.taxa_de_falha:
+            self.falhas += 1
+            raise ErroSimuladoDaApi(self._aleatorio.choice(self.codigos))
+
+    def batch_get(self, *args, **kwargs):
+        self._talvez_falhar()
+        return self.worksheet.batch_get(*args, **kwargs)
+
+    def cell(self, *args, **kwargs):
+        self._talvez_falhar()
+        return self.worksheet.cell(*args, **kwargs)
+
+
+# --- Fases da Simulação ---
+async def rodar_fase(cog, worksheet: WorksheetInstavel, comandos: int) -> dict:
+    """Roda o /verificar `comandos` vezes (cada um força uma sincronização) e resume o que os usuários viram."""
+    chamadas, falhas = worksheet.chamadas, worksheet.falhas
+    respostas = {"com_dados_atuais": 0, "com_dados_antigos": 0, "erros": 0}
+    inicio = time.perf_counter()
+    for _ in range(comandos):
+        cog.sincronizador.esquecer()  # Cada comando encontra o snapshot vencido e tenta baixar de novo
+        interacao = InteracaoFalsa()
+        await SpreadsheetCommands.verificar.callback(cog, interacao)
+        mensagem = interacao.followup.enviadas[-1]
+        rodape = mensagem["embed"].footer.text if mensagem.get("embed") else ""
+        if mensagem["conteudo"] and mensagem["conteudo"].startswith("Ocorreu um erro"):
+            respostas["erros"] += 1
+        elif rodape and "indisponível" in rodape:
+            respostas["com_dados_antigos"] += 1
+        else:
+            respostas["com_dados_atuais"] += 1
+        await asyncio.sleep(0.02)
+    return {
+        "comandos": comandos,
+        **respostas,
+        "chamadas_api": worksheet.chamadas - chamadas,
+        "falhas_injetadas": worksheet.falhas - falhas,
+        "circuito": cog.acesso.disjuntor.estado,
+        "aberturas_do_circuito": cog.acesso.disjuntor.aberturas,
+        "duracao_s": round(time.perf_counter() - inicio, 2),
+    }
+
+
+async def principal(argumentos) -> dict:
+    worksheet = WorksheetInstavel(WorksheetFalsa(gerar_linhas(argumentos.linhas)), argumentos.taxa_de_falha,
+                                  argumentos.latencia, semente=argumentos.semente)
+    cog = SpreadsheetCommands(bot=None)
+    cog.worksheet = worksheet
+    cog.cache.idade_maxima = 0  # Todo comando tenta sincronizar
+    cog.acesso.politica = PoliticaDeRetentativa(tentativas=3, base=0.01, maximo=0.05, espera_cota=0.05)
+    cog.acesso.disjuntor = DisjuntorDeCircuito(limite_falhas=5, tempo_aberto=argumentos.tempo_aberto)
+
+    await cog.cache.atualizar()  # Primeiro snapshot bom
+    relatorio = {"instavel": await rodar_fase(cog, worksheet, argumentos.comandos)}
+
+    worksheet.fora_do_ar = True
+    relatorio["fora_do_ar"] = await rodar_fase(cog, worksheet, argumentos.comandos)
+
+    worksheet.fora_do_ar = False
+    worksheet.taxa_de_falha = 0
+    await asyncio.sleep(argumentos.tempo_aberto)
+    relatorio["recuperacao"] = await rodar_fase(cog, worksheet, argumentos.comandos)
+    cog.acesso.fechar()
+    return relatorio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula falhas do Google Sheets (sem rede).")
+    parser.add_argument("--linhas", type=int, default=1000, help="Tamanho da aba sintética.")
+    parser.add_argument("--comandos", type=int, default=30, help="Comandos executados em cada fase.")
+    parser.add_argument("--taxa-de-falha", type=float, default=0.3, help="Fração das chamadas que falham na fase instável.")
+    parser.add_argument("--latencia", type=float, default=0.005, help="Latência injetada em cada chamada, em segundos.")
+    parser.add_argument("--tempo-aberto", type=float, default=0.5, help="Segundos que o disjuntor fica aberto.")
+    parser.add_argument("--semente", type=int, default=1)
+    argumentos = parser.parse_args()
+    print(json.dumps(asyncio.run(principal(argumentos)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Simula o bot dividido em processos (shards): um sincronizador e vários leitores com o mesmo armazém.
+
+O sincronizador lê uma worksheet falsa que conta as chamadas ao "Google" e
+publica cada snapshot em um SQLite temporário; os leitores só leem esse
+arquivo (cada um com as próprias conexões, como faria em outro processo).
+Para cada número de leitores, roda:
+
+- publicacao: primeira sincronização e primeira leitura de cada leitor.
+- ciclos: a aba muda a cada dois ciclos; o sincronizador sincroniza e os
+  leitores conferem o armazém. Confere se todos ficaram com os mesmos status.
+- escrita: um leitor muda um status; a mudança aparece nos outros leitores e
+  chega à planilha pelo sincronizador.
+
+O esperado é que `chamadas_sheets` não cresça com o número de leitores. Não acessa a rede.
+
+Uso:
+    python -m benchmarks.simular_shards --linhas 5000 --leitores 1 4 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# As assinaturas e o snapshot salvo da simulação não devem tocar nos arquivos reais
+os.environ.setdefault("ASSINATURAS_DB", ":memory:")
+os.environ.setdefault("SNAPSHOT_DB", os.path.join(tempfile.mkdtemp(), "snapshot.db"))  # SQLite em memória não é compartilhado entre conexões
+
+from benchmarks.benchmark_planilha import STATUS, InteracaoFalsa, WorksheetFalsa, gerar_linhas  # noqa: E402
+from cogs.spreadsheet_cmds import SpreadsheetCommands  # noqa: E402
+from planilha import ArmazemDeSnapshots  # noqa: E402
+
+
+class WorksheetContada(WorksheetFalsa):
+    """Worksheet falsa que conta as chamadas e aceita a gravação em lote da coluna H."""
+
+    def __init__(self, linhas: list[list[str]]):
+        super().__init__(linhas)
+        self.chamadas = 0
+
+    def batch_get(self, intervalos, **kwargs):
+        self.chamadas += 1
+        return super().batch_get(intervalos, **kwargs)
+
+    def batch_update(self, atualizacoes, **kwargs):
+        self.chamadas += 1
+        for atualizacao in atualizacoes:
+            self.linhas[int(atualizacao["range"][1:]) - 1][7] = atualizacao["values"][0][0]
+
+
+def _ms(inicio: float) -> float:
+    return round((time.perf_counter() - inicio) * 1000, 2)
+
+
+def _status(cog) -> list[str]:
+    tabela = cog.cache.snapshot.tabela
+    return [tabela.texto_status(posicao) for posicao in range(len(tabela))]
+
+
+async def rodar(quantidade_leitores: int, linhas: list[list[str]], ciclos: int, semente: int) -> dict:
+    aleatorio = random.Random(semente)
+    worksheet = WorksheetContada([list(linha) for linha in linhas])
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "snapshot.db")
+        sincronizador = SpreadsheetCommands(bot=None, papel="sincronizador")
+        sincronizador.armazem_snapshots = ArmazemDeSnapshots(caminho)
+        sincronizador.worksheet = worksheet
+        sincronizador.titulo_aba = worksheet.title
+        leitores = []
+        for _ in range(quantidade_leitores):
+            leitor = SpreadsheetCommands(bot=None, papel="leitor")
+            leitor.armazem_snapshots = ArmazemDeSnapshots(caminho)
+            leitores.append(leitor)
+
+        # --- Publicação ---
+        inicio = time.perf_counter()
+        await sincronizador._sincronizar()
+        relatorio = {"publicacao": {"sincronizar_e_publicar_ms": _ms(inicio)}}
+        tempos = []
+        for leitor in leitores:
+            inicio = time.perf_counter()
+            await leitor._acompanhar_sincronizador()
+            tempos.append(_ms(inicio))
+        relatorio["publicacao"]["primeira_leitura_ms"] = round(statistics.median(tempos), 2)
+        for leitor in leitores:
+            await SpreadsheetCommands.verificar.callback(leitor, InteracaoFalsa())
+            await SpreadsheetCommands.painel.callback(leitor, InteracaoFalsa())
+
+        # --- Ciclos ---
+        sem_mudanca, com_mudanca = [], []
+        divergentes = 0
+        status = list(STATUS)
+        for ciclo in range(ciclos):
+            mudou = ciclo % 2 == 1
+            if mudou:
+                for linha in aleatorio.sample(worksheet.linhas[1:], 20):
+                    linha[7] = aleatorio.choice(status)
+            await sincronizador._sincronizar()
+            for leitor in leitores:
+                inicio = time.perf_counter()
+                await leitor._acompanhar_sincronizador()
+                (com_mudanca if mudou else sem_mudanca).append(_ms(inicio))
+            esperado = _status(sincronizador)
+            divergentes += sum(_status(leitor) != esperado for leitor in leitores)
+        relatorio["ciclos"] = {
+            "ciclos": ciclos,
+            "leitura_sem_mudanca_ms": round(statistics.median(sem_mudanca), 2),
+            "leitura_com_mudanca_ms": round(statistics.median(com_mudanca), 2) if com_mudanca else None,
+            "leitores_divergentes": divergentes,
+        }
+
+        # --- Escrita encaminhada por um leitor ---
+        id_orcamento = worksheet.linhas[1][3]
+        await leitores[0]._mudar_status([id_orcamento], "19 Embalar")
+        for leitor in leitores[1:]:
+            await leitor._acompanhar_sincronizador()
+        vista_nos_leitores = all(
+            leitor.cache.snapshot.indice.buscar_id(id_orcamento).status == "19 Embalar" for leitor in leitores
+        )
+        await sincronizador.publicar_mudancas()
+        gravadas = await sincronizador.escrita.descarregar()
+        await sincronizador._sincronizar()
+        for leitor in leitores:
+            await leitor._acompanhar_sincronizador()
+        relatorio["escrita"] = {
+            "vista_em_todos_os_leitores": vista_nos_leitores,
+            "gravada_na_planilha": gravadas == 1 and worksheet.linhas[1][7] == "19 Embalar",
+            "fila_do_armazem_vazia": not sincronizador.armazem_snapshots.escritas_encaminhadas(),
+            "leitores_divergentes": sum(_status(leitor) != _status(sincronizador) for leitor in leitores),
+        }
+
+        relatorio["chamadas_sheets"] = worksheet.chamadas
+        for cog in (sincronizador, *leitores):
+            cog.assinaturas.fechar()
+            cog.acesso.fechar()
+        return relatorio
+
+
+async def principal(argumentos) -> dict:
+    linhas = gerar_linhas(argumentos.linhas)
+    resultado = {}
+    for quantidade in argumentos.leitores:
+        resultado[f"{quantidade}_leitores"] = await rodar(quantidade, linhas, argumentos.ciclos, argumentos.semente)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula um sincronizador e vários leitores (sem rede).")
+    parser.add_argument("--linhas", type=int, default=5000, help="Tamanho da aba sintética.")
+    parser.add_argument("--leitores", type=int, nargs="+", default=[1, 4, 8], help="Quantidades de leitores a simular.")
+    parser.add_argument("--ciclos", type=int, default=10, help="Ciclos de sincronização (a aba muda a cada dois).")
+    parser.add_argument("--semente", type=int, default=1)
+    argumentos = parser.parse_args()
+    print(json.dumps(asyncio.run(principal(argumentos)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
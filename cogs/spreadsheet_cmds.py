@@ -1,126 +1,706 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-import gspread
+import asyncio
 import json
 import os
-from datetime import datetime
-
-# --- Função Auxiliar de Formatação (Atualizada) ---
-def formatar_data_br(data_str: str) -> str:
-    """Tenta formatar uma string de data para o padrão dd/mm/YYYY."""
-    if not data_str: return "N/A"
-    try:
-        # Adiciona o ano atual se a string for apenas dd/mm
-        if len(data_str.strip()) <= 5:
-            ano_atual = datetime.now().year
-            data_completa_str = f"{data_str.strip()}/{ano_atual}"
-            dt_obj = datetime.strptime(data_completa_str, '%d/%m/%Y')
-            return dt_obj.strftime('%d/%m/%Y')
-        else:
-            # Tenta formatar a data completa se ela já tiver o ano
-            dt_obj = datetime.strptime(data_str, '%d/%m/%Y')
-            return dt_obj.strftime('%d/%m/%Y')
-    except:
-        return data_str
+import re
+import time as relogio
+from dataclasses import replace
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+from planilha import (ORDEM_DATA, ORDEM_PLANILHA, ORDEM_STATUS, POR_ORCAMENTO, POR_STATUS, STATUS_FINALIZADOS,
+                      AcessoPlanilha, ArmazemDeSnapshots, CacheDePlanilha, CentralDeAssinaturas, Consulta,
+                      DisjuntorDeCircuito, FilaDeEscrita, PlanilhaIndisponivel, PoliticaDeRetentativa, Publicacao, RegistroDeAbas,
+                      SincronizadorDePlanilha, TabelaColunar, calcular_resumo, consulta_atrasados, formatar_data_br,
+                      normalizar_status, normalizar_texto, parse_data_br, planejar, titulo_do_mes)
+from servicos import (ConsultasEmAndamento, LimitadorDeUso, LimiteDeUsoExcedido, ListaPreguicosa, Paginador,
+                      ler_limite, metricas)
+
+# --- Configuração da Planilha ---
+# Nome da planilha e aba fixa opcional. Sem PLANILHA_ABA, o bot usa a aba do mês corrente (ex: "OUT 25").
+NOME_PLANILHA = os.environ.get("PLANILHA_NOME", "@Status clientes 2025")
+ABA_FIXA = os.environ.get("PLANILHA_ABA", "")
+# Quantas abas de meses anteriores ficam abertas em memória ao mesmo tempo.
+MESES_EM_MEMORIA = int(os.environ.get("PLANILHA_MESES_EM_MEMORIA", 3))
+
+# --- Configuração do Cache da Planilha ---
+# Intervalo (em segundos) da atualização em segundo plano e idade máxima aceita para um snapshot.
+INTERVALO_ATUALIZACAO = int(os.environ.get("PLANILHA_INTERVALO_ATUALIZACAO", 120))
+IDADE_MAXIMA_SNAPSHOT = int(os.environ.get("PLANILHA_IDADE_MAXIMA", 300))
+# Threads dedicadas às chamadas do gspread e tempo máximo (em segundos) de cada chamada.
+MAX_THREADS_PLANILHA = int(os.environ.get("PLANILHA_MAX_THREADS", 4))
+TIMEOUT_PLANILHA = int(os.environ.get("PLANILHA_TIMEOUT", 30))
+# Novas tentativas para erros passageiros do Google (429, 5xx, timeout) e o disjuntor: depois de
+# PLANILHA_CIRCUITO_FALHAS falhas seguidas, as chamadas ficam suspensas por PLANILHA_CIRCUITO_SEGUNDOS.
+TENTATIVAS_PLANILHA = int(os.environ.get("PLANILHA_TENTATIVAS", 3))
+CIRCUITO_FALHAS = int(os.environ.get("PLANILHA_CIRCUITO_FALHAS", 5))
+CIRCUITO_SEGUNDOS = int(os.environ.get("PLANILHA_CIRCUITO_SEGUNDOS", 60))
+# Espera máxima (em segundos) entre as tentativas de reconexão em segundo plano.
+RECONEXAO_ESPERA_MAXIMA = int(os.environ.get("PLANILHA_RECONEXAO_ESPERA_MAXIMA", 300))
+# Arquivo SQLite com o último snapshot, usado para responder logo após reiniciar.
+CAMINHO_SNAPSHOT = os.environ.get("SNAPSHOT_DB", "snapshot.db")
+
+# --- Configuração dos Processos (Shards) ---
+# Com o bot dividido em vários processos, só um é o "sincronizador": acessa o Google e publica cada snapshot
+# em SNAPSHOT_DB. Os demais são "leitor": conferem o SNAPSHOT_DB a cada PLANILHA_INTERVALO_LEITURA segundos
+# e encaminham por ele as mudanças de status, sem nenhuma chamada ao Google.
+PAPEL_PLANILHA = os.environ.get("PLANILHA_PAPEL", "sincronizador")
+INTERVALO_LEITURA = int(os.environ.get("PLANILHA_INTERVALO_LEITURA", 10))
+
+# --- Configuração do Resumo Agendado ---
+# Canal que recebe o resumo (0 = desativado), horários "HH:MM,HH:MM" e fuso horário.
+RESUMO_CANAL_ID = int(os.environ.get("RESUMO_CANAL_ID", 0))
+RESUMO_FUSO = ZoneInfo(os.environ.get("RESUMO_FUSO", "America/Sao_Paulo"))
+# Responsáveis por status, avisados por DM: "id_usuario=03 Traduzir|04 Revisão;id_usuario=05 Imprimir"
+RESUMO_RESPONSAVEIS = os.environ.get("RESUMO_RESPONSAVEIS", "")
+
+
+def ler_horarios(texto: str) -> list[time]:
+    """Converte '08:00,13:30' em horários no fuso do resumo."""
+    horarios = []
+    for pedaco in texto.split(","):
+        horas, minutos = pedaco.strip().split(":")
+        horarios.append(time(int(horas), int(minutos), tzinfo=RESUMO_FUSO))
+    return horarios
+
+
+def ler_responsaveis(texto: str) -> dict[int, set[str]]:
+    """Converte 'id=status|status;id=status' em {id_usuario: {status normalizados}}."""
+    responsaveis = {}
+    for entrada in texto.split(";"):
+        if "=" not in entrada:
+            continue
+        usuario, status = entrada.split("=", 1)
+        responsaveis[int(usuario.strip())] = {normalizar_status(s) for s in status.split("|") if s.strip()}
+    return responsaveis
+
+
+RESUMO_HORARIOS = ler_horarios(os.environ.get("RESUMO_HORARIOS", "08:00"))
+
+# --- Configuração das Assinaturas de Status ---
+# Arquivo SQLite com os canais que seguem status/orçamentos e intervalo (em segundos) entre os envios em lote.
+CAMINHO_ASSINATURAS = os.environ.get("ASSINATURAS_DB", "assinaturas.db")
+INTERVALO_ASSINATURAS = int(os.environ.get("ASSINATURAS_INTERVALO", 10))
+
+# --- Configuração da Escrita na Planilha ---
+# Intervalo (em segundos) entre as gravações em lote das mudanças de status e máximo de orçamentos por /mudar_status_lote.
+INTERVALO_ESCRITA = int(os.environ.get("ESCRITA_INTERVALO", 5))
+MAX_ORCAMENTOS_LOTE = 50
+# IDs dos cargos que podem mudar status, separados por vírgula. Vazio: quem pode gerenciar mensagens.
+ESCRITA_CARGOS = {int(c) for c in os.environ.get("ESCRITA_CARGOS", "").replace(" ", "").split(",") if c}
+
+# --- Configuração dos Limites de Uso ---
+# Token bucket por usuário e por servidor, no formato "usos/segundos". /recarregar custa mais (força um download).
+LIMITE_USUARIO = ler_limite(os.environ.get("LIMITE_USUARIO", "5/30"))
+LIMITE_SERVIDOR = ler_limite(os.environ.get("LIMITE_SERVIDOR", "30/60"))
+CUSTO_COMANDOS = {"recarregar": 3}
+
+
+# --- Consultas Prontas ---
+# Status de trabalho listados pelo /verificar, nesta ordem.
+STATUS_VERIFICAR = (
+    "01 Escanear", "03 Traduzir", "04 Revisar", "05 Imprimir",
+    "07 Assinar Digitalmente", "08 Assinar e Imprimir", "10 Numerar",
+    "15 Cart.Tradução ", "16 Cart. Original", "17 Conferência",
+    "18 Tradução Externa", "19 Embalar"
+)
+CONSULTA_VERIFICAR = Consulta(status=STATUS_VERIFICAR, somente_completos=True, ordem=ORDEM_STATUS)
+
+
+def _pode_mudar_status(interaction: discord.Interaction) -> bool:
+    """Check do /mudar_status e /mudar_status_lote: cargo em ESCRITA_CARGOS ou, sem cargos configurados, gerenciar mensagens."""
+    membro = interaction.user
+    if not isinstance(membro, discord.Member):
+        return False
+    if ESCRITA_CARGOS:
+        return any(cargo.id in ESCRITA_CARGOS for cargo in membro.roles)
+    return membro.guild_permissions.manage_messages
+
+
+def _status_canonico(indice, status: str) -> str | None:
+    """Grafia do status como está na planilha (ou nas listas conhecidas), ou None se o status não existir."""
+    conhecidos = {normalizar_status(s): s for s, _ in indice.status_disponiveis}
+    for s in (*STATUS_VERIFICAR, *STATUS_FINALIZADOS):
+        conhecidos.setdefault(normalizar_status(s), s.strip())
+    return conhecidos.get(normalizar_status(status))
+
+
+async def _responder_erro(interaction: discord.Interaction, mensagem: str, efemero: bool):
+    """Avisa o usuário de um erro já tratado pelo comando e marca a interação para as métricas contarem como erro."""
+    interaction.extras['erro'] = True
+    await interaction.followup.send(mensagem, ephemeral=efemero)
+
+
+def _listar(registros, limite: int = 1024) -> str:
+    """Monta o valor de um campo de embed sem passar do limite de caracteres."""
+    if not registros:
+        return "Nenhum."
+    linhas = []
+    tamanho = 0
+    for i, r in enumerate(registros):
+        linha = f"`{r.id}` - {r.cliente} ({r.data_entrega_str or 'sem data'})"
+        if tamanho + len(linha) + 40 > limite:
+            linhas.append(f"...e mais {len(registros) - i}.")
+            break
+        linhas.append(linha)
+        tamanho += len(linha) + 1
+    return "\n".join(linhas)
+
+
+DIAS_DA_SEMANA = ("seg", "ter", "qua", "qui", "sex", "sáb", "dom")
+
+
+def _listar_contagens(contagens, limite: int = 1024) -> str:
+    """Campo do /painel: uma linha por (rótulo, orçamentos, documentos), sem passar do limite do embed."""
+    linhas = [f"{rotulo}: **{orcamentos}** orç. • {documentos} doc." for rotulo, orcamentos, documentos in contagens]
+    texto = "\n".join(linhas) or "Nenhum."
+    return texto if len(texto) <= limite else texto[:limite - 4].rsplit("\n", 1)[0] + "\n..."
 
 # --- Classe do Cog ---
 class SpreadsheetCommands(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, papel: str = PAPEL_PLANILHA):
         self.bot = bot
+        self.leitor = papel == "leitor"
+        self.publicacao: Publicacao | None = None  # Última publicação do sincronizador lida (só no leitor)
         self.worksheet = None
-        self.connect_to_sheet()
+        self.titulo_aba = None
+        self._mes_verificado_em = 0.0
+        self.acesso = AcessoPlanilha(max_threads=MAX_THREADS_PLANILHA, timeout=TIMEOUT_PLANILHA,
+                                     ao_terminar=metricas.registrar_sheets,
+                                     politica=PoliticaDeRetentativa(tentativas=TENTATIVAS_PLANILHA),
+                                     disjuntor=DisjuntorDeCircuito(CIRCUITO_FALHAS, CIRCUITO_SEGUNDOS))
+        self.politica_reconexao = PoliticaDeRetentativa(base=5, maximo=RECONEXAO_ESPERA_MAXIMA)
+        self._reconexao: asyncio.Task | None = None
+        self.sincronizador = SincronizadorDePlanilha()
+        self.assinaturas = CentralDeAssinaturas(CAMINHO_ASSINATURAS, self._enviar_para_canal, INTERVALO_ASSINATURAS)
+        self.sincronizador.ouvintes.append(self._registrar_mudancas)
+        self.sincronizador.ouvintes.append(self.assinaturas.receber)
+        self.cache = CacheDePlanilha(self._ler_publicado if self.leitor else self._baixar_dados,
+                                     idade_maxima=IDADE_MAXIMA_SNAPSHOT)
+        self.escrita = FilaDeEscrita(self.acesso, lambda: self.worksheet, self._localizar_linha, INTERVALO_ESCRITA)
+        self.cache.preparar = self._preparar_snapshot
+        self.cache.ao_carregar = self._reaplicar_mudancas
+        self.limitador = LimitadorDeUso(LIMITE_USUARIO, LIMITE_SERVIDOR)
+        self.consultas = ConsultasEmAndamento()
+        self.armazem_snapshots = ArmazemDeSnapshots(CAMINHO_SNAPSHOT)
+        self._versao_salva = None  # (versão, alterações) do último snapshot gravado no armazém
+        self._publicando = asyncio.Lock()
+        self.abas = RegistroDeAbas(self.acesso, capacidade=MESES_EM_MEMORIA)
+        self.responsaveis = ler_responsaveis(RESUMO_RESPONSAVEIS)
+        self._ultimos_resumos: dict[int, frozenset] = {}
+
+    async def cog_load(self):
+        if self.leitor:
+            # Os dados vêm do armazém compartilhado; avisos, resumos e gravações ficam com o sincronizador
+            self.atualizar_snapshot.change_interval(seconds=INTERVALO_LEITURA)
+            self.atualizar_snapshot.start()
+            return
+        # Responde com o snapshot salvo enquanto a conexão e a primeira sincronização rodam em segundo plano
+        await self._carregar_snapshot_do_disco()
+        self.atualizar_snapshot.start()
+        self.assinaturas.iniciar()
+        self.escrita.iniciar()
+        self.publicar_mudancas.start()
+        if RESUMO_CANAL_ID or self.responsaveis:
+            self.enviar_resumo.start()
 
-    def connect_to_sheet(self):
-        """Conecta-se à planilha Google."""
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Aplica os limites de uso a todos os comandos do cog (o autocomplete não passa por aqui)."""
+        custo = CUSTO_COMANDOS.get(interaction.command.name, 1) if interaction.command else 1
+        self.limitador.verificar(interaction.user.id, interaction.guild_id, custo)
+        return True
+
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        if isinstance(error, LimiteDeUsoExcedido):
+            quem = "Você está" if error.escopo == "usuario" else "Este servidor está"
+            mensagem = f"⏳ {quem} usando os comandos da planilha rápido demais. Tente de novo em {error.tentar_em:.0f}s."
+            if interaction.response.is_done():
+                await interaction.followup.send(mensagem, ephemeral=True)
+            else:
+                await interaction.response.send_message(mensagem, ephemeral=True)
+        elif isinstance(error, app_commands.CheckFailure):
+            mensagem = "🔒 Você não tem permissão para mudar status na planilha."
+            if interaction.response.is_done():
+                await interaction.followup.send(mensagem, ephemeral=True)
+            else:
+                await interaction.response.send_message(mensagem, ephemeral=True)
+
+    async def cog_unload(self):
+        self.atualizar_snapshot.cancel()
+        self.publicar_mudancas.cancel()
+        if self._reconexao:
+            self._reconexao.cancel()
+        self.enviar_resumo.cancel()
+        self.assinaturas.parar()
+        self.assinaturas.fechar()
+        self.escrita.parar()
+        try:
+            await self.escrita.descarregar()
+        except Exception as e:
+            print(f"Cog 'Spreadsheet': {len(self.escrita.pendentes)} mudança(s) de status não gravada(s): {e}")
+        self.acesso.fechar()
+
+    async def connect_to_sheet(self) -> bool:
+        """Conecta-se à planilha Google sem bloquear o event loop. Devolve True se conseguiu."""
         google_credentials_str = os.environ.get("GOOGLE_CREDENTIALS_JSON")
         if google_credentials_str:
             try:
-                google_credentials_dict = json.loads(google_credentials_str)
-                gc = gspread.service_account_from_dict(google_credentials_dict)
-                spreadsheet = gc.open("@Status clientes 2025")
-                self.worksheet = spreadsheet.worksheet("OUT 25")
-                print(f"Cog 'Spreadsheet': Conectado à planilha '{spreadsheet.title}'.")
+                inicio = relogio.perf_counter()
+                spreadsheet, titulos = await self.acesso.executar(self._abrir_planilha, google_credentials_str)
+                self.abas.definir_planilha(spreadsheet, titulos)
+                await self._usar_aba(ABA_FIXA or self.abas.aba_atual())
+                print(f"Cog 'Spreadsheet': Conectado à planilha '{spreadsheet.title}' (aba '{self.titulo_aba}') "
+                      f"em {relogio.perf_counter() - inicio:.2f}s.")
             except Exception as e:
                 print(f"Cog 'Spreadsheet': ERRO CRÍTICO ao conectar à planilha: {e}")
         else:
             print("Cog 'Spreadsheet': AVISO: Secret 'GOOGLE_CREDENTIALS_JSON' não encontrado.")
+        return self.worksheet is not None
+
+    def _iniciar_reconexao(self):
+        if self._reconexao is None or self._reconexao.done():
+            self._reconexao = asyncio.create_task(self._reconectar())
+
+    async def _reconectar(self):
+        """Tenta conectar até conseguir, com esperas crescentes (e aleatórias) entre as tentativas."""
+        tentativa = 0
+        while not await self.connect_to_sheet():
+            if not os.environ.get("GOOGLE_CREDENTIALS_JSON"):
+                return  # Sem credenciais não adianta insistir
+            espera = self.politica_reconexao.espera(tentativa)
+            print(f"Cog 'Spreadsheet': Nova tentativa de conexão em {espera:.0f}s.")
+            await asyncio.sleep(espera)
+            tentativa += 1
+        # Não espera o próximo ciclo para ter dados novos
+        await self._sincronizar()
+
+    async def _carregar_snapshot_do_disco(self):
+        try:
+            salvo = await asyncio.to_thread(self.armazem_snapshots.carregar)
+        except Exception as e:
+            print(f"Cog 'Spreadsheet': Não foi possível ler o snapshot salvo: {e}")
+            return
+        if salvo is None:
+            return
+        snapshot, publicacao = salvo
+        aba = publicacao.aba
+        if ABA_FIXA and aba != ABA_FIXA:
+            return
+        await asyncio.to_thread(self._preparar_snapshot, snapshot)
+        self.cache.snapshot = snapshot
+        self.titulo_aba = aba
+        # A primeira sincronização compara com o snapshot salvo, então as mudanças feitas
+        # enquanto o bot estava desligado também geram avisos
+        self.sincronizador.definir_base(snapshot.tabela)
+        print(f"Cog 'Spreadsheet': Snapshot salvo carregado do disco (aba '{aba}', {len(snapshot.tabela)} linhas, "
+              f"de {snapshot.carregado_em_data:%d/%m %H:%M}).")
+
+    async def _salvar_snapshot(self, snapshot, escritas_aplicadas: int = 0, conferido: bool = True) -> bool:
+        """Grava (publica) o snapshot no armazém, uma vez por versão e depois de cada mudança de status
+        feita pelo bot. Devolve True se gravou."""
+        async with self._publicando:
+            # Um snapshot já substituído no cache não pode sobrescrever o mais novo
+            if snapshot.do_disco or snapshot is not self.cache.snapshot:
+                return False
+            chave = (snapshot.versao, snapshot.alteracoes)
+            if chave == self._versao_salva and not escritas_aplicadas:
+                return False
+            await asyncio.to_thread(self.armazem_snapshots.salvar, snapshot, self.titulo_aba,
+                                    escritas_aplicadas, conferido)
+            self._versao_salva = chave
+            return True
+
+    def _sem_dados(self) -> bool:
+        """True se não há conexão nem snapshot salvo para responder aos comandos."""
+        return not self.worksheet and self.cache.snapshot is None
+
+    def _aviso_snapshot(self) -> str | None:
+        """Aviso para o rodapé quando os dados não são recentes: o snapshot salvo (ainda não
+        sincronizado) ou o último bom, servido enquanto a planilha do Google está fora do ar."""
+        if self.leitor:
+            # Vale a hora em que o sincronizador conferiu a planilha, não a da leitura do armazém
+            publicacao = self.publicacao
+            if publicacao and relogio.time() - publicacao.conferido_em > IDADE_MAXIMA_SNAPSHOT:
+                return (f"⚠️ Dados de {datetime.fromtimestamp(publicacao.conferido_em):%d/%m %H:%M}: "
+                        "a sincronização com a planilha do Google está atrasada")
+            return None
+        snapshot = self.cache.snapshot
+        if snapshot is None:
+            return None
+        if snapshot.do_disco:
+            return f"⚠️ Dados salvos em {snapshot.carregado_em_data:%d/%m %H:%M} (sincronizando)"
+        if self.cache.desatualizado:
+            return f"⚠️ Dados de {snapshot.carregado_em_data:%d/%m %H:%M}: a planilha do Google está indisponível no momento"
+        return None
+
+    def _abrir_planilha(self, google_credentials_str: str):
+        """Parte bloqueante da conexão: abre a planilha e lista as abas. Roda dentro do pool de threads."""
+        # Importado só aqui, já fora do event loop: gspread e google-auth atrasam a inicialização do bot
+        import gspread
+
+        google_credentials_dict = json.loads(google_credentials_str)
+        gc = gspread.service_account_from_dict(google_credentials_dict)
+        spreadsheet = gc.open(NOME_PLANILHA)
+        return spreadsheet, [ws.title for ws in spreadsheet.worksheets()]
+
+    async def _usar_aba(self, titulo: str):
+        """Troca a aba principal (a dos comandos e do snapshot em segundo plano)."""
+        if not titulo:
+            raise ValueError("Nenhuma aba mensal encontrada na planilha.")
+        self.worksheet = await self.acesso.executar(self.abas.spreadsheet.worksheet, titulo)
+        if titulo != self.titulo_aba:
+            # Uma aba nova não deve ser comparada com a anterior (nem com o snapshot salvo de outra aba)
+            self.sincronizador.esquecer()
+            self.cache.snapshot = None
+        self.titulo_aba = titulo
+
+    async def _verificar_virada_do_mes(self):
+        """Passa para a aba do novo mês assim que ela for criada (verifica no máximo uma vez por hora)."""
+        if ABA_FIXA or titulo_do_mes(date.today()) == self.titulo_aba:
+            return
+        if relogio.monotonic() - self._mes_verificado_em < 3600:
+            return
+        self._mes_verificado_em = relogio.monotonic()
+        titulos = [ws.title for ws in await self.acesso.executar(self.abas.spreadsheet.worksheets)]
+        self.abas.definir_planilha(self.abas.spreadsheet, titulos)
+        nova_aba = self.abas.aba_atual()
+        if nova_aba != self.titulo_aba:
+            await self._usar_aba(nova_aba)
+            print(f"Cog 'Spreadsheet': Passando a usar a aba '{nova_aba}'.")
+
+    async def _baixar_dados(self) -> TabelaColunar | None:
+        """Lê as colunas usadas da aba. Usado apenas pelo cache; devolve None se nada mudou."""
+        linhas = await self.acesso.executar(self.sincronizador.buscar, self.worksheet)
+        # Hash, colunas e comparação em uma thread; só os avisos (assinaturas em SQLite) ficam no event loop
+        return await self.sincronizador.registrar(linhas)
+
+    async def _ler_publicado(self) -> TabelaColunar | None:
+        """Leitor: lê o snapshot publicado pelo sincronizador. Usado apenas pelo cache; devolve None se nada mudou."""
+        publicacao = await asyncio.to_thread(self.armazem_snapshots.publicacao)
+        if publicacao is None:
+            raise PlanilhaIndisponivel("o processo sincronizador ainda não publicou nenhum snapshot")
+        if self.publicacao is not None and publicacao.versao == self.publicacao.versao:
+            self.publicacao = replace(self.publicacao, conferido_em=publicacao.conferido_em)
+            return None
+        salvo = await asyncio.to_thread(self.armazem_snapshots.carregar)
+        if salvo is None:
+            raise PlanilhaIndisponivel("o snapshot publicado pelo processo sincronizador está vazio")
+        snapshot, self.publicacao = salvo
+        self.titulo_aba = self.publicacao.aba
+        return snapshot.tabela
+
+    async def _consultar(self, consulta: Consulta):
+        """Planeja a consulta sobre o índice atual e devolve (resultados lidos sob demanda, plano).
+
+        Consultas iguais feitas ao mesmo tempo compartilham o mesmo plano e os mesmos resultados.
+        """
+        async def calcular():
+            plano = planejar(consulta, (await self.cache.obter()).indice)
+            return ListaPreguicosa(plano.executar()), plano
+        return await self.consultas.executar(consulta, calcular)
+
+    def _localizar_linha(self, id_orcamento: str) -> int | None:
+        registro = self.cache.snapshot.indice.buscar_id(id_orcamento) if self.cache.snapshot else None
+        return registro.linha if registro else None
+
+    @staticmethod
+    def _preparar_snapshot(snapshot):
+        """Roda em uma thread: deixa os índices do autocomplete e os contadores do /painel prontos."""
+        snapshot.indice.preparar_autocomplete()
+        snapshot.painel
+
+    def _reaplicar_mudancas(self, snapshot):
+        """Um snapshot novo ainda não tem as mudanças de status que estão na fila: aplica de novo."""
+        # No leitor, a fila é a do armazém: o que foi encaminhado e o sincronizador ainda não publicou
+        mudancas = self.publicacao.escritas if self.leitor else self.escrita.nao_gravadas().items()
+        for id_orcamento, status in mudancas:
+            snapshot.alterar_status(id_orcamento, status)
+
+    def _registrar_mudancas(self, eventos):
+        """Ouvinte do sincronizador: registra as mudanças no log."""
+        print(f"Cog 'Spreadsheet': {len(eventos)} mudança(s) detectada(s) na planilha.")
+
+    async def _enviar_para_canal(self, canal_id: int, texto: str):
+        await self.bot.wait_until_ready()
+        canal = self.bot.get_channel(canal_id) or await self.bot.fetch_channel(canal_id)
+        await canal.send(texto)
+
+    # --- Tarefa em Segundo Plano ---
+    @tasks.loop(seconds=INTERVALO_ATUALIZACAO)
+    async def atualizar_snapshot(self):
+        """Mantém o snapshot da planilha atualizado sem depender dos comandos."""
+        if self.leitor:
+            await self._acompanhar_sincronizador()
+            return
+        if not self.worksheet:
+            # Conecta em segundo plano (e não no cog_load) para não atrasar a inicialização;
+            # a reconexão sincroniza assim que conseguir
+            self._iniciar_reconexao()
+            return
+        await self._sincronizar()
+
+    async def _sincronizar(self):
+        try:
+            await self._verificar_virada_do_mes()
+            snapshot = await self.cache.atualizar()  # Já com os índices prontos (`_preparar_snapshot`)
+            if not await self._salvar_snapshot(snapshot):
+                # A planilha não mudou: avisa os leitores de que o snapshot publicado continua em dia
+                await asyncio.to_thread(self.armazem_snapshots.confirmar)
+            print(f"Cog 'Spreadsheet': Snapshot v{snapshot.versao} carregado "
+                  f"({len(snapshot.tabela)} linhas, {snapshot.memoria() / 1024:.0f} KB em memória).")
+        except Exception as e:
+            print(f"Cog 'Spreadsheet': Erro ao atualizar o snapshot da planilha: {e}")
+
+    async def _acompanhar_sincronizador(self):
+        """Leitor: troca para o snapshot mais recente publicado pelo sincronizador (sem acessar o Google)."""
+        anterior = self.cache.snapshot
+        try:
+            snapshot = await self.cache.atualizar()
+        except Exception as e:
+            print(f"Cog 'Spreadsheet': Erro ao ler o snapshot publicado pelo sincronizador: {e}")
+            return
+        if snapshot is not anterior:
+            print(f"Cog 'Spreadsheet': Publicação v{self.publicacao.versao} do sincronizador carregada "
+                  f"(aba '{self.titulo_aba}', {len(snapshot.tabela)} linhas).")
+
+    @tasks.loop(seconds=INTERVALO_ESCRITA)
+    async def publicar_mudancas(self):
+        """Sincronizador: aplica as mudanças de status encaminhadas pelos leitores e republica o snapshot
+        sempre que ele muda por uma mudança feita pelo bot, para que os outros processos a vejam logo."""
+        try:
+            escritas = await asyncio.to_thread(self.armazem_snapshots.escritas_encaminhadas)
+            snapshot = self.cache.snapshot
+            if snapshot is None or snapshot.do_disco:
+                return  # Espera a primeira sincronização
+            for _, id_orcamento, status in escritas:
+                if snapshot.alterar_status(id_orcamento, status):
+                    self.escrita.enfileirar(id_orcamento, status)
+            await self._salvar_snapshot(snapshot, escritas[-1][0] if escritas else 0, conferido=False)
+        except Exception as e:
+            print(f"Cog 'Spreadsheet': Erro ao publicar as mudanças de status: {e}")
+
+    @tasks.loop(time=RESUMO_HORARIOS)
+    async def enviar_resumo(self):
+        """Calcula o resumo uma vez por horário, publica no canal e avisa os responsáveis cujo resumo mudou."""
+        if self._sem_dados():
+            return
+        try:
+            indice = (await self.cache.obter()).indice
+            resumo = calcular_resumo(indice, datetime.now(RESUMO_FUSO).date())
+
+            if RESUMO_CANAL_ID:
+                canal = self.bot.get_channel(RESUMO_CANAL_ID) or await self.bot.fetch_channel(RESUMO_CANAL_ID)
+                await canal.send(embed=self._embed_resumo(resumo, "📊 Resumo do Dia"))
+
+            for usuario_id, status in self.responsaveis.items():
+                resumo_usuario = resumo.filtrar(status)
+                assinatura = resumo_usuario.assinatura()
+                if self._ultimos_resumos.get(usuario_id) == assinatura:
+                    continue
+                self._ultimos_resumos[usuario_id] = assinatura
+                if not assinatura:
+                    continue
+                try:
+                    usuario = await self.bot.fetch_user(usuario_id)
+                    await usuario.send(embed=self._embed_resumo(resumo_usuario, "📊 Seus Orçamentos"))
+                except discord.HTTPException as e:
+                    print(f"Cog 'Spreadsheet': Não foi possível enviar o resumo para {usuario_id}: {e}")
+        except Exception as e:
+            print(f"Cog 'Spreadsheet': Erro ao enviar o resumo agendado: {e}")
+
+    @enviar_resumo.before_loop
+    async def antes_do_resumo(self):
+        await self.bot.wait_until_ready()
+
+    def _embed_resumo(self, resumo, titulo: str) -> discord.Embed:
+        embed = discord.Embed(title=titulo, color=discord.Color.blue())
+        for nome, registros in resumo.categorias().items():
+            embed.add_field(name=f"{nome} ({len(registros)})", value=_listar(registros), inline=False)
+        embed.set_footer(text=f"Gerado em: {datetime.now(RESUMO_FUSO).strftime('%d/%m/%Y %H:%M')}")
+        return embed
+
+    # --- Autocomplete ---
+    # Servido direto do snapshot em memória: nunca baixa a planilha durante a digitação.
+    def _indice_em_memoria(self):
+        return self.cache.snapshot.indice if self.cache.snapshot else None
+
+    async def autocompletar_id(self, interaction: discord.Interaction, atual: str) -> list[app_commands.Choice[str]]:
+        indice = self._indice_em_memoria()
+        if indice is None:
+            return []
+        return [app_commands.Choice(name=i[:100], value=i[:100]) for i in indice.ids_com_prefixo(atual)]
+
+    async def autocompletar_status(self, interaction: discord.Interaction, atual: str) -> list[app_commands.Choice[str]]:
+        indice = self._indice_em_memoria()
+        if indice is None:
+            return []
+        procurado = normalizar_texto(atual)
+        return [
+            app_commands.Choice(name=f"{status} ({quantidade})"[:100], value=status[:100])
+            for status, quantidade in indice.status_disponiveis
+            if procurado in normalizar_texto(status)
+        ][:25]
+
+    async def autocompletar_data(self, interaction: discord.Interaction, atual: str) -> list[app_commands.Choice[str]]:
+        indice = self._indice_em_memoria()
+        if indice is None:
+            return []
+        hoje = date.today()
+        opcoes = []
+        for data, quantidade in indice.datas_disponiveis:
+            texto = data.strftime('%d/%m/%Y')
+            if data >= hoje and texto.startswith(atual.strip()):
+                opcoes.append(app_commands.Choice(name=f"{texto} ({quantidade} entrega(s))", value=texto))
+                if len(opcoes) == 25:
+                    break
+        return opcoes
+
+    async def autocompletar_cliente(self, interaction: discord.Interaction, atual: str) -> list[app_commands.Choice[str]]:
+        """Sugere nomes de clientes usando o snapshot em memória, sem acessar a planilha."""
+        indice = self._indice_em_memoria()
+        if indice is None or not atual.strip():
+            return []
+        return [
+            app_commands.Choice(name=f"{nome} ({len(registros)})"[:100], value=nome[:100])
+            for nome, _, registros in indice.clientes.buscar(atual, limite=25)
+        ]
 
     # --- Comandos---
+    @app_commands.command(name="recarregar", description="Força o recarregamento dos dados da planilha.")
+    async def recarregar(self, interaction: discord.Interaction):
+        if not self.worksheet and not self.leitor:
+            await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            snapshot = await self.cache.atualizar()
+            # O leitor não acessa o Google: relê o que o sincronizador publicou por último
+            origem = "Dados relidos do sincronizador" if self.leitor else "Planilha recarregada"
+            await interaction.followup.send(f"🔄 {origem}: versão **{snapshot.versao}** com {len(snapshot.tabela)} linhas.", ephemeral=True)
+        except Exception as e:
+            await _responder_erro(interaction, f"Ocorreu um erro ao recarregar a planilha: {e}", True)
+
+    @app_commands.command(name="datas_invalidas", description="Lista as linhas da planilha com data de entrega inválida.")
+    async def datas_invalidas(self, interaction: discord.Interaction):
+        if self._sem_dados():
+            await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            invalidas = (await self.cache.obter()).indice.datas_invalidas
+            if not invalidas:
+                await interaction.followup.send("✅ Todas as datas de entrega da planilha são válidas.", ephemeral=True)
+                return
+
+            embed = discord.Embed(
+                title="⚠️ Datas de Entrega Inválidas",
+                description="\n".join(f"Linha {d.linha}: `{d.texto}`" for d in invalidas[:50]),
+                color=discord.Color.orange()
+            )
+            if len(invalidas) > 50:
+                embed.set_footer(text=f"...e mais {len(invalidas) - 50} linha(s).")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        except Exception as e:
+            await _responder_erro(interaction, f"Ocorreu um erro ao verificar as datas: {e}", True)
+
+    @app_commands.command(name="seguir_status", description="Avisa neste canal quando um orçamento entrar ou sair de um status.")
+    @app_commands.describe(status="O status que você quer acompanhar (ex: 04 Revisar).")
+    @app_commands.autocomplete(status=autocompletar_status)
+    async def seguir_status(self, interaction: discord.Interaction, status: str):
+        self.assinaturas.seguir(interaction.channel_id, POR_STATUS, status)
+        await interaction.response.send_message(f"🔔 Este canal agora segue o status **{status.strip()}**.", ephemeral=True)
+
+    @app_commands.command(name="seguir_orcamento", description="Avisa neste canal quando o status de um orçamento mudar.")
+    @app_commands.describe(id="O número do orçamento que você quer acompanhar.")
+    @app_commands.autocomplete(id=autocompletar_id)
+    async def seguir_orcamento(self, interaction: discord.Interaction, id: str):
+        self.assinaturas.seguir(interaction.channel_id, POR_ORCAMENTO, id)
+        await interaction.response.send_message(f"🔔 Este canal agora segue o orçamento `{id.strip()}`.", ephemeral=True)
+
+    @app_commands.command(name="parar_de_seguir", description="Cancela um acompanhamento deste canal.")
+    @app_commands.describe(tipo="O que era acompanhado.", valor="O status ou o número do orçamento.")
+    @app_commands.choices(tipo=[
+        app_commands.Choice(name="Status", value=POR_STATUS),
+        app_commands.Choice(name="Orçamento", value=POR_ORCAMENTO)
+    ])
+    async def parar_de_seguir(self, interaction: discord.Interaction, tipo: str, valor: str):
+        if self.assinaturas.deixar_de_seguir(interaction.channel_id, tipo, valor):
+            await interaction.response.send_message(f"🔕 Este canal não segue mais `{valor.strip()}`.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"Este canal não seguia `{valor.strip()}`.", ephemeral=True)
+
+    @app_commands.command(name="assinaturas", description="Lista o que este canal está acompanhando.")
+    async def listar_assinaturas(self, interaction: discord.Interaction):
+        assinaturas = self.assinaturas.do_canal(interaction.channel_id)
+        if not assinaturas:
+            await interaction.response.send_message("Este canal não acompanha nenhum status ou orçamento.", ephemeral=True)
+            return
+        nomes = {POR_STATUS: "Status", POR_ORCAMENTO: "Orçamento"}
+        texto = "\n".join(f"{nomes[tipo]}: `{chave}`" for tipo, chave in assinaturas)
+        await interaction.response.send_message(f"🔔 **Acompanhamentos deste canal:**\n{texto[:1900]}", ephemeral=True)
+
     @app_commands.command(name="verificar", description="Verifica orçamentos com status de trabalho pendentes.")
     @app_commands.describe(efemero="Escolha 'Falso' para mostrar a resposta para todos no canal.")
     async def verificar(self, interaction: discord.Interaction, efemero: bool = True):
-        if not self.worksheet:
+        if self._sem_dados():
             await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=efemero)
             return
         try:
             await interaction.response.defer(ephemeral=efemero)
-            status_para_procurar = [
-                "01 Escanear", "03 Traduzir", "04 Revisar", "05 Imprimir", 
-                "07 Assinar Digitalmente", "08 Assinar e Imprimir", "10 Numerar", 
-                "15 Cart.Tradução ", "16 Cart. Original", "17 Conferência", 
-                "18 Tradução Externa", "19 Embalar"
-            ]
-            todos_os_dados = self.worksheet.get_all_values()
-            orcamentos_encontrados = {}
-            for linha in todos_os_dados[1:]:
-                try:
-                    status_da_linha = linha[7].strip()
-                    if status_da_linha in status_para_procurar:
-                        id_orcamento = linha[3]
-                        nome_cliente = linha[2]
-                        if status_da_linha not in orcamentos_encontrados:
-                            orcamentos_encontrados[status_da_linha] = []
-                        if id_orcamento and nome_cliente:
-                            linha_formatada = f"{id_orcamento} - {nome_cliente}"
-                            orcamentos_encontrados[status_da_linha].append(linha_formatada)
-                except IndexError:
-                    continue
+            orcamentos_encontrados, _ = await self._consultar(CONSULTA_VERIFICAR)
             
             if not orcamentos_encontrados:
                 await interaction.followup.send("Nenhum orçamento encontrado com os status de verificação.", ephemeral=efemero)
                 return
                 
-            resposta_texto = "📋 **Orçamentos com Status Ativo:**\n\n"
-            for status, orcamentos in orcamentos_encontrados.items():
-                if orcamentos:
-                    resposta_texto += f"**{status}**\n"
-                    lista_de_orcamentos = "\n".join(orcamentos)
-                    resposta_texto += f"```{lista_de_orcamentos}```\n"
-            
-            if len(resposta_texto) > 2000:
-                resposta_texto = resposta_texto[:1990] + "\n...(lista muito longa, foi cortada)"
-                
-            await interaction.followup.send(resposta_texto, ephemeral=efemero)
+            paginador = Paginador(
+                orcamentos_encontrados,
+                lambda r: f"`{r.id}` - {r.cliente}",
+                titulo="📋 Orçamentos com Status Ativo",
+                agrupar=lambda r: r.status.strip(),
+                autor_id=interaction.user.id,
+                aviso=self._aviso_snapshot()
+            )
+            await paginador.enviar(interaction, ephemeral=efemero)
         except Exception as e:
-            await interaction.followup.send(f"Ocorreu um erro ao verificar a planilha: {e}", ephemeral=efemero)
+            await _responder_erro(interaction, f"Ocorreu um erro ao verificar a planilha: {e}", efemero)
 
     @app_commands.command(name="buscar_orcamento", description="Busca os detalhes de um orçamento pelo ID.")
     @app_commands.describe(id="O número do orçamento que você quer encontrar.")
+    @app_commands.autocomplete(id=autocompletar_id)
     async def buscar_orcamento(self, interaction: discord.Interaction, id: str):
-        if not self.worksheet:
+        if self._sem_dados():
             await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
             return
         
         await interaction.response.defer(ephemeral=True)
         
         try:
-            todos_os_dados = self.worksheet.get_all_values()
-            linha_encontrada = None
-            
-            for linha in todos_os_dados[1:]:
-                if len(linha) > 3 and linha[3] == id:
-                    linha_encontrada = linha
-                    break
+            registro = (await self.cache.obter()).indice.buscar_id(id)
+            aba = self.titulo_aba
+            referencia = None
+
+            if registro is None:
+                # Não está no mês atual: procura nas outras abas mensais, das mais recentes para as mais antigas
+                encontrado = await self.abas.buscar_id(id, ignorar={self.titulo_aba})
+                if encontrado:
+                    aba, registro = encontrado
+                    referencia = self.abas.referencia_datas(aba)
             
-            if linha_encontrada:
-                cliente = linha_encontrada[2]
-                num_orcamento = linha_encontrada[3]
-                qtd_docs = linha_encontrada[4]
-                status = linha_encontrada[7]
-                data_entrega_str = linha_encontrada[1]
+            if registro:
+                cliente = registro.cliente
+                num_orcamento = registro.id
+                qtd_docs = registro.qtd_documentos
+                status = registro.status
+                data_entrega_str = registro.data_entrega_str
                 
-                data_formatada = formatar_data_br(data_entrega_str)
+                data_formatada = formatar_data_br(data_entrega_str, referencia)
                 
                 embed = discord.Embed(
                     title=f"Detalhes do Orçamento: {num_orcamento}",
@@ -130,109 +710,106 @@ class SpreadsheetCommands(commands.Cog):
                 embed.add_field(name="Status Atual", value=status, inline=True)
                 embed.add_field(name="Qtd. Documentos", value=qtd_docs, inline=True)
                 embed.add_field(name="Data de Entrega", value=data_formatada, inline=True)
+                aviso = self._aviso_snapshot() if aba == self.titulo_aba else None
+                embed.set_footer(text=f"Aba: {aba}" + (f" • {aviso}" if aviso else ""))
                 
                 await interaction.followup.send(embed=embed, ephemeral=True)
             else:
                 await interaction.followup.send(f"Não foi possível encontrar nenhum orçamento com o ID `{id}`.", ephemeral=True)
         
         except Exception as e:
-            await interaction.followup.send(f"Ocorreu um erro ao buscar na planilha: {e}", ephemeral=True)
+            await _responder_erro(interaction, f"Ocorreu um erro ao buscar na planilha: {e}", True)
     
+    @app_commands.command(name="buscar_cliente", description="Busca os orçamentos de um cliente pelo nome (aceita nomes parciais e sem acento).")
+    @app_commands.describe(nome="O nome (ou parte do nome) do cliente.", efemero="Escolha 'Falso' para mostrar a resposta para todos.")
+    @app_commands.autocomplete(nome=autocompletar_cliente)
+    async def buscar_cliente(self, interaction: discord.Interaction, nome: str, efemero: bool = True):
+        if self._sem_dados():
+            await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=efemero)
+
+        try:
+            def buscar(indice):
+                # Nome escolhido no autocomplete: mostra só esse cliente; senão, os mais parecidos
+                encontrados = indice.clientes.exato(nome)
+                if not encontrados:
+                    encontrados = [r for _, _, registros in indice.clientes.buscar(nome, limite=10) for r in registros]
+                return encontrados
+
+            async def calcular():
+                return buscar((await self.cache.obter()).indice)
+
+            encontrados = await self.consultas.executar(("buscar_cliente", normalizar_texto(nome)), calcular)
+
+            if not encontrados:
+                embed = discord.Embed(
+                    title="Nenhum Cliente Encontrado",
+                    description=f"Não há nenhum cliente parecido com `{nome}`.",
+                    color=discord.Color.orange()
+                )
+                await interaction.followup.send(embed=embed, ephemeral=efemero)
+                return
+
+            paginador = Paginador(
+                encontrados,
+                lambda r: f"`{r.id}` - {r.status.strip()} (Entrega: {r.data_entrega_str or 'N/A'})",
+                titulo=f"🔎 Orçamentos de Clientes Parecidos com '{nome}'",
+                agrupar=lambda r: r.cliente.strip(),
+                autor_id=interaction.user.id,
+                aviso=self._aviso_snapshot()
+            )
+            await paginador.enviar(interaction, ephemeral=efemero)
+
+        except Exception as e:
+            await _responder_erro(interaction, f"Ocorreu um erro ao buscar o cliente: {e}", efemero)
+
     @app_commands.command(name="atrasados", description="Lista todos os projetos com data de entrega vencida.")
     @app_commands.describe(efemero="Escolha 'Falso' para mostrar a resposta para todos.")
     async def atrasados(self, interaction: discord.Interaction, efemero: bool = True):
-        if not self.worksheet:
+        if self._sem_dados():
             await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
             return
         
         await interaction.response.defer(ephemeral=efemero)
         
         try:
-            # --- LISTA DE STATUS FINALIZADOS ATUALIZADA ---
-            status_finalizados = ["09 Pronto", "11 Entregue", "12 Enviar e-mail", "20 Cancelado"]
             hoje = datetime.now().date()
-            todos_os_dados = self.worksheet.get_all_values()
-            projetos_atrasados = []
-            
-            for linha in todos_os_dados[1:]:
-                try:
-                    data_entrega_str = linha[1] # Coluna B
-                    status_da_linha = linha[7].strip()
-                    
-                    if status_da_linha in status_finalizados or not data_entrega_str:
-                        continue
-                        
-                    data_completa_str = f"{data_entrega_str.strip()}/{hoje.year}"
-                    data_entrega = datetime.strptime(data_completa_str, '%d/%m/%Y').date()
-                    
-                    if data_entrega < hoje:
-                        id_orcamento = linha[3]
-                        nome_cliente = linha[2]
-                        status = linha[7]
-                        projetos_atrasados.append(f"`{id_orcamento}` - {nome_cliente} - STATUS : {status} (Venceu em: {data_entrega_str})")
-                
-                except (ValueError, IndexError):
-                    continue
+            # Apenas as entregas não finalizadas anteriores a hoje, já ordenadas por data
+            lista_atrasados, _ = await self._consultar(consulta_atrasados(hoje))
             
-            if not projetos_atrasados:
+            if not lista_atrasados:
                 embed = discord.Embed(title="✅ Nenhum Projeto Atrasado", description="Ótima notícia! Todos os projetos estão em dia.", color=discord.Color.green())
                 await interaction.followup.send(embed=embed, ephemeral=efemero)
                 return
                 
-            embed = discord.Embed(title="🚨 Projetos Atrasados", description="Os seguintes projetos estão com a data de entrega vencida:", color=discord.Color.red())
-            
-            lista_projetos_str = "\n".join(projetos_atrasados)
-            embed.description = lista_projetos_str
-            
-            await interaction.followup.send(embed=embed, ephemeral=efemero)
+            paginador = Paginador(
+                lista_atrasados,
+                lambda r: f"`{r.id}` - {r.cliente} - STATUS : {r.status} (Venceu em: {r.data_entrega_str})",
+                titulo="🚨 Projetos Atrasados",
+                cor=discord.Color.red(),
+                autor_id=interaction.user.id,
+                aviso=self._aviso_snapshot()
+            )
+            await paginador.enviar(interaction, ephemeral=efemero)
         
         except Exception as e:
-            await interaction.followup.send(f"Ocorreu um erro ao verificar os projetos atrasados: {e}", ephemeral=efemero)
+            await _responder_erro(interaction, f"Ocorreu um erro ao verificar os projetos atrasados: {e}", efemero)
     
     @app_commands.command(name="listar_status", description="Lista todos os orçamentos com um status específico.")
     @app_commands.describe(status="Escolha o status que você deseja listar.")
-    # Cria a lista de opções para o usuário escolher
-    @app_commands.choices(status=[
-        app_commands.Choice(name="01 Escanear", value="01 Escanear"),
-        app_commands.Choice(name="03 Traduzir", value="03 Traduzir"),
-        app_commands.Choice(name="04 Revisar", value="04 Revisar"),
-        app_commands.Choice(name="05 Imprimir", value="05 Imprimir"),
-        app_commands.Choice(name="07 Assinar Digitalmente", value="07 Assinar Digitalmente"),
-        app_commands.Choice(name="08 Assinar e Imprimir", value="08 Assinar e Imprimir"),
-        app_commands.Choice(name="09 Pronto", value="09 Pronto"),
-        app_commands.Choice(name="10 Numerar", value="10 Numerar"),
-        app_commands.Choice(name="11 Entregue", value="11 Entregue"),
-        app_commands.Choice(name="12 Enviar e-mail", value="12 Enviar e-mail"),
-        app_commands.Choice(name="13 Stand by", value="13 Stand by"),
-        app_commands.Choice(name="14 Aguardando Orig.", value="14 Aguardando Orig."),
-        app_commands.Choice(name="15 Cart.Tradução", value="15 Cart.Tradução"),
-        app_commands.Choice(name="16 Cart. Original", value="16 Cart. Original"),
-        app_commands.Choice(name="17 Conferência", value="17 Conferência"),
-        app_commands.Choice(name="18 Tradução Externa", value="18 Tradução Externa"),
-        app_commands.Choice(name="19 Embalar", value="19 Embalar"),
-        app_commands.Choice(name="20 Cancelado", value="20 Cancelado")
-    ])
+    @app_commands.autocomplete(status=autocompletar_status)
     async def listar_status(self, interaction: discord.Interaction, status: str, efemero: bool = True):
-        if not self.worksheet:
+        if self._sem_dados():
             await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=efemero)
             return
 
         await interaction.response.defer(ephemeral=efemero)
 
         try:
-            todos_os_dados = self.worksheet.get_all_values()
-            orcamentos_encontrados = []
-            
-            for linha in todos_os_dados[1:]: # Pula o cabeçalho
-                try:
-                    status_da_linha = linha[7] # Coluna H
-                    # Compara o status da linha com o status escolhido pelo usuário
-                    if status_da_linha == status:
-                        id_orcamento = linha[3]   # Coluna D
-                        nome_cliente = linha[2]   # Coluna C
-                        orcamentos_encontrados.append(f"`{id_orcamento}` - {nome_cliente}")
-                except IndexError:
-                    continue
+            # O índice compara o status normalizado, então espaços extras na planilha não atrapalham
+            orcamentos_encontrados, _ = await self._consultar(Consulta(status=(status,)))
 
             if not orcamentos_encontrados:
                 embed = discord.Embed(
@@ -243,28 +820,24 @@ class SpreadsheetCommands(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=efemero)
                 return
             
-            # Monta a resposta com os projetos encontrados
-            embed = discord.Embed(
-                title=f"Orçamentos com Status: '{status}'",
-                color=discord.Color.blue()
+            # Monta a resposta com os projetos encontrados, uma página por vez
+            paginador = Paginador(
+                orcamentos_encontrados,
+                lambda r: f"`{r.id}` - {r.cliente}",
+                titulo=f"Orçamentos com Status: '{status}'",
+                autor_id=interaction.user.id,
+                aviso=self._aviso_snapshot()
             )
-            
-            lista_projetos_str = "\n".join(orcamentos_encontrados)
-            if len(lista_projetos_str) > 4000:
-                lista_projetos_str = lista_projetos_str[:4000] + "\n...(lista muito longa)"
-
-            embed.description = lista_projetos_str
-            
-            await interaction.followup.send(embed=embed, ephemeral=efemero)
+            await paginador.enviar(interaction, ephemeral=efemero)
 
         except Exception as e:
-            await interaction.followup.send(f"Ocorreu um erro ao listar os projetos: {e}", ephemeral=efemero)
+            await _responder_erro(interaction, f"Ocorreu um erro ao listar os projetos: {e}", efemero)
 
 
     @app_commands.command(name="revisao_dia", description="Mostra todos os orçamentos do dia com Status: 04 Revisão")
     @app_commands.describe(efemero="Escolha 'Falso' para mostrar a resposta para todos.")
     async def revisao_dia(self, interaction: discord.Interaction, efemero: bool = True):
-        if not self.worksheet:
+        if self._sem_dados():
             await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
             return
         
@@ -272,33 +845,8 @@ class SpreadsheetCommands(commands.Cog):
         
         try:
             hoje = datetime.now().date()
-            orcamentos_do_dia = []
-            status_revisao_esperado = "04 Revisão"
-            todos_os_dados = self.worksheet.get_all_values()
-
-            COLUNA_DATA_IDX = 1
-            COLUNA_ID_ORCAMENTO_IDX = 3
-            COLUNA_CLIENTE_IDX = 2
-            COLUNA_STATUS_IDX = 7
-            
-            for linha in todos_os_dados[1:]:
-                try:
-                    data_str = linha[COLUNA_DATA_IDX]
-                    status_da_linha = linha[COLUNA_STATUS_IDX].strip()
-                    
-                    if not data_str:
-                        continue
-                    
-                    data_completa_str = f"{data_str.strip()}/{hoje.year}"
-                    data_da_linha = datetime.strptime(data_completa_str, '%d/%m/%Y').date()
-                    
-                    if data_da_linha == hoje and status_da_linha == status_revisao_esperado:
-                        id_orcamento = linha[COLUNA_ID_ORCAMENTO_IDX]
-                        nome_cliente = linha[COLUNA_CLIENTE_IDX]
-                        orcamentos_do_dia.append(f"`{id_orcamento}` - {nome_cliente}")
-                
-                except (ValueError, IndexError):
-                    continue
+            orcamentos_do_dia, _ = await self._consultar(
+                Consulta(status=("04 Revisão",), entrega_de=hoje, entrega_ate=hoje, ordem=ORDEM_DATA))
             
             if not orcamentos_do_dia:
                 embed = discord.Embed(
@@ -309,63 +857,40 @@ class SpreadsheetCommands(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=efemero)
                 return
             
-            embed = discord.Embed(
-                title="🗓️ Revisões de Hoje",
-                description="Os seguintes orçamentos estão em revisão hoje:",
-                color=discord.Color.blue()
+            paginador = Paginador(
+                orcamentos_do_dia,
+                lambda r: f"`{r.id}` - {r.cliente}",
+                titulo="🗓️ Revisões de Hoje",
+                autor_id=interaction.user.id,
+                aviso=self._aviso_snapshot()
             )
-            
-            lista_projetos_str = "\n".join(orcamentos_do_dia)
-            embed.description = lista_projetos_str
-            
-            await interaction.followup.send(embed=embed, ephemeral=efemero)
+            await paginador.enviar(interaction, ephemeral=efemero)
         
         except Exception as e:
-            await interaction.followup.send(f"Ocorreu um erro ao verificar as revisões do dia: {e}", ephemeral=efemero)
+            await _responder_erro(interaction, f"Ocorreu um erro ao verificar as revisões do dia: {e}", efemero)
 
     @app_commands.command(name="traducoes_ate", description="Lista projetos em tradução com entrega até uma data específica.")
     @app_commands.describe(data="A data limite no formato DD/MM (ex: 28/08)",efemero="Escolha 'Falso' para mostrar a resposta para todos.")
+    @app_commands.autocomplete(data=autocompletar_data)
     async def traducoes_ate(self, interaction: discord.Interaction, data: str, efemero: bool = True):
-        if not self.worksheet:
+        if self._sem_dados():
             await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
             return
 
         await interaction.response.defer(ephemeral=efemero)
 
         try:
-            # 1. Valida e formata a data de entrada do usuário
-            ano_atual = datetime.now().year
-            data_limite_str = f"{data.strip()}/{ano_atual}"
-            try:
-                data_limite = datetime.strptime(data_limite_str, '%d/%m/%Y').date()
-            except ValueError:
+            # 1. Valida a data de entrada do usuário (o ano é inferido se não for informado)
+            data_limite = parse_data_br(data)
+            if data_limite is None:
                 await interaction.followup.send(f"Formato de data inválido: '{data}'. Por favor, use `DD/MM`.", ephemeral=True)
                 return
 
-            projetos_encontrados = []
             status_traducao = "03 Traduzir"
-            todos_os_dados = self.worksheet.get_all_values()
 
-            for linha in todos_os_dados[1:]:
-                try:
-                    data_entrega_str = linha[1] # Coluna B
-                    status_da_linha = linha[7].strip() # Coluna H
-                    
-                    if not data_entrega_str or status_da_linha != status_traducao:
-                        continue
-                    
-                    # Formata a data da planilha para comparação
-                    data_entrega_completa_str = f"{data_entrega_str.strip()}/{ano_atual}"
-                    data_entrega = datetime.strptime(data_entrega_completa_str, '%d/%m/%Y').date()
-                    
-                    # A LÓGICA PRINCIPAL: verifica se a entrega é ANTES OU IGUAL à data limite
-                    if data_entrega <= data_limite:
-                        id_orcamento = linha[3]
-                        nome_cliente = linha[2]
-                        projetos_encontrados.append(f"`{id_orcamento}` - {nome_cliente} (Entrega: {data_entrega_str})")
-                
-                except (ValueError, IndexError):
-                    continue
+            # A LÓGICA PRINCIPAL: entregas ANTES OU IGUAIS à data limite
+            projetos_encontrados, _ = await self._consultar(
+                Consulta(status=(status_traducao,), entrega_ate=data_limite, ordem=ORDEM_DATA))
             
             if not projetos_encontrados:
                 embed = discord.Embed(
@@ -376,19 +901,221 @@ class SpreadsheetCommands(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=efemero)
                 return
             
-            embed = discord.Embed(
-                title=f"📝 Traduções com Entrega até {data}",
-                description=f"Os seguintes orçamentos com status '{status_traducao}' têm entrega até a data informada:",
-                color=discord.Color.blue()
+            paginador = Paginador(
+                projetos_encontrados,
+                lambda r: f"`{r.id}` - {r.cliente} (Entrega: {r.data_entrega_str})",
+                titulo=f"📝 Traduções com Entrega até {data}",
+                autor_id=interaction.user.id,
+                aviso=self._aviso_snapshot()
             )
-            
-            lista_projetos_str = "\n".join(projetos_encontrados)
-            embed.description = lista_projetos_str
-            
+            await paginador.enviar(interaction, ephemeral=efemero)
+
+        except Exception as e:
+            await _responder_erro(interaction, f"Ocorreu um erro ao buscar as traduções: {e}", efemero)
+
+    @app_commands.command(name="consultar", description="Consulta livre: combina filtros de status, data de entrega e cliente.")
+    @app_commands.describe(
+        status="Um ou mais status, separados por vírgula.",
+        de="Entrega a partir desta data (DD/MM).",
+        ate="Entrega até esta data (DD/MM).",
+        cliente="Trecho do nome do cliente.",
+        ignorar_finalizados="Esconde os orçamentos prontos, entregues ou cancelados.",
+        ordem="Ordem dos resultados.",
+        efemero="Escolha 'Falso' para mostrar a resposta para todos."
+    )
+    @app_commands.choices(ordem=[
+        app_commands.Choice(name="Linha da planilha", value=ORDEM_PLANILHA),
+        app_commands.Choice(name="Data de entrega", value=ORDEM_DATA),
+        app_commands.Choice(name="Status", value=ORDEM_STATUS)
+    ])
+    @app_commands.autocomplete(status=autocompletar_status, de=autocompletar_data, ate=autocompletar_data, cliente=autocompletar_cliente)
+    async def consultar(self, interaction: discord.Interaction, status: str = "", de: str = "", ate: str = "",
+                        cliente: str = "", ignorar_finalizados: bool = False, ordem: str = ORDEM_PLANILHA,
+                        efemero: bool = True):
+        if self._sem_dados():
+            await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
+            return
+
+        datas = {}
+        for nome, texto in (("de", de), ("ate", ate)):
+            if texto.strip():
+                datas[nome] = parse_data_br(texto)
+                if datas[nome] is None:
+                    await interaction.response.send_message(f"Formato de data inválido: '{texto}'. Por favor, use `DD/MM`.", ephemeral=True)
+                    return
+        if "de" in datas and "ate" in datas and datas["de"] > datas["ate"]:
+            await interaction.response.send_message(
+                f"A data inicial ({datas['de']:%d/%m/%Y}) é depois da final ({datas['ate']:%d/%m/%Y}). Por favor, inverta as datas.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=efemero)
+
+        try:
+            consulta = Consulta(
+                status=tuple(s.strip() for s in status.split(",") if s.strip()),
+                excluir_status=tuple(STATUS_FINALIZADOS) if ignorar_finalizados else (),
+                entrega_de=datas.get("de"),
+                entrega_ate=datas.get("ate"),
+                cliente_contem=cliente.strip(),
+                ordem=ordem
+            )
+            resultados, plano = await self._consultar(consulta)
+
+            if not resultados:
+                embed = discord.Embed(
+                    title="Nenhum Orçamento Encontrado",
+                    description="Nenhum orçamento atende a todos os filtros.",
+                    color=discord.Color.orange()
+                )
+                await interaction.followup.send(embed=embed, ephemeral=efemero)
+                return
+
+            # O plano de execução só interessa a quem administra o bot
+            avisos = [f"Plano: {plano.descrever()}"] if interaction.permissions.manage_guild else []
+            aviso = self._aviso_snapshot()
+            if aviso:
+                avisos.append(aviso)
+            paginador = Paginador(
+                resultados,
+                lambda r: f"`{r.id}` - {r.cliente} - {r.status.strip()} (Entrega: {r.data_entrega_str or 'N/A'})",
+                titulo="🔎 Resultado da Consulta",
+                agrupar=(lambda r: r.status.strip()) if ordem == ORDEM_STATUS else None,
+                autor_id=interaction.user.id,
+                aviso=" • ".join(avisos) or None
+            )
+            await paginador.enviar(interaction, ephemeral=efemero)
+
+        except Exception as e:
+            await _responder_erro(interaction, f"Ocorreu um erro ao consultar a planilha: {e}", efemero)
+
+    @app_commands.command(name="painel", description="Resumo da carga de trabalho: status, atrasos e entregas das próximas 2 semanas.")
+    @app_commands.describe(efemero="Escolha 'Falso' para mostrar a resposta para todos.")
+    async def painel(self, interaction: discord.Interaction, efemero: bool = True):
+        if self._sem_dados():
+            await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=efemero)
+
+        try:
+            # Os contadores já vêm prontos do snapshot: nada aqui percorre as linhas da aba
+            snapshot = await self.cache.obter()
+            painel = snapshot.painel
+            hoje = datetime.now().date()
+            atrasados = painel.atrasados_por_faixa(hoje)
+            entregas = painel.entregas_por_dia(hoje)
+
+            embed = discord.Embed(title="📊 Painel da Planilha", color=discord.Color.blue())
+            embed.add_field(name="📋 Por Status", value=_listar_contagens(painel.status()), inline=False)
+            embed.add_field(
+                name=f"🚨 Atrasados ({sum(orcamentos for _, orcamentos, _ in atrasados)})",
+                value=_listar_contagens((f"{rotulo} de atraso", o, d) for rotulo, o, d in atrasados if o),
+                inline=False
+            )
+            embed.add_field(
+                name=f"📅 Entregas dos Próximos {len(entregas)} Dias ({sum(orcamentos for _, orcamentos, _ in entregas)})",
+                value=_listar_contagens((f"{DIAS_DA_SEMANA[data.weekday()]} {data:%d/%m}", o, d) for data, o, d in entregas),
+                inline=False
+            )
+            aviso = self._aviso_snapshot()
+            embed.set_footer(text=f"Versão {snapshot.versao} da planilha • Finalizados não contam nos atrasos e entregas"
+                                  + (f" • {aviso}" if aviso else ""))
             await interaction.followup.send(embed=embed, ephemeral=efemero)
 
         except Exception as e:
-            await interaction.followup.send(f"Ocorreu um erro ao buscar as traduções: {e}", ephemeral=efemero)
+            await _responder_erro(interaction, f"Ocorreu um erro ao montar o painel: {e}", efemero)
+
+    # --- Comandos de Escrita ---
+    async def _mudar_status(self, ids: list[str], status: str) -> tuple[list[tuple[str, str]], list[str]]:
+        """Aplica a mudança no snapshot e coloca na fila de gravação. Devolve ([(id, status anterior)], [ids não encontrados])."""
+        snapshot = await self.cache.obter()
+        encontrados = []
+        nao_encontrados = []
+        for id_orcamento in ids:
+            registro = snapshot.indice.buscar_id(id_orcamento)
+            if registro is None:
+                nao_encontrados.append(id_orcamento)
+            else:
+                encontrados.append(registro)
+        if self.leitor and encontrados:
+            # Só o sincronizador grava na planilha: a mudança chega a ele (e aos outros leitores) pelo armazém
+            await asyncio.to_thread(self.armazem_snapshots.encaminhar_escritas, [(r.id, status) for r in encontrados])
+        alterados = []
+        for registro in encontrados:
+            anterior = registro.status
+            snapshot.alterar_status(registro.id, status)
+            if not self.leitor:
+                self.escrita.enfileirar(registro.id, status)
+            alterados.append((registro.id, anterior))
+        return alterados, nao_encontrados
+
+    async def _validar_status(self, interaction: discord.Interaction, status: str) -> str | None:
+        """Devolve o status na grafia da planilha ou avisa o usuário e devolve None."""
+        snapshot = await self.cache.obter()
+        canonico = _status_canonico(snapshot.indice, status)
+        if canonico is None:
+            await interaction.followup.send(
+                f"O status **{status}** não existe na planilha. Escolha um dos sugeridos (ex: 19 Embalar).", ephemeral=True)
+        return canonico
+
+    @app_commands.command(name="mudar_status", description="Muda o status (coluna H) de um orçamento na planilha.")
+    @app_commands.describe(id="O número do orçamento.", status="O novo status (ex: 19 Embalar).")
+    @app_commands.autocomplete(id=autocompletar_id, status=autocompletar_status)
+    @app_commands.default_permissions(manage_messages=True)
+    @app_commands.check(_pode_mudar_status)
+    async def mudar_status(self, interaction: discord.Interaction, id: str, status: app_commands.Range[str, 1, 100]):
+        if self._sem_dados():
+            await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            status = await self._validar_status(interaction, status.strip())
+            if status is None:
+                return
+            alterados, _ = await self._mudar_status([id.strip()], status)
+            if not alterados:
+                await interaction.followup.send(f"Não foi possível encontrar nenhum orçamento com o ID `{id}`.", ephemeral=True)
+                return
+            id_orcamento, anterior = alterados[0]
+            await interaction.followup.send(
+                f"✅ `{id_orcamento}`: {anterior.strip() or 'sem status'} → **{status}** "
+                f"(gravado na planilha em até {INTERVALO_ESCRITA}s).", ephemeral=True)
+        except Exception as e:
+            await _responder_erro(interaction, f"Ocorreu um erro ao mudar o status: {e}", True)
+
+    @app_commands.command(name="mudar_status_lote", description="Muda o status (coluna H) de vários orçamentos de uma vez.")
+    @app_commands.describe(ids="Números dos orçamentos, separados por vírgula ou espaço.", status="O novo status (ex: 19 Embalar).")
+    @app_commands.autocomplete(status=autocompletar_status)
+    @app_commands.default_permissions(manage_messages=True)
+    @app_commands.check(_pode_mudar_status)
+    async def mudar_status_lote(self, interaction: discord.Interaction, ids: str, status: app_commands.Range[str, 1, 100]):
+        if self._sem_dados():
+            await interaction.response.send_message("Desculpe, a conexão com a planilha não foi estabelecida.", ephemeral=True)
+            return
+
+        lista_ids = list(dict.fromkeys(i for i in re.split(r"[\s,;]+", ids) if i))
+        if not lista_ids or len(lista_ids) > MAX_ORCAMENTOS_LOTE:
+            await interaction.response.send_message(f"Informe de 1 a {MAX_ORCAMENTOS_LOTE} números de orçamento.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            status = await self._validar_status(interaction, status.strip())
+            if status is None:
+                return
+            alterados, nao_encontrados = await self._mudar_status(lista_ids, status)
+            linhas = [f"✅ {len(alterados)} orçamento(s) passando para **{status}** "
+                      f"(gravados na planilha em até {INTERVALO_ESCRITA}s)."]
+            if alterados:
+                linhas.append(", ".join(f"`{i}`" for i, _ in alterados))
+            if nao_encontrados:
+                linhas.append(f"⚠️ Não encontrados: {', '.join(f'`{i}`' for i in nao_encontrados)}")
+            await interaction.followup.send("\n".join(linhas)[:2000], ephemeral=True)
+        except Exception as e:
+            await _responder_erro(interaction, f"Ocorreu um erro ao mudar os status: {e}", True)
 
 
 # --- Função de Setup para Carregar o Cog ---
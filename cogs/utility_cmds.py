@@ -2,8 +2,16 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+import os
 import re
 import random
+from datetime import datetime
+
+from planilha import CircuitoAberto, PlanilhaIndisponivel
+from servicos import COTA_SHEETS_POR_MINUTO, AgendadorDeLembretes, ArmazemDeLembretes, metricas
+
+# Arquivo SQLite onde os lembretes pendentes ficam salvos entre reinícios
+CAMINHO_LEMBRETES = os.environ.get("LEMBRETES_DB", "lembretes.db")
 
 # --- Classe do Cog ---
 class UtilityCommands(commands.Cog):
@@ -24,6 +32,15 @@ class UtilityCommands(commands.Cog):
             "Por que a planta não responde? Porque ela é clorofila da puta."
         ]
 
+        self.lembretes = AgendadorDeLembretes(ArmazemDeLembretes(CAMINHO_LEMBRETES), self.entregar_lembrete)
+
+    async def cog_load(self):
+        self.lembretes.iniciar()
+
+    async def cog_unload(self):
+        self.lembretes.parar()
+        self.lembretes.armazem.fechar()
+
     # --- Funções Auxiliares ---
     def parse_time(self, time_str: str) -> int | None:
         """Converte uma string de tempo (ex: 10s, 5m, 1h) para segundos."""
@@ -37,6 +54,18 @@ class UtilityCommands(commands.Cog):
         if unit == 'h': return value * 3600
         return None
 
+    async def entregar_lembrete(self, lembrete):
+        """Envia o lembrete por DM; se a DM estiver fechada, menciona o usuário no canal de origem."""
+        await self.bot.wait_until_ready()
+        usuario = await self.bot.fetch_user(lembrete.usuario_id)
+        try:
+            await usuario.send(f"⏰ **Lembrete:** {lembrete.mensagem}")
+        except discord.Forbidden:
+            if lembrete.canal_id is None:
+                raise
+            canal = self.bot.get_channel(lembrete.canal_id) or await self.bot.fetch_channel(lembrete.canal_id)
+            await canal.send(f"⏰ {usuario.mention}, seu lembrete: {lembrete.mensagem}")
+
     # --- Comandos ---
     @app_commands.command(name="ajuda", description="Mostra uma lista de todos os comandos disponíveis.")
     async def ajuda(self, interaction: discord.Interaction):
@@ -77,25 +106,38 @@ class UtilityCommands(commands.Cog):
             await interaction.response.send_message(f"Formato de tempo inválido: '{tempo}'. Use 's', 'm', ou 'h'.", ephemeral=True)
             return
             
-        await interaction.response.send_message(f"Ok! Lembrete agendado para daqui a **{tempo}**.", ephemeral=True)
-        await asyncio.sleep(segundos)
-        
-        try:
-            await interaction.user.send(f"⏰ **Lembrete:** {mensagem}")
-        except discord.Forbidden:
-            await interaction.followup.send(f"⏰ {interaction.user.mention}, seu lembrete: {mensagem}", ephemeral=False)
+        lembrete = self.lembretes.agendar(interaction.user.id, interaction.channel_id, mensagem, segundos)
+        await interaction.response.send_message(f"Ok! Lembrete `#{lembrete.id}` agendado para daqui a **{tempo}**.", ephemeral=True)
 
     @app_commands.command(name="ponto", description="Agenda um lembrete de 1 hora para bater o ponto.")
     async def ponto(self, interaction: discord.Interaction):
         segundos = 3600 # 1 hora
         mensagem = "Lembre de bater o ponto"
+        self.lembretes.agendar(interaction.user.id, interaction.channel_id, mensagem, segundos)
         await interaction.response.send_message("Ok! Agendei seu lembrete para bater o ponto daqui a **1 hora**.", ephemeral=True)
-        await asyncio.sleep(segundos)
-        
-        try:
-            await interaction.user.send(f"⏰ **Lembrete:** {mensagem}")
-        except discord.Forbidden:
-            await interaction.followup.send(f"⏰ {interaction.user.mention}, seu lembrete: {mensagem}", ephemeral=False)
+
+    @app_commands.command(name="meus_lembretes", description="Lista os seus lembretes pendentes.")
+    async def meus_lembretes(self, interaction: discord.Interaction):
+        lembretes = self.lembretes.armazem.do_usuario(interaction.user.id)
+        if not lembretes:
+            await interaction.response.send_message("Você não tem nenhum lembrete pendente.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title="⏰ Seus Lembretes", color=discord.Color.blue())
+        linhas = [f"`#{l.id}` - <t:{int(l.vence_em)}:R> - {l.mensagem[:100]}" for l in lembretes[:25]]
+        if len(lembretes) > 25:
+            linhas.append(f"...e mais {len(lembretes) - 25} lembrete(s).")
+        embed.description = "\n".join(linhas)
+        embed.set_footer(text="Use /cancelar_lembrete com o número para cancelar.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="cancelar_lembrete", description="Cancela um dos seus lembretes pendentes.")
+    @app_commands.describe(numero="O número do lembrete (veja em /meus_lembretes).")
+    async def cancelar_lembrete(self, interaction: discord.Interaction, numero: int):
+        if self.lembretes.cancelar(numero, interaction.user.id):
+            await interaction.response.send_message(f"Lembrete `#{numero}` cancelado.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"Não encontrei nenhum lembrete seu com o número `#{numero}`.", ephemeral=True)
 
     @app_commands.command(name="status_bot", description="Verifica a saúde e as conexões do bot.")
     @app_commands.describe(efemero="Escolha 'Falso' para mostrar a resposta para todos.")
@@ -109,11 +151,27 @@ class UtilityCommands(commands.Cog):
         status_planilha = "Com Falha ❌"
         # Acessa o outro Cog para verificar o status da planilha
         spreadsheet_cog = self.bot.get_cog('SpreadsheetCommands')
-        if spreadsheet_cog and spreadsheet_cog.worksheet:
+        if spreadsheet_cog and spreadsheet_cog.leitor:
+            # Este processo não acessa o Google: mostra quando o sincronizador conferiu a planilha
+            publicacao = spreadsheet_cog.publicacao
+            if publicacao:
+                conferida = datetime.fromtimestamp(publicacao.conferido_em).strftime("%d/%m %H:%M")
+                status_planilha = f"Via processo sincronizador 🔁 (planilha conferida em {conferida})"
+            else:
+                status_planilha = "Aguardando o processo sincronizador ⏳"
+        elif spreadsheet_cog and spreadsheet_cog.worksheet:
             try:
-                # Tenta uma operação de leitura rápida e inofensiva
-                spreadsheet_cog.worksheet.cell(1, 1).value
+                # Tenta uma operação de leitura rápida e inofensiva, fora do event loop
+                await spreadsheet_cog.acesso.executar(spreadsheet_cog.worksheet.cell, 1, 1, timeout=10, tentativas=1)
                 status_planilha = "Ativa e Funcionando ✅"
+            except CircuitoAberto as e:
+                status_planilha = f"Suspensa ⏸️ (muitas falhas seguidas; nova tentativa em {e.tentar_em:.0f}s)"
+            except PlanilhaIndisponivel as e:
+                print(f"Erro no health check da planilha: {e}")
+                if isinstance(e.__cause__, asyncio.TimeoutError):
+                    status_planilha = "Lenta ⏳ (sem resposta em 10s)"
+                else:
+                    status_planilha = "Instável ⚠️ (o Google não respondeu)"
             except Exception as e:
                 print(f"Erro no health check da planilha: {e}")
                 status_planilha = f"Com Falha ❌ (Verificar Logs)"
@@ -134,6 +192,29 @@ class UtilityCommands(commands.Cog):
         
         await interaction.followup.send(embed=embed, ephemeral=efemero)
 
+    @app_commands.command(name="metricas", description="Mostra a latência dos comandos e o uso da cota do Google Sheets.")
+    @app_commands.describe(efemero="Escolha 'Falso' para mostrar a resposta para todos.")
+    async def metricas(self, interaction: discord.Interaction, efemero: bool = True):
+        embed = discord.Embed(title="📈 Métricas do Ajudante", color=discord.Color.dark_grey())
+
+        def tabela(grupo) -> str:
+            linhas = []
+            # Os mais lentos (p95) primeiro
+            for nome, m in sorted(grupo.items(), key=lambda item: -item[1].percentis()[1])[:10]:
+                p50, p95, p99 = (round(p * 1000) for p in m.percentis())
+                linhas.append(f"`{nome[:30]}` {m.total}x, {m.erros} erro(s) | p50 {p50}ms · p95 {p95}ms · p99 {p99}ms")
+            return "\n".join(linhas)[:1024] or "Nenhum registro ainda."
+
+        chamadas = metricas.chamadas_sheets_por_minuto()
+        uso = round(100 * chamadas / COTA_SHEETS_POR_MINUTO) if COTA_SHEETS_POR_MINUTO else 0
+        embed.add_field(name="Google Sheets (último minuto)", value=f"{chamadas}/{COTA_SHEETS_POR_MINUTO} chamadas ({uso}% da cota)", inline=False)
+        embed.add_field(name="Comandos", value=tabela(metricas.comandos), inline=False)
+        embed.add_field(name="Chamadas ao Google Sheets", value=tabela(metricas.sheets), inline=False)
+
+        timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        embed.set_footer(text=f"Verificado em: {timestamp}")
+        await interaction.response.send_message(embed=embed, ephemeral=efemero)
+
     @app_commands.command(name="avaliacao", description="Envia o formulário de avaliação de atendimento.")
     async def avaliacao(self, interaction: discord.Interaction):
         # O texto do formulário
@@ -179,7 +260,7 @@ class UtilityCommands(commands.Cog):
         # Envia a resposta no canal
         await interaction.response.send_message(embed=embed)
 
-    @app_-commands.command(name="piada", description="Eu te conto uma piada aleatória.")
+    @app_commands.command(name="piada", description="Eu te conto uma piada aleatória.")
     async def piada(self, interaction: discord.Interaction):
         """Escolhe e envia uma piada aleatória da lista."""
         
@@ -1,74 +1,178 @@
+import time
+INICIO_PROCESSO = time.perf_counter()  # Referência para os tempos de inicialização no log
+
 import discord
+from discord import app_commands
 from discord.ext import commands
 import os
 import asyncio
+import hashlib
+import json
 from dotenv import load_dotenv
-from flask import Flask
-from threading import Thread
+
+from servicos import LimiteDeUsoExcedido, ServidorDeSaude, metricas
 
 # Carrega as variáveis do arquivo .env (para testes locais)
 load_dotenv()
 TOKEN = os.environ.get("DISCORD_BOT_TOKEN")
 
-# --- INÍCIO DA PARTE DO SERVIDOR WEB ---
-# Criamos um servidor web mínimo apenas para manter o Render feliz.
-app = Flask('')
+# --- Configuração da Sincronização dos Comandos ---
+# Arquivo com o hash da última árvore de comandos enviada ao Discord e guild opcional de desenvolvimento
+# (sincronização instantânea só nela, em vez da global). COMANDOS_FORCAR_SYNC=1 ignora o hash salvo.
+CAMINHO_HASH_COMANDOS = os.environ.get("COMANDOS_HASH_ARQUIVO", "comandos_sincronizados.json")
+GUILD_DESENVOLVIMENTO = int(os.environ.get("COMANDOS_GUILD_DEV", 0))
+FORCAR_SYNC = os.environ.get("COMANDOS_FORCAR_SYNC", "") == "1"
+
+# --- Configuração dos Shards ---
+# SHARD_COUNT: total de shards do bot (0 = um único processo, sem sharding). SHARD_IDS: shards deste
+# processo, ex: "0,1" (vazio = todos). Com vários processos, só um usa PLANILHA_PAPEL=sincronizador.
+TOTAL_SHARDS = int(os.environ.get("SHARD_COUNT", 0))
+SHARDS_DO_PROCESSO = [int(s) for s in os.environ.get("SHARD_IDS", "").split(",") if s.strip()] or None
+# A árvore de comandos é a mesma em todos os processos: só o que tem o shard 0 a envia ao Discord
+ENVIA_COMANDOS = SHARDS_DO_PROCESSO is None or 0 in SHARDS_DO_PROCESSO
+
+
+# --- MÉTRICAS DOS COMANDOS DE BARRA ---
+class ArvoreComMetricas(app_commands.CommandTree):
+    """Árvore de comandos que mede a duração e os erros de todos os comandos de barra."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras['inicio'] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        # Comandos barrados por um check (limite de uso, permissão) não chegaram a rodar e o cog já
+        # respondeu ao usuário: não contam como erro nem geram traceback no log
+        if isinstance(error, (LimiteDeUsoExcedido, app_commands.CheckFailure)):
+            return
+        _registrar_comando(interaction, erro=True)
+        await super().on_error(interaction, error)
 
-@app.route('/')
-def health_check():
-    """Esta rota responde aos 'pings' do Render e do UptimeRobot."""
-    return "Bot de comandos está online!", 200
+    def calcular_hash(self, guild: discord.abc.Snowflake | None = None) -> str:
+        """Hash das definições (nomes, descrições, opções...) dos comandos como são enviadas ao Discord."""
+        definicoes = sorted((c.to_dict(self) for c in self.get_commands(guild=guild)), key=lambda d: (d.get('type', 1), d['name']))
+        return hashlib.sha256(json.dumps(definicoes, sort_keys=True).encode()).hexdigest()
 
-def run_flask():
-    """Roda o servidor Flask na porta que o Render espera."""
-    port = int(os.environ.get('PORT', 10000))
-    app.run(host='0.0.0.0', port=port)
-# --- FIM DA PARTE DO SERVIDOR WEB ---
+    async def sincronizar_se_mudou(self, caminho: str, guild: discord.abc.Snowflake | None = None, forcar: bool = False) -> int | None:
+        """Sincroniza os comandos só se o hash mudou desde a última vez. Devolve quantos foram sincronizados (ou None)."""
+        chave = f"{self.client.application_id}:{guild.id if guild else 'global'}"
+        try:
+            with open(caminho, encoding='utf-8') as arquivo:
+                hashes = json.load(arquivo)
+        except (OSError, ValueError):
+            hashes = {}
+
+        novo_hash = self.calcular_hash(guild)
+        if not forcar and hashes.get(chave) == novo_hash:
+            return None
+
+        synced = await self.sync(guild=guild)
+        hashes[chave] = novo_hash
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(hashes, arquivo, indent=2)
+        return len(synced)
+
+def _registrar_comando(interaction: discord.Interaction, erro: bool):
+    inicio = interaction.extras.get('inicio')
+    if inicio is not None and interaction.command is not None:
+        metricas.registrar_comando(interaction.command.qualified_name, time.perf_counter() - inicio, erro)
 
 
 # --- CONFIGURAÇÃO DO BOT ---
 intents = discord.Intents.default()
 intents.message_content = True
 intents.reactions = True # Adicionado para eventos de reação
-bot = commands.Bot(command_prefix='!', intents=intents)
+if TOTAL_SHARDS:
+    # Cada processo mantém só as conexões de gateway dos seus shards
+    bot = commands.AutoShardedBot(command_prefix='!', intents=intents, tree_cls=ArvoreComMetricas,
+                                  shard_count=TOTAL_SHARDS, shard_ids=SHARDS_DO_PROCESSO)
+else:
+    bot = commands.Bot(command_prefix='!', intents=intents, tree_cls=ArvoreComMetricas)
+
+# --- SERVIDOR DE SAÚDE ---
+# Responde aos 'pings' do Render e do UptimeRobot no próprio event loop do bot (sem thread extra).
+servidor_saude = ServidorDeSaude(bot, porta=int(os.environ.get('PORT', 10000)))
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    # Comandos que trataram o próprio erro (e responderam "Ocorreu um erro...") marcam a interação
+    _registrar_comando(interaction, erro=interaction.extras.get('erro', False))
 
 # --- EVENTO ON_READY ---
+def _desde_o_inicio() -> str:
+    return f"{time.perf_counter() - INICIO_PROCESSO:.2f}s"
+
+primeiro_on_ready = True
+
+async def sincronizar_comandos():
+    """Envia os comandos de barra ao Discord apenas quando as definições mudaram."""
+    guild = None
+    if GUILD_DESENVOLVIMENTO:
+        # Comandos de guild aparecem na hora, sem a espera (e o limite) da sincronização global
+        guild = discord.Object(id=GUILD_DESENVOLVIMENTO)
+        bot.tree.copy_global_to(guild=guild)
+    try:
+        sincronizados = await bot.tree.sincronizar_se_mudou(CAMINHO_HASH_COMANDOS, guild=guild, forcar=FORCAR_SYNC)
+        escopo = f"na guild {GUILD_DESENVOLVIMENTO}" if guild else "globalmente"
+        if sincronizados is None:
+            print(f"Comandos de barra sem mudanças desde a última sincronização ({escopo}).")
+        else:
+            print(f"Sincronizados {sincronizados} comandos de barra {escopo}.")
+    except Exception as e:
+        print(f"Erro ao sincronizar comandos: {e}")
+
 @bot.event
 async def on_ready():
-    """Evento que roda quando o bot está online e pronto."""
+    """Evento que roda quando o bot está online e pronto (também após cada reconexão)."""
+    global primeiro_on_ready
     print(f'Bot conectado como {bot.user}')
+    if TOTAL_SHARDS:
+        print(f"Shards deste processo: {', '.join(map(str, sorted(bot.shards)))} (de {TOTAL_SHARDS}).")
+    if primeiro_on_ready:
+        primeiro_on_ready = False
+        print(f"[Inicialização] on_ready em {_desde_o_inicio()}.")
+        # Os comandos só mudam com um novo deploy: reconexões não precisam sincronizar de novo
+        if ENVIA_COMANDOS:
+            await sincronizar_comandos()
+    print('---------------------------')
+
+# --- CARREGAMENTO DOS COGS ---
+async def carregar_cog(nome: str):
+    """Carrega um cog e registra quanto tempo levou. Uma falha não impede os demais."""
+    inicio = time.perf_counter()
     try:
-        synced = await bot.tree.sync()
-        print(f"Sincronizados {len(synced)} comandos de barra.")
+        await bot.load_extension(f'cogs.{nome}')
+        print(f"Cog '{nome}' carregado com sucesso em {time.perf_counter() - inicio:.2f}s.")
     except Exception as e:
-        print(f"Erro ao sincronizar comandos: {e}")
-    print('---------------------------')
+        print(f"Falha ao carregar o cog {nome}: {e}")
+
+async def carregar_cogs():
+    """Carrega todos os cogs da pasta 'cogs' ao mesmo tempo."""
+    print("Carregando Cogs...")
+    nomes = [filename[:-3] for filename in os.listdir('./cogs') if filename.endswith('.py')]
+    await asyncio.gather(*(carregar_cog(nome) for nome in nomes))
+    print(f"[Inicialização] Cogs carregados em {_desde_o_inicio()}.")
 
 # --- FUNÇÃO PRINCIPAL ---
 async def main():
     """Função principal que carrega os cogs e inicia o bot."""
-    print("Carregando Cogs...")
-    # Itera sobre os arquivos na pasta 'cogs'
-    for filename in os.listdir('./cogs'):
-        if filename.endswith('.py'):
-            try:
-                await bot.load_extension(f'cogs.{filename[:-3]}')
-                print(f"Cog '{filename[:-3]}' carregado com sucesso.")
-            except Exception as e:
-                print(f"Falha ao carregar o cog {filename[:-3]}: {e}")
-    
-    # Inicia o bot
-    if TOKEN:
-        await bot.start(TOKEN)
-    else:
-        print("ERRO CRÍTICO: O Secret DISCORD_BOT_TOKEN não foi encontrado.")
+    # Sobe o servidor de saúde primeiro, para que a porta do Render responda logo
+    await servidor_saude.iniciar()
+    print(f"[Inicialização] Servidor de saúde no ar em {_desde_o_inicio()}.")
+
+    try:
+        if TOKEN:
+            # O login (HTTP) roda enquanto os cogs carregam; a conexão à planilha fica em segundo plano nos cogs
+            await asyncio.gather(bot.login(TOKEN), carregar_cogs())
+            print(f"[Inicialização] Login feito em {_desde_o_inicio()}.")
+            await bot.connect()
+        else:
+            print("ERRO CRÍTICO: O Secret DISCORD_BOT_TOKEN não foi encontrado.")
+    finally:
+        await servidor_saude.parar()
+        await bot.close()
 
 # --- INICIALIZAÇÃO ---
 if __name__ == "__main__":
-    # Inicia o servidor web Flask em uma thread de fundo
-    flask_thread = Thread(target=run_flask)
-    flask_thread.daemon = True
-    flask_thread.start()
-    
-    # Roda o bot do Discord na thread principal usando asyncio
+    # Roda o bot do Discord (e o servidor de saúde) na thread principal usando asyncio
     asyncio.run(main())
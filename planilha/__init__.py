@@ -0,0 +1,26 @@
+"""Camada de acesso e cache da Planilha Google usada pelos cogs."""
+from .acesso import AcessoPlanilha
+from .assinaturas import POR_ORCAMENTO, POR_STATUS, CentralDeAssinaturas
+from .busca import IndiceDeClientes, normalizar_texto
+from .cache import CacheDePlanilha, Snapshot
+from .colunar import ListaDeRegistros, Orcamento, TabelaColunar, normalizar_status
+from .consulta import ORDEM_DATA, ORDEM_PLANILHA, ORDEM_STATUS, Consulta, Plano, executar, planejar
+from .datas import DataInvalida, formatar_data_br, parse_data_br
+from .escrita import FilaDeEscrita
+from .indice import IndiceDePlanilha
+from .painel import PainelDeCarga, quantidade_de_documentos
+from .persistencia import ArmazemDeSnapshots, Publicacao
+from .registro import AbaAberta, RegistroDeAbas, identificar_mes, titulo_do_mes
+from .resiliencia import CircuitoAberto, DisjuntorDeCircuito, PlanilhaIndisponivel, PoliticaDeRetentativa
+from .resumo import STATUS_FINALIZADOS, Resumo, calcular_resumo, consulta_atrasados, projetos_atrasados
+from .sincronizacao import EventoDeLinha, SincronizadorDePlanilha
+
+__all__ = ["AcessoPlanilha", "CentralDeAssinaturas", "POR_ORCAMENTO", "POR_STATUS",
+           "IndiceDeClientes", "normalizar_texto",
+           "CacheDePlanilha", "Snapshot", "ListaDeRegistros", "Orcamento", "TabelaColunar", "normalizar_status",
+           "Consulta", "Plano", "planejar", "executar", "ORDEM_DATA", "ORDEM_PLANILHA", "ORDEM_STATUS", "DataInvalida", "formatar_data_br", "parse_data_br",
+           "FilaDeEscrita", "IndiceDePlanilha",
+           "PainelDeCarga", "quantidade_de_documentos", "ArmazemDeSnapshots", "Publicacao", "AbaAberta", "RegistroDeAbas", "identificar_mes", "titulo_do_mes",
+           "CircuitoAberto", "DisjuntorDeCircuito", "PlanilhaIndisponivel", "PoliticaDeRetentativa",
+           "STATUS_FINALIZADOS", "Resumo", "calcular_resumo", "consulta_atrasados", "projetos_atrasados",
+           "EventoDeLinha", "SincronizadorDePlanilha"]
@@ -0,0 +1,90 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+from .resiliencia import DisjuntorDeCircuito, PlanilhaIndisponivel, PoliticaDeRetentativa, erro_transitorio
+
+
+# --- Acesso Assíncrono à Planilha ---
+class AcessoPlanilha:
+    """Executa as chamadas bloqueantes do gspread fora do event loop.
+
+    Cada chamada roda em um pool de threads limitado e tem um tempo máximo.
+    Assim, uma resposta lenta do Google atrasa apenas o comando que a pediu,
+    e não o heartbeat do gateway nem as outras interações.
+
+    Erros passageiros (429, 5xx, tempo esgotado, rede) são tentados de novo
+    conforme a `politica`, e o `disjuntor` suspende as chamadas depois de
+    muitas falhas seguidas, para não insistir enquanto o Google está fora.
+
+    Se `ao_terminar` for informado, ele é chamado ao fim de cada tentativa com
+    (nome da função, duração em segundos, se deu erro) — usado pelas métricas.
+    """
+
+    def __init__(self, max_threads: int = 4, timeout: float = 30,
+                 ao_terminar: Callable[[str, float, bool], None] | None = None,
+                 politica: PoliticaDeRetentativa | None = None, disjuntor: DisjuntorDeCircuito | None = None,
+                 dormir: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.timeout = timeout
+        self.ao_terminar = ao_terminar
+        self.politica = politica or PoliticaDeRetentativa()
+        self.disjuntor = disjuntor or DisjuntorDeCircuito()
+        self.dormir = dormir
+        self._executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="planilha")
+
+    async def executar(self, funcao: Callable[..., Any], *args, timeout: float | None = None,
+                       tentativas: int | None = None, **kwargs) -> Any:
+        """Roda `funcao(*args, **kwargs)` no pool, com novas tentativas para erros passageiros.
+
+        Levanta `CircuitoAberto` na hora se o disjuntor estiver aberto, e
+        `PlanilhaIndisponivel` se todas as tentativas falharem. Os demais erros
+        (ex: aba inexistente, permissão) sobem sem novas tentativas.
+        """
+        tentativas = tentativas or self.politica.tentativas
+        for tentativa in range(tentativas):
+            teste = self.disjuntor.verificar()
+            try:
+                resultado = await self._executar_uma_vez(funcao, args, kwargs, timeout)
+            except Exception as erro:
+                if not erro_transitorio(erro):
+                    self.disjuntor.registrar_sucesso()  # O Google respondeu; o problema é outro
+                    raise
+                self.disjuntor.registrar_falha()
+                if tentativa == tentativas - 1:
+                    nome = getattr(funcao, "__qualname__", "chamada")
+                    raise PlanilhaIndisponivel(
+                        f"o Google Sheets não respondeu a '{nome}' após {tentativas} tentativa(s): {erro!r}"
+                    ) from erro
+                await self.dormir(self.politica.espera(tentativa, erro))
+            except BaseException:
+                if teste:  # Cancelada: não diz nada sobre o Google
+                    self.disjuntor.cancelar_teste()
+                raise
+            else:
+                self.disjuntor.registrar_sucesso()
+                return resultado
+
+    async def _executar_uma_vez(self, funcao: Callable[..., Any], args: tuple, kwargs: dict, timeout: float | None) -> Any:
+        """Uma tentativa, com no máximo `timeout` segundos.
+
+        Se o tempo estourar (ou quem chamou for cancelado), a chamada que ainda
+        estiver na fila do pool é cancelada; uma que já começou termina em
+        segundo plano e o resultado é descartado.
+        """
+        loop = asyncio.get_running_loop()
+        futuro = loop.run_in_executor(self._executor, functools.partial(funcao, *args, **kwargs))
+        inicio = time.perf_counter()
+        erro = True
+        try:
+            resultado = await asyncio.wait_for(futuro, timeout if timeout is not None else self.timeout)
+            erro = False
+            return resultado
+        finally:
+            if self.ao_terminar:
+                self.ao_terminar(getattr(funcao, "__qualname__", "chamada"), time.perf_counter() - inicio, erro)
+
+    def fechar(self):
+        """Libera o pool de threads, descartando as chamadas ainda na fila."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
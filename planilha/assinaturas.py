@@ -0,0 +1,164 @@
+import asyncio
+import sqlite3
+from typing import Awaitable, Callable
+
+from .colunar import COLUNA_CLIENTE, normalizar_status
+from .sincronizacao import ADICIONADO, STATUS_ALTERADO, EventoDeLinha
+
+# Tipos de assinatura
+POR_STATUS = "status"
+POR_ORCAMENTO = "orcamento"
+
+# Acima deste número de mudanças em um lote, o canal recebe um resumo por transição em vez de uma linha por orçamento
+LIMITE_DETALHADO = 30
+
+
+def dividir_mensagens(linhas: list[str], limite: int = 2000) -> list[str]:
+    """Junta as linhas no menor número de mensagens que respeitam o limite do Discord."""
+    mensagens = []
+    atual = ""
+    for linha in linhas:
+        linha = linha[:limite]
+        if atual and len(atual) + 1 + len(linha) > limite:
+            mensagens.append(atual)
+            atual = ""
+        atual = f"{atual}\n{linha}" if atual else linha
+    if atual:
+        mensagens.append(atual)
+    return mensagens
+
+
+# --- Central de Assinaturas ---
+class CentralDeAssinaturas:
+    """Distribui as mudanças de status da planilha para os canais que as seguem.
+
+    Os canais podem seguir um status (coluna H) ou um orçamento (coluna D). As
+    mudanças são acumuladas por canal e enviadas em lote a cada `intervalo`
+    segundos, de modo que uma edição em massa vira poucas mensagens. Se o mesmo
+    orçamento mudar várias vezes dentro do intervalo, só vale a transição total.
+
+    Com o bot em vários processos, todos gravam no mesmo banco, mas só o
+    sincronizador recebe as mudanças: ele relê as assinaturas a cada lote.
+    """
+
+    def __init__(self, caminho: str, enviar: Callable[[int, str], Awaitable[None]], intervalo: float = 5):
+        self.enviar = enviar
+        self.intervalo = intervalo
+        self.conexao = sqlite3.connect(caminho, timeout=10)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute(
+            """CREATE TABLE IF NOT EXISTS assinaturas (
+                canal_id INTEGER NOT NULL,
+                tipo TEXT NOT NULL,
+                chave TEXT NOT NULL,
+                PRIMARY KEY (canal_id, tipo, chave)
+            )"""
+        )
+        self.conexao.commit()
+        self.assinantes: dict[tuple[str, str], set[int]] = {}
+        self._carregar()
+        # canal -> {id do orçamento: [status inicial, status final, cliente]}
+        self._pendentes: dict[int, dict[str, list[str]]] = {}
+        self._tarefa: asyncio.Task | None = None
+
+    def _carregar(self):
+        assinantes = {}
+        for canal_id, tipo, chave in self.conexao.execute("SELECT canal_id, tipo, chave FROM assinaturas"):
+            assinantes.setdefault((tipo, chave), set()).add(canal_id)
+        self.assinantes = assinantes
+
+    @staticmethod
+    def _chave(tipo: str, valor: str) -> str:
+        return normalizar_status(valor) if tipo == POR_STATUS else valor.strip()
+
+    def seguir(self, canal_id: int, tipo: str, valor: str):
+        chave = self._chave(tipo, valor)
+        self.conexao.execute("INSERT OR IGNORE INTO assinaturas VALUES (?, ?, ?)", (canal_id, tipo, chave))
+        self.conexao.commit()
+        self.assinantes.setdefault((tipo, chave), set()).add(canal_id)
+
+    def deixar_de_seguir(self, canal_id: int, tipo: str, valor: str) -> bool:
+        chave = self._chave(tipo, valor)
+        cursor = self.conexao.execute(
+            "DELETE FROM assinaturas WHERE canal_id = ? AND tipo = ? AND chave = ?", (canal_id, tipo, chave)
+        )
+        self.conexao.commit()
+        self.assinantes.get((tipo, chave), set()).discard(canal_id)
+        return cursor.rowcount > 0
+
+    def do_canal(self, canal_id: int) -> list[tuple[str, str]]:
+        return self.conexao.execute(
+            "SELECT tipo, chave FROM assinaturas WHERE canal_id = ? ORDER BY tipo, chave", (canal_id,)
+        ).fetchall()
+
+    # --- Recebimento e envio ---
+    def receber(self, eventos: list[EventoDeLinha]):
+        """Ouvinte do sincronizador: acumula as transições de status para cada canal interessado."""
+        if eventos:
+            self._carregar()  # Inclui as assinaturas feitas nos outros processos
+        for evento in eventos:
+            if evento.tipo not in (ADICIONADO, STATUS_ALTERADO):
+                continue
+            canais = set(self.assinantes.get((POR_ORCAMENTO, evento.id), ()))
+            canais |= self.assinantes.get((POR_STATUS, normalizar_status(evento.status)), set())
+            if evento.status_anterior is not None:
+                canais |= self.assinantes.get((POR_STATUS, normalizar_status(evento.status_anterior)), set())
+            for canal_id in canais:
+                pendentes = self._pendentes.setdefault(canal_id, {})
+                if evento.id in pendentes:
+                    pendentes[evento.id][1] = evento.status
+                else:
+                    pendentes[evento.id] = [evento.status_anterior, evento.status, evento.linha[COLUNA_CLIENTE]]
+
+    def iniciar(self):
+        self._tarefa = asyncio.create_task(self._enviar_periodicamente())
+
+    def parar(self):
+        if self._tarefa:
+            self._tarefa.cancel()
+
+    async def _enviar_periodicamente(self):
+        while True:
+            await asyncio.sleep(self.intervalo)
+            await self.enviar_pendentes()
+
+    @staticmethod
+    def _formatar(mudancas: dict[str, list[str]]) -> list[str]:
+        mudancas = {
+            id_orcamento: (anterior, atual, cliente)
+            for id_orcamento, (anterior, atual, cliente) in mudancas.items()
+            if anterior is None or normalizar_status(anterior) != normalizar_status(atual)
+        }
+        if len(mudancas) <= LIMITE_DETALHADO:
+            linhas = []
+            for id_orcamento, (anterior, atual, cliente) in mudancas.items():
+                if anterior is None:
+                    linhas.append(f"🆕 `{id_orcamento}` - {cliente}: **{atual.strip()}**")
+                else:
+                    linhas.append(f"🔄 `{id_orcamento}` - {cliente}: {anterior.strip()} → **{atual.strip()}**")
+            return linhas
+
+        # Edição em massa: agrupa por transição
+        transicoes: dict[tuple[str, str], list[str]] = {}
+        for id_orcamento, (anterior, atual, _) in mudancas.items():
+            origem = anterior.strip() if anterior is not None else "🆕 novo"
+            transicoes.setdefault((origem, atual.strip()), []).append(id_orcamento)
+        linhas = [f"📦 **{len(mudancas)} orçamentos mudaram de status:**"]
+        for (origem, destino), ids in sorted(transicoes.items(), key=lambda item: -len(item[1])):
+            exemplos = ", ".join(f"`{i}`" for i in ids[:5])
+            resto = f" e mais {len(ids) - 5}" if len(ids) > 5 else ""
+            linhas.append(f"🔄 {origem} → **{destino}**: {len(ids)} ({exemplos}{resto})")
+        return linhas
+
+    async def enviar_pendentes(self):
+        pendentes, self._pendentes = self._pendentes, {}
+        for canal_id, mudancas in pendentes.items():
+            linhas = self._formatar(mudancas)
+            for mensagem in dividir_mensagens(linhas):
+                try:
+                    await self.enviar(canal_id, mensagem)
+                except Exception as e:
+                    print(f"Erro ao enviar mudanças de status para o canal {canal_id}: {e}")
+
+    def fechar(self):
+        self.conexao.close()
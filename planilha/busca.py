@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from .colunar import ListaDeRegistros
+
+if TYPE_CHECKING:
+    from .colunar import Orcamento, TabelaColunar
+
+
+def normalizar_texto(texto: str) -> str:
+    """Remove acentos, maiúsculas e espaços extras: 'João  Conceição' -> 'joao conceicao'."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def _trigramas(texto: str) -> set[str]:
+    texto = f"  {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+# --- Índice de Clientes ---
+class IndiceDeClientes:
+    """Índice de trigramas e de prefixos sobre os nomes de clientes (coluna C).
+
+    Construído uma vez por snapshot; cada busca olha apenas os nomes que
+    compartilham trigramas com a consulta, sem varrer as linhas da planilha.
+    """
+
+    def __init__(self, tabela: TabelaColunar):
+        self.nomes: list[str] = []  # Nome original (primeira grafia vista)
+        self.normalizados: list[str] = []
+        posicoes: dict[str, int] = {}
+        # Cada grafia diferente da coluna C é normalizada uma única vez
+        nome_do_codigo = []  # Código do texto na tabela -> posição do nome (-1 = vazio)
+        for texto in tabela.textos_clientes.textos:
+            normalizado = normalizar_texto(texto)
+            if normalizado and normalizado not in posicoes:
+                posicoes[normalizado] = len(self.nomes)
+                self.nomes.append(texto.strip())
+                self.normalizados.append(normalizado)
+            nome_do_codigo.append(posicoes[normalizado] if normalizado else -1)
+        linhas_por_nome = [array("i") for _ in self.nomes]
+        for posicao, codigo in enumerate(tabela.clientes):
+            nome = nome_do_codigo[codigo]
+            if nome >= 0:
+                linhas_por_nome[nome].append(posicao)
+        self.registros = [ListaDeRegistros(tabela, linhas) for linhas in linhas_por_nome]  # Orçamentos de cada nome
+
+        self._trigramas: dict[str, list[int]] = {}
+        for posicao, normalizado in enumerate(self.normalizados):
+            for trigrama in _trigramas(normalizado):
+                self._trigramas.setdefault(trigrama, []).append(posicao)
+        # Prefixos: nomes normalizados em ordem alfabética
+        self._ordenados = sorted(range(len(self.normalizados)), key=self.normalizados.__getitem__)
+        self._chaves_ordenadas = [self.normalizados[i] for i in self._ordenados]
+        self._posicoes = posicoes
+
+    def exato(self, nome: str) -> Sequence[Orcamento]:
+        posicao = self._posicoes.get(normalizar_texto(nome))
+        return self.registros[posicao] if posicao is not None else []
+
+    def contendo(self, trecho: str) -> list[ListaDeRegistros]:
+        """Orçamentos (agrupados por nome) dos clientes cujo nome contém `trecho`, sem acento.
+
+        Com 3 letras ou mais, só os nomes que têm todos os trigramas do trecho são conferidos.
+        """
+        trecho = normalizar_texto(trecho)
+        if len(trecho) < 3:
+            candidatos = range(len(self.normalizados))
+        else:
+            listas = sorted((self._trigramas.get(trecho[i:i + 3], []) for i in range(len(trecho) - 2)), key=len)
+            candidatos = sorted(set(listas[0]).intersection(*listas[1:]))
+        return [self.registros[p] for p in candidatos if trecho in self.normalizados[p]]
+
+    def _por_prefixo(self, prefixo: str, limite: int) -> list[int]:
+        inicio = bisect_left(self._chaves_ordenadas, prefixo)
+        encontrados = []
+        for i in range(inicio, len(self._chaves_ordenadas)):
+            if not self._chaves_ordenadas[i].startswith(prefixo) or len(encontrados) >= limite:
+                break
+            encontrados.append(self._ordenados[i])
+        return encontrados
+
+    def buscar(self, consulta: str, limite: int = 25) -> list[tuple[str, float, ListaDeRegistros]]:
+        """Devolve (nome, similaridade de 0 a 1, orçamentos) dos nomes mais parecidos com a consulta."""
+        consulta = normalizar_texto(consulta)
+        if not consulta:
+            return []
+        if len(consulta) < 3:
+            return [(self.nomes[i], 1.0, self.registros[i]) for i in self._por_prefixo(consulta, limite)]
+
+        trigramas_consulta = _trigramas(consulta)
+        comuns: dict[int, int] = {}
+        for trigrama in trigramas_consulta:
+            for posicao in self._trigramas.get(trigrama, ()):
+                comuns[posicao] = comuns.get(posicao, 0) + 1
+
+        pontuados = []
+        for posicao, quantidade in comuns.items():
+            normalizado = self.normalizados[posicao]
+            pontuacao = 2 * quantidade / (len(trigramas_consulta) + len(normalizado) + 2)
+            # Quem começa com (ou contém) a consulta aparece primeiro
+            if normalizado.startswith(consulta):
+                pontuacao += 1
+            elif consulta in normalizado:
+                pontuacao += 0.5
+            pontuados.append((min(pontuacao / 2, 1.0), posicao))
+        pontuados.sort(key=lambda item: (-item[0], self.normalizados[item[1]]))
+        return [(self.nomes[p], pontuacao, self.registros[p]) for pontuacao, p in pontuados[:limite] if pontuacao >= 0.15]
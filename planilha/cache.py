@@ -0,0 +1,146 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import cached_property
+from typing import Awaitable, Callable
+
+from .colunar import Orcamento, TabelaColunar
+from .indice import IndiceDePlanilha
+from .painel import PainelDeCarga
+
+
+# --- Snapshot da Planilha ---
+@dataclass
+class Snapshot:
+    """Uma cópia dos dados da planilha em um determinado momento.
+
+    Só muda com `alterar_status()`, que aplica na hora as mudanças feitas pelo
+    próprio bot enquanto elas aguardam para serem gravadas na planilha.
+    """
+    versao: int
+    tabela: TabelaColunar
+    carregado_em: float = field(default_factory=time.monotonic)
+    carregado_em_data: datetime = field(default_factory=datetime.now)
+    do_disco: bool = False  # Carregado do arquivo local, ainda não confirmado por uma sincronização
+    alteracoes: int = 0     # Mudanças de status aplicadas com `alterar_status()`
+
+    @property
+    def idade(self) -> float:
+        """Idade do snapshot em segundos."""
+        return time.monotonic() - self.carregado_em
+
+    def renovar(self):
+        """Marca o snapshot como conferido agora (a planilha não mudou desde o download)."""
+        self.carregado_em = time.monotonic()
+        self.carregado_em_data = datetime.now()
+        self.do_disco = False
+
+    @cached_property
+    def indice(self) -> IndiceDePlanilha:
+        """Índices sobre as colunas, construídos uma única vez por snapshot."""
+        return IndiceDePlanilha(self.tabela)
+
+    @cached_property
+    def painel(self) -> PainelDeCarga:
+        """Contadores do /painel, montados uma única vez por snapshot."""
+        return PainelDeCarga(self.tabela)
+
+    def alterar_status(self, id_orcamento: str, novo_status: str) -> Orcamento | None:
+        """Atualização otimista: muda o status na tabela, nos índices e nos contadores. Devolve None se o ID não existir."""
+        registro = self.indice.buscar_id(id_orcamento)
+        if registro is None:
+            return None
+        painel = self.__dict__.get("painel")  # Só ajusta os contadores se já tiverem sido montados
+        if painel is not None:
+            painel.remover(registro)
+        self.indice.alterar_status(id_orcamento, novo_status)
+        if painel is not None:
+            painel.adicionar(registro)
+        self.alteracoes += 1
+        return registro
+
+    def memoria(self) -> int:
+        """Bytes ocupados pela tabela e pelos índices já construídos (aproximado)."""
+        return self.tabela.memoria() + (self.indice.memoria() if "indice" in self.__dict__ else 0)
+
+
+# --- Cache Compartilhado ---
+class CacheDePlanilha:
+    """Mantém um único snapshot versionado da planilha para todos os comandos.
+
+    O `carregador` devolve a tabela da planilha, ou `None` quando ela não
+    mudou desde o último download; nesse caso o snapshot atual (e seus
+    índices) é reaproveitado sem criar uma nova versão.
+
+    - `obter()` devolve o snapshot atual enquanto ele for mais novo que `idade_maxima`.
+    - Downloads concorrentes são agrupados (single-flight): vários cache misses
+      ao mesmo tempo resultam em apenas um `carregador()`.
+    - Um snapshot carregado do disco é servido como está (mesmo que antigo) até
+      a primeira sincronização terminar, para que o bot responda logo ao iniciar.
+    - Se o download falhar (ex: Google fora do ar), `obter()` devolve o último
+      snapshot bom, mesmo velho; `desatualizado` indica quando isso acontece.
+    """
+
+    def __init__(self, carregador: Callable[[], Awaitable[TabelaColunar | None]], idade_maxima: float = 300):
+        self.carregador = carregador
+        # Chamado em uma thread a cada novo snapshot, antes de ele ser usado (ex: para montar os índices)
+        self.preparar: Callable[[Snapshot], None] | None = None
+        # Chamado a cada novo snapshot (ex: para reaplicar mudanças que ainda não chegaram à planilha)
+        self.ao_carregar: Callable[[Snapshot], None] | None = None
+        self.idade_maxima = idade_maxima
+        self.snapshot: Snapshot | None = None
+        self.ultimo_erro: Exception | None = None  # Erro do último download, se ele falhou
+        self._versao = 0
+        self._download_em_andamento: asyncio.Task | None = None
+
+    def esta_valido(self) -> bool:
+        return self.snapshot is not None and self.snapshot.idade <= self.idade_maxima
+
+    @property
+    def desatualizado(self) -> bool:
+        """True se o snapshot atual está velho demais porque o último download falhou."""
+        return self.snapshot is not None and self.ultimo_erro is not None and not self.esta_valido()
+
+    async def obter(self) -> Snapshot:
+        """Devolve o snapshot atual, baixando um novo se estiver ausente ou velho demais.
+
+        Se o download falhar e já houver um snapshot, ele é devolvido mesmo assim.
+        """
+        if self.esta_valido() or (self.snapshot is not None and self.snapshot.do_disco):
+            return self.snapshot
+        try:
+            return await self.atualizar()
+        except Exception:
+            if self.snapshot is None:
+                raise
+            return self.snapshot
+
+    async def atualizar(self) -> Snapshot:
+        """Força um novo download. Chamadas simultâneas compartilham o mesmo download."""
+        if self._download_em_andamento is None:
+            self._download_em_andamento = asyncio.create_task(self._baixar())
+        # shield: se quem chamou for cancelado, o download continua para os demais
+        return await asyncio.shield(self._download_em_andamento)
+
+    async def _baixar(self) -> Snapshot:
+        try:
+            tabela = await self.carregador()
+            self.ultimo_erro = None
+            if tabela is None and self.snapshot is not None:
+                self.snapshot.renovar()
+                return self.snapshot
+            self._versao += 1
+            snapshot = Snapshot(versao=self._versao, tabela=tabela)
+            if self.preparar:
+                # Fora do event loop; os comandos só veem o snapshot depois de pronto
+                await asyncio.to_thread(self.preparar, snapshot)
+            if self.ao_carregar:
+                self.ao_carregar(snapshot)
+            self.snapshot = snapshot
+            return self.snapshot
+        except Exception as e:
+            self.ultimo_erro = e
+            raise
+        finally:
+            self._download_em_andamento = None
@@ -0,0 +1,249 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import date
+from typing import Iterable, Iterator
+
+from .datas import DataInvalida, normalizar_datas
+
+# --- Colunas usadas da aba (índices a partir de 0) ---
+COLUNA_DATA = 1        # Coluna B
+COLUNA_CLIENTE = 2     # Coluna C
+COLUNA_ID = 3          # Coluna D
+COLUNA_QTD_DOCS = 4    # Coluna E
+COLUNA_STATUS = 7      # Coluna H
+LARGURA_LINHA = COLUNA_STATUS + 1
+
+
+def normalizar_status(status: str) -> str:
+    """Padroniza um status para comparação: ignora espaços extras e maiúsculas."""
+    return " ".join(status.split()).casefold()
+
+
+# --- Textos Compartilhados ---
+class TabelaDeTextos:
+    """Guarda cada texto diferente uma única vez; as colunas guardam só o código (posição) dele."""
+
+    __slots__ = ("textos", "_codigos")
+
+    def __init__(self):
+        self.textos: list[str] = []
+        self._codigos: dict[str, int] | None = {}
+
+    def codigo(self, texto: str) -> int:
+        if self._codigos is None:
+            self._codigos = {t: c for c, t in enumerate(self.textos)}
+        codigo = self._codigos.get(texto)
+        if codigo is None:
+            codigo = self._codigos[texto] = len(self.textos)
+            self.textos.append(texto)
+        return codigo
+
+    def compactar(self):
+        """Descarta o dicionário de códigos (refeito no próximo `codigo()`, se houver)."""
+        self._codigos = None
+
+    def __getitem__(self, codigo: int) -> str:
+        return self.textos[codigo]
+
+    def __len__(self) -> int:
+        return len(self.textos)
+
+    def memoria(self) -> int:
+        total = sys.getsizeof(self.textos) + sum(map(sys.getsizeof, self.textos))
+        return total + (sys.getsizeof(self._codigos) if self._codigos is not None else 0)
+
+
+class TextosCompactos(Sequence):
+    """Muitos textos curtos (os números de orçamento) em uma única string, com o início de cada um em um array."""
+
+    __slots__ = ("_texto", "_inicios")
+
+    def __init__(self, textos: Iterable[str]):
+        partes = list(textos)
+        inicios = array("I", [0])
+        total = 0
+        for parte in partes:
+            total += len(parte)
+            inicios.append(total)
+        self._texto = "".join(partes)
+        self._inicios = inicios
+
+    def __len__(self) -> int:
+        return len(self._inicios) - 1
+
+    def __getitem__(self, posicao: int) -> str:
+        if not 0 <= posicao < len(self):
+            raise IndexError(posicao)
+        return self._texto[self._inicios[posicao]:self._inicios[posicao + 1]]
+
+    def memoria(self) -> int:
+        return sys.getsizeof(self._texto) + sys.getsizeof(self._inicios)
+
+
+# --- Tabela Colunar ---
+class TabelaColunar:
+    """As colunas usadas de uma aba (B, C, D, E e H), guardadas coluna a coluna.
+
+    Textos que se repetem (datas, clientes, quantidades e status) ficam uma vez
+    só em uma `TabelaDeTextos`, e cada linha guarda apenas o código deles em um
+    `array`. As datas são guardadas como ordinais (0 = sem data) e os números de
+    orçamento em uma única string. A posição 0 é a linha 2 da planilha (a 1 é o
+    cabeçalho).
+    """
+
+    def __init__(self, linhas: list[list[str]], referencia: date | None = None, datas: Sequence[int] | None = None):
+        self.cabecalho = list(linhas[0]) if linhas else []
+        self.textos_datas = TabelaDeTextos()
+        self.textos_clientes = TabelaDeTextos()
+        self.textos_qtd = TabelaDeTextos()
+        self.textos_status = TabelaDeTextos()
+        self.codigos_datas = array("I")
+        self.clientes = array("I")
+        self.qtd_documentos = array("I")
+        self.status = array("H")
+        ids = []
+        for linha in linhas[1:]:  # Pula o cabeçalho
+            if len(linha) < LARGURA_LINHA:
+                linha = linha + [""] * (LARGURA_LINHA - len(linha))
+            self.codigos_datas.append(self.textos_datas.codigo(linha[COLUNA_DATA]))
+            self.clientes.append(self.textos_clientes.codigo(linha[COLUNA_CLIENTE]))
+            self.qtd_documentos.append(self.textos_qtd.codigo(linha[COLUNA_QTD_DOCS]))
+            self.status.append(self.textos_status.codigo(linha[COLUNA_STATUS]))
+            ids.append(linha[COLUNA_ID].strip())
+        self.ids = TextosCompactos(ids)
+        self.status_normalizados = [normalizar_status(s) for s in self.textos_status.textos]
+        # Só os status recebem textos novos depois de montada a tabela (em `alterar_status`)
+        for textos in (self.textos_datas, self.textos_clientes, self.textos_qtd):
+            textos.compactar()
+
+        if datas is None:
+            # Cada texto de data diferente é interpretado uma única vez
+            por_codigo, _ = normalizar_datas(self.textos_datas.textos, referencia)
+            ordinais = [d.toordinal() if d else 0 for d in por_codigo]
+            self.datas = array("i", (ordinais[c] for c in self.codigos_datas))
+        else:
+            # Datas já interpretadas (snapshot salvo em disco)
+            self.datas = array("i", datas)
+        self.datas_invalidas = [
+            DataInvalida(posicao + 2, self.textos_datas[codigo])
+            for posicao, (codigo, ordinal) in enumerate(zip(self.codigos_datas, self.datas))
+            if not ordinal and self.textos_datas[codigo].strip()
+        ]
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def registro(self, posicao: int) -> "Orcamento":
+        return Orcamento(self, posicao)
+
+    def texto_status(self, posicao: int) -> str:
+        return self.textos_status[self.status[posicao]]
+
+    def linha(self, posicao: int) -> list[str]:
+        """Remonta a linha no formato lido da planilha (colunas A a H)."""
+        linha = [""] * LARGURA_LINHA
+        linha[COLUNA_DATA] = self.textos_datas[self.codigos_datas[posicao]]
+        linha[COLUNA_CLIENTE] = self.textos_clientes[self.clientes[posicao]]
+        linha[COLUNA_ID] = self.ids[posicao]
+        linha[COLUNA_QTD_DOCS] = self.textos_qtd[self.qtd_documentos[posicao]]
+        linha[COLUNA_STATUS] = self.texto_status(posicao)
+        return linha
+
+    def alterar_status(self, posicao: int, status: str):
+        codigo = self.textos_status.codigo(status)
+        if codigo == len(self.status_normalizados):  # Status que ainda não aparecia na aba
+            self.status_normalizados.append(normalizar_status(status))
+        self.status[posicao] = codigo
+
+    def memoria(self) -> int:
+        """Bytes ocupados pelas colunas e textos (aproximado, via `sys.getsizeof`)."""
+        colunas = (self.codigos_datas, self.clientes, self.qtd_documentos, self.status, self.datas)
+        textos = (self.textos_datas, self.textos_clientes, self.textos_qtd, self.textos_status)
+        return (
+            sum(map(sys.getsizeof, colunas))
+            + sum(t.memoria() for t in textos)
+            + self.ids.memoria()
+            + sys.getsizeof(self.status_normalizados)
+        )
+
+
+# --- Registro de um Orçamento ---
+class Orcamento:
+    """Uma linha da planilha, lida sob demanda das colunas da `TabelaColunar` (sem copiar os dados)."""
+
+    __slots__ = ("tabela", "posicao")
+
+    def __init__(self, tabela: TabelaColunar, posicao: int):
+        self.tabela = tabela
+        self.posicao = posicao
+
+    @property
+    def linha(self) -> int:
+        """Número da linha na planilha (1 = cabeçalho)."""
+        return self.posicao + 2
+
+    @property
+    def data_entrega_str(self) -> str:
+        return self.tabela.textos_datas[self.tabela.codigos_datas[self.posicao]]
+
+    @property
+    def data_entrega(self) -> date | None:
+        ordinal = self.tabela.datas[self.posicao]
+        return date.fromordinal(ordinal) if ordinal else None
+
+    @property
+    def ordinal_entrega(self) -> int:
+        """Data de entrega como ordinal (0 = sem data): mais barato de comparar que um `date`."""
+        return self.tabela.datas[self.posicao]
+
+    @property
+    def cliente(self) -> str:
+        return self.tabela.textos_clientes[self.tabela.clientes[self.posicao]]
+
+    @property
+    def id(self) -> str:
+        return self.tabela.ids[self.posicao]
+
+    @property
+    def qtd_documentos(self) -> str:
+        return self.tabela.textos_qtd[self.tabela.qtd_documentos[self.posicao]]
+
+    @property
+    def status(self) -> str:
+        return self.tabela.texto_status(self.posicao)
+
+    @property
+    def status_normalizado(self) -> str:
+        return self.tabela.status_normalizados[self.tabela.status[self.posicao]]
+
+    def __eq__(self, outro) -> bool:
+        return isinstance(outro, Orcamento) and outro.tabela is self.tabela and outro.posicao == self.posicao
+
+    def __hash__(self) -> int:
+        return hash((id(self.tabela), self.posicao))
+
+    def __repr__(self) -> str:
+        return f"Orcamento(linha={self.linha}, id={self.id!r}, cliente={self.cliente!r}, status={self.status!r})"
+
+
+class ListaDeRegistros(Sequence):
+    """Sequência de orçamentos guardada só como as posições deles na tabela."""
+
+    __slots__ = ("tabela", "posicoes")
+
+    def __init__(self, tabela: TabelaColunar, posicoes: Sequence[int]):
+        self.tabela = tabela
+        self.posicoes = posicoes
+
+    def __len__(self) -> int:
+        return len(self.posicoes)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return ListaDeRegistros(self.tabela, self.posicoes[indice])
+        return Orcamento(self.tabela, self.posicoes[indice])
+
+    def __iter__(self) -> Iterator[Orcamento]:
+        tabela = self.tabela
+        return (Orcamento(tabela, posicao) for posicao in self.posicoes)
@@ -0,0 +1,156 @@
+import heapq
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from typing import Callable, Iterable, Iterator
+
+from .busca import normalizar_texto
+from .colunar import Orcamento, normalizar_status
+from .indice import IndiceDePlanilha
+
+# --- Ordens possíveis do resultado ---
+ORDEM_PLANILHA = "planilha"  # Número da linha
+ORDEM_DATA = "data"          # Data de entrega (sem data por último)
+ORDEM_STATUS = "status"      # Na ordem dos status pedidos, e pela linha dentro de cada status
+
+# Fontes de linhas que o planejador pode escolher
+FONTE_STATUS = "status"
+FONTE_DATA = "data"
+FONTE_CLIENTE = "cliente"
+FONTE_VARREDURA = "varredura"
+
+_DESCRICOES = {
+    FONTE_STATUS: "índice de status",
+    FONTE_DATA: "índice de datas",
+    FONTE_CLIENTE: "índice de clientes",
+    FONTE_VARREDURA: "todas as linhas",
+}
+
+
+# --- Consulta Declarativa ---
+@dataclass(frozen=True)
+class Consulta:
+    """Filtros sobre as colunas B (entrega), C (cliente), D (orçamento) e H (status).
+
+    Todos os filtros informados precisam ser atendidos. Por ser imutável e
+    comparável, a própria consulta serve de chave para agrupar consultas iguais.
+    """
+    status: tuple[str, ...] = ()          # Algum destes status (vazio = qualquer um)
+    excluir_status: tuple[str, ...] = ()  # Nenhum destes status
+    entrega_de: date | None = None        # Entrega a partir desta data (inclusive)
+    entrega_ate: date | None = None       # Entrega até esta data (inclusive)
+    cliente_contem: str = ""              # Trecho do nome do cliente (sem diferenciar acentos)
+    somente_completos: bool = False       # Apenas linhas com número do orçamento e cliente
+    ordem: str = ORDEM_PLANILHA
+
+    @cached_property
+    def compilada(self) -> "ConsultaCompilada":
+        return ConsultaCompilada(self)
+
+
+class ConsultaCompilada:
+    """Os filtros de uma consulta já normalizados e transformados em predicados (feito uma única vez)."""
+
+    def __init__(self, consulta: Consulta):
+        self.consulta = consulta
+        self.status = list(dict.fromkeys(normalizar_status(s) for s in consulta.status if s.strip()))
+        self.posicao_status = {s: i for i, s in enumerate(self.status)}
+        self.cliente = normalizar_texto(consulta.cliente_contem)
+        self.filtra_data = consulta.entrega_de is not None or consulta.entrega_ate is not None
+
+        # Predicados de cada filtro; o da fonte escolhida pelo plano não precisa ser aplicado de novo
+        self.predicados: dict[str, Callable[[Orcamento], bool]] = {}
+        if self.status:
+            status = set(self.status)
+            self.predicados[FONTE_STATUS] = lambda r: r.status_normalizado in status
+        if self.filtra_data:
+            # Compara ordinais; sem data (0) nunca está na faixa
+            inicio = (consulta.entrega_de or date.min).toordinal()
+            fim = (consulta.entrega_ate or date.max).toordinal()
+            self.predicados[FONTE_DATA] = lambda r: inicio <= r.ordinal_entrega <= fim
+        if self.cliente:
+            cliente = self.cliente
+            self.predicados[FONTE_CLIENTE] = lambda r: cliente in normalizar_texto(r.cliente)
+        excluidos = {normalizar_status(s) for s in consulta.excluir_status}
+        if excluidos:
+            self.predicados["excluir"] = lambda r: r.status_normalizado not in excluidos
+        if consulta.somente_completos:
+            self.predicados["completos"] = lambda r: bool(r.id and r.cliente)
+
+    def chave_de_ordem(self) -> Callable[[Orcamento], tuple]:
+        ordem = self.consulta.ordem
+        if ordem == ORDEM_DATA:
+            sem_data = date.max.toordinal()
+            return lambda r: (r.ordinal_entrega or sem_data, r.linha)
+        if ordem == ORDEM_STATUS and self.posicao_status:
+            posicao = self.posicao_status
+            return lambda r: (posicao.get(r.status_normalizado, len(posicao)), r.linha)
+        if ordem == ORDEM_STATUS:
+            return lambda r: (r.status_normalizado, r.linha)
+        return lambda r: (r.linha,)
+
+
+# --- Planejamento ---
+@dataclass
+class Plano:
+    """Como uma consulta vai ser executada: de qual índice as linhas saem e o que ainda é filtrado."""
+    fonte: str
+    estimativa: int                           # Quantas linhas a fonte vai entregar
+    linhas: Callable[[], Iterable[Orcamento]]  # Gera as linhas da fonte (só quando o plano é executado)
+    predicados: list[Callable[[Orcamento], bool]]
+    ordenar: Callable[[Orcamento], tuple] | None  # None: a fonte já entrega na ordem pedida
+
+    def executar(self) -> Iterator[Orcamento]:
+        """Gera os resultados sob demanda. Só é preciso ler tudo antes quando a fonte não está na ordem pedida."""
+        resultado: Iterable[Orcamento] = self.linhas()
+        for predicado in self.predicados:
+            resultado = filter(predicado, resultado)
+        if self.ordenar is not None:
+            resultado = sorted(resultado, key=self.ordenar)
+        return iter(resultado)
+
+    def descrever(self) -> str:
+        texto = f"{_DESCRICOES[self.fonte]} ({self.estimativa} linha(s) lidas)"
+        return texto + (", reordenado" if self.ordenar is not None else "")
+
+
+def planejar(consulta: Consulta, indice: IndiceDePlanilha) -> Plano:
+    """Escolhe o índice que entrega menos linhas (penalizando as fontes que precisam ser reordenadas)."""
+    compilada = consulta.compilada
+    ordem = consulta.ordem
+    tabela = indice.tabela
+    candidatos = []  # (fonte, estimativa, gerador, ordem em que a fonte entrega)
+
+    if compilada.status:
+        listas = [indice.por_status[s] for s in compilada.status if s in indice.por_status]
+        if ordem == ORDEM_STATUS:
+            gerar = lambda: (r for lista in listas for r in lista)  # noqa: E731
+        else:
+            # As listas guardam posições em ordem de linha: junta as posições e só então cria os registros
+            gerar = lambda: map(tabela.registro, heapq.merge(*(lista.posicoes for lista in listas)))  # noqa: E731
+        candidatos.append((FONTE_STATUS, sum(map(len, listas)), gerar, ORDEM_STATUS if ordem == ORDEM_STATUS else ORDEM_PLANILHA))
+
+    if compilada.filtra_data:
+        esquerda, direita = indice.faixa_de_datas(consulta.entrega_de, consulta.entrega_ate)
+        gerar = lambda: indice.entre_datas(consulta.entrega_de, consulta.entrega_ate)  # noqa: E731
+        candidatos.append((FONTE_DATA, max(0, direita - esquerda), gerar, ORDEM_DATA))  # Faixa invertida: vazia
+
+    if compilada.cliente:
+        grupos = indice.clientes.contendo(compilada.cliente)
+        gerar = lambda: map(tabela.registro, heapq.merge(*(grupo.posicoes for grupo in grupos)))  # noqa: E731
+        candidatos.append((FONTE_CLIENTE, sum(map(len, grupos)), gerar, ORDEM_PLANILHA))
+
+    candidatos.append((FONTE_VARREDURA, len(indice.registros), lambda: indice.registros, ORDEM_PLANILHA))
+
+    def custo(candidato):
+        _, estimativa, _, ordem_da_fonte = candidato
+        return estimativa * (1 if ordem_da_fonte == ordem else 2)
+
+    fonte, estimativa, gerar, ordem_da_fonte = min(candidatos, key=custo)
+    predicados = [p for nome, p in compilada.predicados.items() if nome != fonte]
+    ordenar = None if ordem_da_fonte == ordem else compilada.chave_de_ordem()
+    return Plano(fonte, estimativa, gerar, predicados, ordenar)
+
+
+def executar(consulta: Consulta, indice: IndiceDePlanilha) -> Iterator[Orcamento]:
+    return planejar(consulta, indice).executar()
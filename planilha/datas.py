@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class DataInvalida:
+    """Uma célula de data que não pôde ser interpretada."""
+    linha: int   # Número da linha na planilha
+    texto: str
+
+
+@lru_cache(maxsize=4096)
+def _partes(texto: str) -> tuple[int, int, int | None] | None:
+    """Separa 'dd/mm' ou 'dd/mm/aa(aa)' em números. Não valida o calendário."""
+    pedacos = texto.split("/")
+    if len(pedacos) not in (2, 3):
+        return None
+    if not all(p.isdigit() and p.isascii() for p in pedacos):
+        return None
+    dia, mes = pedacos[0], pedacos[1]
+    if len(dia) > 2 or len(mes) > 2:
+        return None
+    ano = None
+    if len(pedacos) == 3:
+        if len(pedacos[2]) == 2:
+            ano = 2000 + int(pedacos[2])
+        elif len(pedacos[2]) == 4:
+            ano = int(pedacos[2])
+        else:
+            return None
+    return int(dia), int(mes), ano
+
+
+def inferir_ano(mes: int, referencia: date) -> int:
+    """Escolhe o ano que deixa a data mais perto da referência.
+
+    Assim '20/12' lido em janeiro é dezembro do ano anterior, e '05/01' lido
+    em dezembro é janeiro do ano seguinte.
+    """
+    if mes - referencia.month > 6:
+        return referencia.year - 1
+    if referencia.month - mes > 6:
+        return referencia.year + 1
+    return referencia.year
+
+
+def parse_data_br(texto: str, referencia: date | None = None) -> date | None:
+    """Converte 'dd/mm' ou 'dd/mm/YYYY' em date. Devolve None se não for uma data válida."""
+    partes = _partes(texto.strip())
+    if partes is None:
+        return None
+    dia, mes, ano = partes
+    if not 1 <= mes <= 12 or dia < 1:
+        return None
+    if ano is None:
+        ano = inferir_ano(mes, referencia or date.today())
+    try:
+        return date(ano, mes, dia)
+    except ValueError:  # Dia que não existe no mês, como 31/02
+        return None
+
+
+def formatar_data_br(data_str: str, referencia: date | None = None) -> str:
+    """Formata uma data da planilha como dd/mm/YYYY, ou devolve o texto original se não for uma data."""
+    if not data_str:
+        return "N/A"
+    data = parse_data_br(data_str, referencia)
+    return data.strftime('%d/%m/%Y') if data else data_str
+
+
+def normalizar_datas(textos: list[str], referencia: date | None = None, primeira_linha: int = 2) -> tuple[list[date | None], list[DataInvalida]]:
+    """Interpreta uma coluna inteira de datas de uma só vez.
+
+    Devolve uma data (ou None, para células vazias ou inválidas) por texto, e a
+    lista das células preenchidas que não são datas, para que possam ser corrigidas.
+    """
+    referencia = referencia or date.today()
+    datas = []
+    invalidas = []
+    for numero, texto in enumerate(textos, start=primeira_linha):
+        data = parse_data_br(texto, referencia) if texto.strip() else None
+        if data is None and texto.strip():
+            invalidas.append(DataInvalida(numero, texto))
+        datas.append(data)
+    return datas, invalidas
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any, Callable
+
+from .acesso import AcessoPlanilha
+from .colunar import COLUNA_ID, COLUNA_STATUS
+
+LETRA_STATUS = chr(ord("A") + COLUNA_STATUS)  # Coluna H
+LETRA_ID = chr(ord("A") + COLUNA_ID)          # Coluna D
+
+
+# --- Fila de Escrita ---
+class FilaDeEscrita:
+    """Acumula as mudanças de status feitas pelo bot e grava todas juntas na coluna H.
+
+    A cada `intervalo` segundos, tudo o que estiver na fila vira um único
+    `batch_update`. Várias mudanças no mesmo orçamento dentro do intervalo
+    são agrupadas: só a última é gravada. A linha de cada orçamento é
+    procurada (`localizar`) apenas na hora de gravar, no snapshot mais recente,
+    e conferida na planilha antes da gravação (ver `_conferir_linhas`).
+    """
+
+    def __init__(self, acesso: AcessoPlanilha, obter_worksheet: Callable[[], Any],
+                 localizar: Callable[[str], int | None], intervalo: float = 5):
+        self.acesso = acesso
+        self.obter_worksheet = obter_worksheet
+        self.localizar = localizar
+        self.intervalo = intervalo
+        self.pendentes: dict[str, str] = {}  # id do orçamento -> novo status
+        self.gravando: dict[str, str] = {}   # Mudanças do batch_update em andamento
+        self._tarefa: asyncio.Task | None = None
+
+    def enfileirar(self, id_orcamento: str, status: str):
+        self.pendentes[id_orcamento.strip()] = status
+
+    def nao_gravadas(self) -> dict[str, str]:
+        """Mudanças que ainda não estão na planilha (em andamento e na fila), da mais antiga para a mais nova."""
+        return {**self.gravando, **self.pendentes}
+
+    def iniciar(self):
+        self._tarefa = asyncio.create_task(self._gravar_periodicamente())
+
+    def parar(self):
+        if self._tarefa:
+            self._tarefa.cancel()
+
+    async def _gravar_periodicamente(self):
+        while True:
+            await asyncio.sleep(self.intervalo)
+            try:
+                await self.descarregar()
+            except Exception as e:
+                print(f"Erro ao gravar mudanças de status na planilha (nova tentativa em {self.intervalo}s): {e}")
+
+    async def descarregar(self) -> int:
+        """Grava o que estiver na fila com um único `batch_update`. Devolve quantas células foram gravadas."""
+        worksheet = self.obter_worksheet()
+        if not self.pendentes or worksheet is None:
+            return 0
+        pendentes, self.pendentes = self.pendentes, {}
+
+        linhas = {}
+        for id_orcamento in pendentes:
+            linha = self.localizar(id_orcamento)
+            if linha is None:
+                print(f"Mudança de status descartada: o orçamento {id_orcamento} não está mais na planilha.")
+                continue
+            linhas[id_orcamento] = linha
+        if not linhas:
+            return 0
+
+        self.gravando = pendentes
+        try:
+            linhas = await self._conferir_linhas(worksheet, linhas)
+            atualizacoes = [
+                {"range": f"{LETRA_STATUS}{linha}", "values": [[pendentes[id_orcamento]]]}
+                for id_orcamento, linha in linhas.items()
+            ]
+            if atualizacoes:
+                # RAW: o texto é gravado como está, sem virar fórmula
+                await self.acesso.executar(worksheet.batch_update, atualizacoes, value_input_option="RAW")
+        except Exception:
+            # Volta para a fila, sem sobrescrever mudanças feitas enquanto a gravação estava em andamento
+            for id_orcamento, status in pendentes.items():
+                self.pendentes.setdefault(id_orcamento, status)
+            raise
+        finally:
+            self.gravando = {}
+        return len(atualizacoes)
+
+    async def _conferir_linhas(self, worksheet, linhas: dict[str, int]) -> dict[str, int]:
+        """Relê a coluna D das linhas que vão ser gravadas e devolve só as confirmadas.
+
+        O snapshot pode estar desatualizado (ex: uma linha inserida acima do orçamento
+        depois da última sincronização), e gravar às cegas mudaria o status de outro
+        orçamento. Quem mudou de linha é procurado na coluna D inteira, lida na hora;
+        quem não está mais na planilha é descartado.
+        """
+        ids = list(linhas)
+        valores = await self.acesso.executar(worksheet.batch_get, [f"{LETRA_ID}{linhas[i]}" for i in ids])
+        conferidas = {}
+        deslocados = []
+        for id_orcamento, valor in zip(ids, valores):
+            lido = valor[0][0].strip() if valor and valor[0] else ""
+            if lido == id_orcamento:
+                conferidas[id_orcamento] = linhas[id_orcamento]
+            else:
+                deslocados.append(id_orcamento)
+        if not deslocados:
+            return conferidas
+
+        (coluna_d,) = await self.acesso.executar(worksheet.batch_get, [f"{LETRA_ID}:{LETRA_ID}"])
+        posicoes: dict[str, int] = {}
+        for numero, valor in enumerate(coluna_d[1:], start=2):  # Pula o cabeçalho
+            if valor:
+                posicoes.setdefault(valor[0].strip(), numero)
+        for id_orcamento in deslocados:
+            numero = posicoes.get(id_orcamento)
+            if numero is None:
+                print(f"Mudança de status descartada: o orçamento {id_orcamento} não está mais na planilha.")
+                continue
+            print(f"Orçamento {id_orcamento} passou da linha {linhas[id_orcamento]} para a {numero}: gravando na linha atual.")
+            conferidas[id_orcamento] = numero
+        return conferidas
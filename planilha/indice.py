@@ -0,0 +1,142 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from functools import cached_property
+from itertools import groupby
+
+from .busca import IndiceDeClientes
+from .colunar import ListaDeRegistros, Orcamento, TabelaColunar, normalizar_status
+
+
+# --- Índice das Linhas ---
+class IndiceDePlanilha:
+    """Cria índices sobre as colunas de uma `TabelaColunar`, uma única vez por snapshot.
+
+    - `por_status`: busca O(1) pelo status normalizado (coluna H).
+    - IDs ordenados: busca O(log n) pelo número do orçamento (coluna D).
+    - datas ordenadas: consultas por intervalo de entrega (coluna B) em O(log n).
+
+    Os índices guardam só posições (em `array`), e não um objeto por linha.
+    As datas que não puderam ser interpretadas ficam em `datas_invalidas`.
+    """
+
+    def __init__(self, tabela: TabelaColunar):
+        self.tabela = tabela
+        self.registros = ListaDeRegistros(tabela, range(len(tabela)))
+        self.datas_invalidas = tabela.datas_invalidas
+
+        por_codigo: dict[int, array] = {}
+        for posicao, codigo in enumerate(tabela.status):
+            lista = por_codigo.get(codigo)
+            if lista is None:
+                lista = por_codigo[codigo] = array("i")
+            lista.append(posicao)
+        self.por_status: dict[str, ListaDeRegistros] = {}
+        for codigo, posicoes in por_codigo.items():
+            chave = tabela.status_normalizados[codigo]
+            existente = self.por_status.get(chave)
+            if existente is not None:  # Grafias diferentes do mesmo status
+                posicoes = array("i", sorted(existente.posicoes + posicoes))
+            self.por_status[chave] = ListaDeRegistros(tabela, posicoes)
+
+        # Posições ordenadas pelo número do orçamento; em caso de IDs repetidos, a primeira ocorrência vem antes
+        ids = tabela.ids
+        self._por_id = array("i", sorted((p for p in range(len(tabela)) if ids[p]), key=ids.__getitem__))
+
+        datas = tabela.datas
+        self._por_data = array("i", sorted((p for p in range(len(tabela)) if datas[p]), key=datas.__getitem__))
+        self._datas = array("i", (datas[p] for p in self._por_data))  # Ordinais, em ordem
+
+    @cached_property
+    def clientes(self) -> IndiceDeClientes:
+        """Índice de busca por nome de cliente, construído no primeiro uso."""
+        return IndiceDeClientes(self.tabela)
+
+    def ids_com_prefixo(self, prefixo: str, limite: int = 25) -> list[str]:
+        """Números de orçamento que começam com `prefixo`, em ordem (para o autocomplete)."""
+        prefixo = prefixo.strip()
+        ids = self.tabela.ids
+        inicio = bisect_left(self._por_id, prefixo, key=ids.__getitem__)
+        resultado = []
+        for posicao in self._por_id[inicio:]:
+            id_orcamento = ids[posicao]
+            if not id_orcamento.startswith(prefixo) or len(resultado) >= limite:
+                break
+            if not resultado or resultado[-1] != id_orcamento:
+                resultado.append(id_orcamento)
+        return resultado
+
+    @cached_property
+    def status_disponiveis(self) -> list[tuple[str, int]]:
+        """(status como aparece na planilha, quantidade), derivado dos dados e em ordem."""
+        return sorted(
+            (registros[0].status.strip(), len(registros))
+            for chave, registros in self.por_status.items() if chave
+        )
+
+    @cached_property
+    def datas_disponiveis(self) -> list[tuple[date, int]]:
+        """(data de entrega, quantidade de orçamentos), em ordem de data."""
+        return [(date.fromordinal(ordinal), len(list(grupo))) for ordinal, grupo in groupby(self._datas)]
+
+    def preparar_autocomplete(self):
+        """Constrói antecipadamente as estruturas usadas pelo autocomplete."""
+        self.status_disponiveis, self.datas_disponiveis, self.clientes
+
+    def alterar_status(self, id_orcamento: str, status: str) -> Orcamento | None:
+        """Aplica uma mudança de status feita pelo bot, mantendo `por_status` em ordem de linha.
+
+        As listas de `por_status` são substituídas (e não alteradas), para não mudar
+        resultados que um comando já esteja exibindo.
+        """
+        registro = self.buscar_id(id_orcamento)
+        if registro is None:
+            return None
+        posicao = registro.posicao
+        anterior = registro.status_normalizado
+        restantes = array("i", (p for p in self.por_status[anterior].posicoes if p != posicao))
+        if restantes:
+            self.por_status[anterior] = ListaDeRegistros(self.tabela, restantes)
+        else:
+            self.por_status.pop(anterior)
+
+        self.tabela.alterar_status(posicao, status)
+        atual = self.por_status.get(registro.status_normalizado)
+        novas = array("i", atual.posicoes) if atual is not None else array("i")
+        insort(novas, posicao)
+        self.por_status[registro.status_normalizado] = ListaDeRegistros(self.tabela, novas)
+        self.__dict__.pop("status_disponiveis", None)  # Recalculado no próximo uso
+        return registro
+
+    def buscar_id(self, id_orcamento: str) -> Orcamento | None:
+        id_orcamento = id_orcamento.strip()
+        ids = self.tabela.ids
+        i = bisect_left(self._por_id, id_orcamento, key=ids.__getitem__)
+        if i < len(self._por_id) and ids[self._por_id[i]] == id_orcamento:
+            return self.tabela.registro(self._por_id[i])
+        return None
+
+    def com_status(self, status: str) -> ListaDeRegistros:
+        return self.por_status.get(normalizar_status(status), ListaDeRegistros(self.tabela, ()))
+
+    def faixa_de_datas(self, inicio: date | None = None, fim: date | None = None, incluir_fim: bool = True) -> tuple[int, int]:
+        """Posições (início, fim) no índice de datas; `fim - início` é quantos orçamentos há na faixa."""
+        esquerda = bisect_left(self._datas, inicio.toordinal()) if inicio else 0
+        if fim is None:
+            direita = len(self._datas)
+        elif incluir_fim:
+            direita = bisect_right(self._datas, fim.toordinal())
+        else:
+            direita = bisect_left(self._datas, fim.toordinal())
+        return esquerda, direita
+
+    def entre_datas(self, inicio: date | None = None, fim: date | None = None, incluir_fim: bool = True) -> ListaDeRegistros:
+        """Orçamentos com entrega entre `inicio` e `fim` (ambos opcionais), em ordem de data."""
+        esquerda, direita = self.faixa_de_datas(inicio, fim, incluir_fim)
+        return ListaDeRegistros(self.tabela, self._por_data[esquerda:direita])
+
+    def memoria(self) -> int:
+        """Bytes ocupados pelos índices de posições (aproximado)."""
+        listas = [lista.posicoes for lista in self.por_status.values()]
+        return sum(map(sys.getsizeof, [self._por_id, self._por_data, self._datas, *listas]))
@@ -0,0 +1,111 @@
+from collections import Counter
+from datetime import date, timedelta
+
+from .colunar import Orcamento, TabelaColunar
+from .resumo import FINALIZADOS_NORMALIZADOS
+
+# Limites (em dias) das faixas de atraso: 1 dia, 2 a 3, 4 a 7, 8 a 14, 15 a 30 e mais de 30
+FAIXAS_DE_ATRASO = (1, 3, 7, 14, 30)
+
+
+def quantidade_de_documentos(texto: str) -> int:
+    """Lê a coluna E ('Qtd. Documentos'); vazio ou texto que não é número conta como 0."""
+    texto = texto.strip()
+    return int(texto) if texto.isdigit() else 0
+
+
+# --- Painel de Carga ---
+class PainelDeCarga:
+    """Contadores de carga de trabalho de um snapshot, prontos para o /painel.
+
+    - `por_status`: orçamentos e documentos em cada status.
+    - `pendentes_por_data`: orçamentos e documentos não finalizados em cada data de
+      entrega, de onde saem os atrasos por faixa e as entregas de cada dia.
+
+    Montados uma vez por snapshot (uma única contagem sobre as colunas da tabela)
+    e ajustados a cada mudança de status feita pelo bot, sem varrer a aba de novo.
+
+    Um snapshot novo recebe contadores novos, e não os do anterior ajustados pelos
+    eventos de `comparar()`: os eventos não trazem mudanças de data (coluna B) ou de
+    quantidade (coluna E) de um orçamento que continua na aba, e os leitores recebem
+    o snapshot pronto do armazém, sem eventos. A contagem é feita em uma thread
+    (`CacheDePlanilha.preparar`) e só quando a aba muda.
+    """
+
+    def __init__(self, tabela: TabelaColunar):
+        self.tabela = tabela
+        self._documentos = [quantidade_de_documentos(t) for t in tabela.textos_qtd.textos]  # Por código da coluna E
+        self.por_status: dict[str, list[int]] = {}           # Status normalizado -> [orçamentos, documentos]
+        self.nomes_status: dict[str, str] = {}               # Status normalizado -> como aparece na planilha
+        self.pendentes_por_data: dict[int, list[int]] = {}   # Ordinal da entrega -> [orçamentos, documentos]
+        # Linhas iguais nas três colunas são somadas de uma vez
+        combinacoes = Counter(zip(tabela.status, tabela.datas, tabela.qtd_documentos))
+        for (codigo_status, ordinal, codigo_qtd), quantidade in combinacoes.items():
+            self._somar(codigo_status, ordinal, codigo_qtd, quantidade)
+
+    def _somar(self, codigo_status: int, ordinal: int, codigo_qtd: int, quantidade: int):
+        chave = self.tabela.status_normalizados[codigo_status]
+        documentos = self._documentos[codigo_qtd] * quantidade
+        self.nomes_status.setdefault(chave, self.tabela.textos_status[codigo_status].strip())
+        _acumular(self.por_status, chave, quantidade, documentos)
+        if ordinal and chave not in FINALIZADOS_NORMALIZADOS:
+            _acumular(self.pendentes_por_data, ordinal, quantidade, documentos)
+
+    def _somar_registro(self, registro: Orcamento, quantidade: int):
+        tabela, posicao = registro.tabela, registro.posicao
+        self._somar(tabela.status[posicao], tabela.datas[posicao], tabela.qtd_documentos[posicao], quantidade)
+
+    def adicionar(self, registro: Orcamento):
+        self._somar_registro(registro, 1)
+
+    def remover(self, registro: Orcamento):
+        self._somar_registro(registro, -1)
+
+    def status(self) -> list[tuple[str, int, int]]:
+        """(status, orçamentos, documentos), em ordem de status. Linhas sem status ficam de fora."""
+        return sorted((self.nomes_status[chave], orcamentos, documentos)
+                      for chave, (orcamentos, documentos) in self.por_status.items() if chave)
+
+    def atrasados_por_faixa(self, hoje: date) -> list[tuple[str, int, int]]:
+        """(faixa de dias de atraso, orçamentos, documentos) dos pendentes com entrega antes de hoje."""
+        limites = [*FAIXAS_DE_ATRASO, None]
+        faixas = [[0, 0] for _ in limites]
+        referencia = hoje.toordinal()
+        for ordinal, (orcamentos, documentos) in self.pendentes_por_data.items():
+            dias = referencia - ordinal
+            if dias <= 0:
+                continue
+            i = next(i for i, limite in enumerate(limites) if limite is None or dias <= limite)
+            faixas[i][0] += orcamentos
+            faixas[i][1] += documentos
+        resultado = []
+        inicio = 1
+        for limite, (orcamentos, documentos) in zip(limites, faixas):
+            if limite is None:
+                rotulo = f"mais de {inicio - 1} dias"
+            elif limite == inicio:
+                rotulo = f"{limite} dia" if limite == 1 else f"{limite} dias"
+            else:
+                rotulo = f"{inicio} a {limite} dias"
+            resultado.append((rotulo, orcamentos, documentos))
+            inicio = (limite or 0) + 1
+        return resultado
+
+    def entregas_por_dia(self, hoje: date, dias: int = 14) -> list[tuple[date, int, int]]:
+        """(data, orçamentos, documentos) pendentes para cada um dos próximos `dias`, a partir de hoje."""
+        resultado = []
+        for i in range(dias):
+            data = hoje + timedelta(days=i)
+            orcamentos, documentos = self.pendentes_por_data.get(data.toordinal(), (0, 0))
+            resultado.append((data, orcamentos, documentos))
+        return resultado
+
+
+def _acumular(contadores: dict, chave, orcamentos: int, documentos: int):
+    contagem = contadores.get(chave)
+    if contagem is None:
+        contagem = contadores[chave] = [0, 0]
+    contagem[0] += orcamentos
+    contagem[1] += documentos
+    if contagem[0] == 0:
+        del contadores[chave]
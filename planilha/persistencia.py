@@ -0,0 +1,181 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from .cache import Snapshot
+from .colunar import TabelaColunar
+
+
+@dataclass(frozen=True)
+class Publicacao:
+    """O que está salvo no armazém, sem as linhas."""
+    versao: int          # Muda a cada snapshot salvo e a cada mudança de status encaminhada
+    aba: str
+    salvo_em: float      # Quando as linhas foram gravadas (time.time())
+    conferido_em: float  # Última sincronização com a planilha, mesmo que nada tenha mudado
+    # Mudanças de status encaminhadas pelos leitores e ainda não aplicadas pelo sincronizador (só em `carregar`)
+    escritas: tuple[tuple[str, str], ...] = ()
+
+
+# --- Snapshot em Disco ---
+class ArmazemDeSnapshots:
+    """Guarda o último snapshot (e as datas já interpretadas) em SQLite.
+
+    Permite que o bot responda logo após reiniciar, com os dados da última
+    sincronização, enquanto a primeira sincronização nova roda em segundo plano.
+
+    Com o bot dividido em vários processos (shards), é também o armazém
+    compartilhado entre eles: só o processo sincronizador acessa o Google e
+    publica cada snapshot aqui; os leitores carregam daqui e encaminham por
+    aqui as mudanças de status. O banco usa WAL, então os leitores não
+    bloqueiam o sincronizador e sempre veem um snapshot inteiro.
+
+    Os métodos são bloqueantes e abrem a própria conexão, então podem rodar
+    em uma thread (`asyncio.to_thread`).
+    """
+
+    def __init__(self, caminho: str):
+        if caminho == ":memory:" or not caminho:
+            # Cada método abre a própria conexão: um banco em memória sumiria a cada chamada
+            raise ValueError("SNAPSHOT_DB precisa ser um arquivo; ':memory:' não é suportado.")
+        self.caminho = caminho
+        conexao = self._conectar()
+        try:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            with conexao:
+                conexao.execute("CREATE TABLE IF NOT EXISTS metadados (chave TEXT PRIMARY KEY, valor TEXT)")
+                conexao.execute(
+                    """CREATE TABLE IF NOT EXISTS linhas (
+                        numero INTEGER PRIMARY KEY,
+                        valores TEXT NOT NULL,
+                        data_ordinal INTEGER
+                    )"""
+                )
+                conexao.execute(
+                    """CREATE TABLE IF NOT EXISTS escritas (
+                        numero INTEGER PRIMARY KEY AUTOINCREMENT,
+                        id_orcamento TEXT NOT NULL,
+                        status TEXT NOT NULL
+                    )"""
+                )
+        finally:
+            conexao.close()
+
+    def _conectar(self) -> sqlite3.Connection:
+        # Espera (em vez de falhar) enquanto outro processo grava
+        return sqlite3.connect(self.caminho, timeout=10)
+
+    @staticmethod
+    def _nova_versao(conexao: sqlite3.Connection):
+        conexao.execute(
+            "INSERT INTO metadados VALUES ('versao', 1) ON CONFLICT(chave) DO UPDATE SET valor = valor + 1"
+        )
+
+    def salvar(self, snapshot: Snapshot, aba: str | None, escritas_aplicadas: int = 0, conferido: bool = True):
+        """Substitui o snapshot salvo. As 8 colunas (A a H) vão juntas, separadas por \\x1f.
+
+        `escritas_aplicadas`: número da última mudança encaminhada que já está no
+        snapshot; ela e as anteriores saem da fila na mesma transação. Com
+        `conferido=False` (só mudanças feitas pelo bot), a hora da última
+        sincronização com a planilha não muda.
+        """
+        tabela = snapshot.tabela
+        cabecalho = [(1, "\x1f".join(tabela.cabecalho), None)]  # Cabeçalho não tem data
+        linhas = (
+            (posicao + 2, "\x1f".join(tabela.linha(posicao)), tabela.datas[posicao] or None)
+            for posicao in range(len(tabela))
+        )
+        agora = str(time.time())
+        conexao = self._conectar()
+        try:
+            with conexao:
+                conexao.execute("DELETE FROM linhas")
+                conexao.executemany("INSERT INTO linhas VALUES (?, ?, ?)", cabecalho)
+                conexao.executemany("INSERT INTO linhas VALUES (?, ?, ?)", linhas)
+                if escritas_aplicadas:
+                    conexao.execute("DELETE FROM escritas WHERE numero <= ?", (escritas_aplicadas,))
+                metadados = [("salvo_em", agora), ("aba", aba or "")] + ([("conferido_em", agora)] if conferido else [])
+                conexao.executemany("INSERT OR REPLACE INTO metadados VALUES (?, ?)", metadados)
+                self._nova_versao(conexao)
+        finally:
+            conexao.close()
+
+    def confirmar(self):
+        """Registra que o snapshot salvo foi conferido agora com a planilha (e não mudou)."""
+        conexao = self._conectar()
+        try:
+            with conexao:
+                conexao.execute("INSERT OR REPLACE INTO metadados VALUES ('conferido_em', ?)", (str(time.time()),))
+        finally:
+            conexao.close()
+
+    @staticmethod
+    def _ler_publicacao(conexao: sqlite3.Connection) -> Publicacao | None:
+        metadados = dict(conexao.execute("SELECT chave, valor FROM metadados").fetchall())
+        if "salvo_em" not in metadados:
+            return None
+        return Publicacao(
+            versao=int(metadados.get("versao", 0)),
+            aba=metadados.get("aba", ""),
+            salvo_em=float(metadados["salvo_em"]),
+            conferido_em=float(metadados.get("conferido_em", metadados["salvo_em"])),
+        )
+
+    def publicacao(self) -> Publicacao | None:
+        """Lê só os metadados (barato): usado pelos leitores para saber se há algo novo."""
+        conexao = self._conectar()
+        try:
+            return self._ler_publicacao(conexao)
+        finally:
+            conexao.close()
+
+    def carregar(self) -> tuple[Snapshot, Publicacao] | None:
+        """Devolve (snapshot marcado como vindo do disco, publicação) ou None se não houver nada salvo."""
+        conexao = self._conectar()
+        try:
+            # Uma única transação de leitura: linhas, metadados e fila vêm do mesmo momento
+            conexao.execute("BEGIN")
+            publicacao = self._ler_publicacao(conexao)
+            resultado = conexao.execute("SELECT valores, data_ordinal FROM linhas ORDER BY numero").fetchall()
+            escritas = conexao.execute("SELECT id_orcamento, status FROM escritas ORDER BY numero").fetchall()
+            conexao.rollback()
+        finally:
+            conexao.close()
+        if not resultado or publicacao is None:
+            return None
+
+        # As colunas são montadas com as datas já interpretadas, sem reprocessar a coluna B
+        tabela = TabelaColunar(
+            [valores.split("\x1f") for valores, _ in resultado],
+            datas=[ordinal or 0 for _, ordinal in resultado[1:]],
+        )
+        snapshot = Snapshot(
+            versao=0,
+            tabela=tabela,
+            carregado_em=time.monotonic() - max(0.0, time.time() - publicacao.salvo_em),
+            carregado_em_data=datetime.fromtimestamp(publicacao.salvo_em),
+            do_disco=True,
+        )
+        return snapshot, Publicacao(publicacao.versao, publicacao.aba, publicacao.salvo_em,
+                                    publicacao.conferido_em, tuple(escritas))
+
+    # --- Mudanças Encaminhadas ---
+    def encaminhar_escritas(self, mudancas: list[tuple[str, str]]):
+        """Leitor: deixa (id, status) na fila para o sincronizador gravar na planilha."""
+        conexao = self._conectar()
+        try:
+            with conexao:
+                conexao.executemany("INSERT INTO escritas (id_orcamento, status) VALUES (?, ?)", mudancas)
+                # Os outros leitores recarregam e já mostram a mudança
+                self._nova_versao(conexao)
+        finally:
+            conexao.close()
+
+    def escritas_encaminhadas(self) -> list[tuple[int, str, str]]:
+        """Sincronizador: (número, id, status) das mudanças encaminhadas, da mais antiga para a mais nova."""
+        conexao = self._conectar()
+        try:
+            return conexao.execute("SELECT numero, id_orcamento, status FROM escritas ORDER BY numero").fetchall()
+        finally:
+            conexao.close()
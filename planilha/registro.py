@@ -0,0 +1,169 @@
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import date
+
+from .acesso import AcessoPlanilha
+from .cache import CacheDePlanilha, Snapshot
+from .colunar import Orcamento
+from .sincronizacao import SincronizadorDePlanilha
+
+MESES = ["JAN", "FEV", "MAR", "ABR", "MAI", "JUN", "JUL", "AGO", "SET", "OUT", "NOV", "DEZ"]
+
+
+def identificar_mes(titulo: str) -> tuple[int, int] | None:
+    """Converte o nome de uma aba mensal ('OUT 25') em (ano, mês). Devolve None para outras abas."""
+    pedacos = titulo.strip().upper().split()
+    if len(pedacos) != 2 or pedacos[0] not in MESES or not pedacos[1].isdigit():
+        return None
+    ano = int(pedacos[1])
+    return (2000 + ano if ano < 100 else ano), MESES.index(pedacos[0]) + 1
+
+
+def titulo_do_mes(dia: date) -> str:
+    return f"{MESES[dia.month - 1]} {dia.year % 100:02d}"
+
+
+@dataclass
+class AbaAberta:
+    titulo: str
+    worksheet: object
+    cache: CacheDePlanilha
+
+
+# --- Registro das Abas Mensais ---
+class RegistroDeAbas:
+    """Conhece todas as abas mensais da planilha, mas só abre (e baixa) as que forem usadas.
+
+    As abas abertas ficam em um LRU de até `capacidade` entradas; a menos usada
+    é descartada junto com o seu snapshot quando o limite é atingido (menos as
+    que uma busca em andamento está usando).
+
+    Os IDs de cada aba baixada ficam guardados por `idade_maxima` segundos, mesmo
+    depois que a aba sai do LRU: uma busca repetida por um ID que não existe não
+    baixa nada.
+    """
+
+    def __init__(self, acesso: AcessoPlanilha, capacidade: int = 3, idade_maxima: float = 900, paralelas: int = 2):
+        self.acesso = acesso
+        self.capacidade = capacidade
+        self.idade_maxima = idade_maxima
+        self.paralelas = paralelas  # Abas abertas ao mesmo tempo por uma busca
+        self.spreadsheet = None
+        self.abas_mensais: list[str] = []  # Da mais recente para a mais antiga
+        self._abertas: OrderedDict[str, AbaAberta] = OrderedDict()
+        self._abrindo: dict[str, asyncio.Task] = {}
+        self._em_uso: Counter[str] = Counter()  # Abas que uma busca está usando: não saem do LRU
+        self._ids: dict[str, tuple[float, frozenset[str]]] = {}  # Aba -> (quando, IDs da aba)
+
+    def definir_planilha(self, spreadsheet, titulos: list[str]):
+        """Registra as abas encontradas. Não baixa nenhum dado."""
+        self.spreadsheet = spreadsheet
+        mensais = [(identificar_mes(t), t) for t in titulos]
+        self.abas_mensais = [t for mes, t in sorted((m for m in mensais if m[0]), reverse=True)]
+        self._abertas.clear()
+        self._ids.clear()
+
+    def aba_atual(self, hoje: date | None = None) -> str | None:
+        """A aba do mês corrente; se ainda não existir, a mais recente."""
+        titulo = titulo_do_mes(hoje or date.today())
+        if titulo in self.abas_mensais:
+            return titulo
+        return self.abas_mensais[0] if self.abas_mensais else None
+
+    @staticmethod
+    def referencia_datas(titulo: str) -> date | None:
+        """As datas 'dd/mm' de uma aba mensal pertencem ao mês da aba, não ao de hoje."""
+        mes = identificar_mes(titulo)
+        return date(mes[0], mes[1], 15) if mes else None
+
+    async def abrir(self, titulo: str) -> AbaAberta:
+        """Devolve a aba, abrindo-a na primeira vez. Aberturas simultâneas da mesma aba são agrupadas."""
+        if titulo in self._abertas:
+            self._abertas.move_to_end(titulo)
+            return self._abertas[titulo]
+        if titulo not in self._abrindo:
+            self._abrindo[titulo] = asyncio.create_task(self._abrir(titulo))
+        return await asyncio.shield(self._abrindo[titulo])
+
+    async def _abrir(self, titulo: str) -> AbaAberta:
+        try:
+            worksheet = await self.acesso.executar(self.spreadsheet.worksheet, titulo)
+            sincronizador = SincronizadorDePlanilha(referencia_datas=self.referencia_datas(titulo))
+
+            async def carregar():
+                return await sincronizador.registrar(await self.acesso.executar(sincronizador.buscar, worksheet))
+
+            cache = CacheDePlanilha(carregar, idade_maxima=self.idade_maxima)
+            cache.ao_carregar = lambda snapshot: self._guardar_ids(titulo, snapshot)
+            aba = AbaAberta(titulo, worksheet, cache)
+            self._abertas[titulo] = aba
+            self._liberar_espaco()
+            return aba
+        finally:
+            del self._abrindo[titulo]
+
+    def _liberar_espaco(self):
+        """Descarta as abas menos usadas além da capacidade, exceto as que estão em uso por uma busca."""
+        for titulo in list(self._abertas):
+            if len(self._abertas) <= self.capacidade:
+                break
+            if not self._em_uso[titulo]:
+                del self._abertas[titulo]
+
+    # --- IDs por Aba ---
+    def _guardar_ids(self, titulo: str, snapshot: Snapshot):
+        ids = snapshot.tabela.ids
+        self._ids[titulo] = (time.monotonic(), frozenset(ids[p] for p in range(len(ids))))
+
+    def pode_conter(self, titulo: str, id_orcamento: str) -> bool:
+        """False se a aba foi baixada há menos de `idade_maxima` segundos e não tem o ID."""
+        guardado = self._ids.get(titulo)
+        if guardado is None or time.monotonic() - guardado[0] > self.idade_maxima:
+            return True
+        return id_orcamento in guardado[1]
+
+    async def buscar_id(self, id_orcamento: str, ignorar: set[str] = frozenset()) -> tuple[str, Orcamento] | None:
+        """Procura um orçamento nas abas mensais, da mais recente para a mais antiga. Devolve (aba, registro).
+
+        No máximo `paralelas` abas são abertas ao mesmo tempo, e a busca para no
+        primeiro mês em que o orçamento aparece. Abas cujos IDs guardados não têm
+        o orçamento são puladas sem download.
+        """
+        id_orcamento = id_orcamento.strip()
+        semaforo = asyncio.Semaphore(self.paralelas)  # Libera as abas na ordem: as mais recentes primeiro
+
+        async def consultar(titulo: str) -> Orcamento | None:
+            async with semaforo:
+                self._em_uso[titulo] += 1
+                try:
+                    aba = await self.abrir(titulo)
+                    snapshot = await aba.cache.obter()
+                    if titulo in self._ids:
+                        self._ids[titulo] = (snapshot.carregado_em, self._ids[titulo][1])
+                    return snapshot.indice.buscar_id(id_orcamento)
+                finally:
+                    self._em_uso[titulo] -= 1
+                    if not self._em_uso[titulo]:
+                        del self._em_uso[titulo]
+
+        titulos = [t for t in self.abas_mensais if t not in ignorar and self.pode_conter(t, id_orcamento)]
+        tarefas = [asyncio.create_task(consultar(t)) for t in titulos]
+        try:
+            for titulo, tarefa in zip(titulos, tarefas):
+                try:
+                    registro = await tarefa
+                except Exception as e:
+                    print(f"Erro ao consultar a aba {titulo}: {e}")
+                    continue
+                if registro is not None:
+                    if titulo in self._abertas:
+                        self._abertas.move_to_end(titulo)
+                    return titulo, registro
+            return None
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            await asyncio.gather(*tarefas, return_exceptions=True)
+            self._liberar_espaco()
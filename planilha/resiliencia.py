@@ -0,0 +1,144 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+# Respostas do Google que indicam um problema passageiro (cota por minuto ou instabilidade)
+CODIGOS_TRANSITORIOS = {429, 500, 502, 503, 504}
+
+
+class PlanilhaIndisponivel(Exception):
+    """O Google Sheets não respondeu (cota, erro 5xx, timeout ou rede), mesmo após as novas tentativas.
+
+    O erro original fica em `__cause__`.
+    """
+
+
+class CircuitoAberto(PlanilhaIndisponivel):
+    """As chamadas estão suspensas depois de muitas falhas seguidas (ver `DisjuntorDeCircuito`)."""
+
+    def __init__(self, tentar_em: float):
+        self.tentar_em = tentar_em
+        quando = f"em {tentar_em:.0f}s" if tentar_em >= 1 else "em instantes"
+        super().__init__(f"a planilha do Google está indisponível no momento (nova tentativa {quando})")
+
+
+# --- Classificação dos Erros ---
+def codigo_http(erro: BaseException) -> int | None:
+    """Código HTTP de um erro do gspread (`APIError`), sem precisar importar o gspread."""
+    codigo = getattr(erro, "code", None)
+    if isinstance(codigo, int):
+        return codigo
+    codigo = getattr(getattr(erro, "response", None), "status_code", None)
+    return codigo if isinstance(codigo, int) else None
+
+
+def erro_transitorio(erro: BaseException) -> bool:
+    """True para erros em que vale a pena tentar de novo: 429, 5xx, tempo esgotado e falhas de rede."""
+    if isinstance(erro, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    codigo = codigo_http(erro)
+    if codigo is not None:
+        return codigo in CODIGOS_TRANSITORIOS
+    # Falhas de rede do requests (usado pelo gspread) herdam de OSError
+    return isinstance(erro, OSError)
+
+
+def espera_pedida(erro: BaseException | None) -> float | None:
+    """Segundos pedidos pelo Google no cabeçalho Retry-After, se houver."""
+    cabecalhos = getattr(getattr(erro, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(cabecalhos.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+# --- Novas Tentativas ---
+@dataclass
+class PoliticaDeRetentativa:
+    """Quantas vezes tentar e quanto esperar entre as tentativas (backoff exponencial com variação aleatória).
+
+    A variação ("jitter") evita que várias chamadas que falharam juntas tentem de novo
+    todas no mesmo instante. Para o erro 429 a espera é maior: a cota do Sheets é por minuto.
+    """
+    tentativas: int = 3
+    base: float = 0.5          # Teto da primeira espera, em segundos (dobra a cada tentativa)
+    maximo: float = 30.0       # Teto de qualquer espera
+    espera_cota: float = 10.0  # Teto mínimo da espera após um 429
+
+    def espera(self, tentativa: int, erro: BaseException | None = None) -> float:
+        """Segundos a esperar depois da tentativa `tentativa` (a partir de 0) ter falhado com `erro`."""
+        pedida = espera_pedida(erro)
+        if pedida is not None:
+            return min(pedida, self.maximo) + random.uniform(0, self.base)
+        teto = min(self.maximo, self.base * 2 ** tentativa)
+        if erro is not None and codigo_http(erro) == 429:
+            teto = max(teto, self.espera_cota)
+            return random.uniform(teto / 2, teto)
+        return random.uniform(0, teto)
+
+
+# --- Disjuntor ---
+class DisjuntorDeCircuito:
+    """Suspende as chamadas à planilha depois de `limite_falhas` falhas transitórias seguidas.
+
+    - fechado: as chamadas passam normalmente.
+    - aberto: as chamadas falham na hora com `CircuitoAberto`, sem ir ao Google,
+      durante `tempo_aberto` segundos.
+    - meio aberto: passado esse tempo, uma única chamada de teste é liberada; se ela
+      funcionar o circuito fecha, se falhar ele abre de novo.
+    """
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(self, limite_falhas: int = 5, tempo_aberto: float = 60.0, relogio: Callable[[], float] = time.monotonic):
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self.relogio = relogio
+        self.falhas_seguidas = 0
+        self.aberturas = 0  # Quantas vezes o circuito abriu desde o início
+        self._aberto_ate: float | None = None
+        self._testando = False
+
+    @property
+    def estado(self) -> str:
+        if self._aberto_ate is None:
+            return self.FECHADO
+        return self.ABERTO if self.relogio() < self._aberto_ate else self.MEIO_ABERTO
+
+    def verificar(self) -> bool:
+        """Chamado antes de cada chamada: levanta `CircuitoAberto` se ela não deve ser feita agora.
+
+        Devolve True se a chamada for a de teste do circuito meio aberto.
+        """
+        if self._aberto_ate is None:
+            return False
+        restante = self._aberto_ate - self.relogio()
+        if restante > 0:
+            raise CircuitoAberto(restante)
+        if self._testando:  # Outra chamada já está testando se o Google voltou
+            raise CircuitoAberto(0)
+        self._testando = True
+        return True
+
+    def registrar_sucesso(self):
+        if self._aberto_ate is not None:
+            print("Planilha: circuito fechado, o Google Sheets voltou a responder.")
+        self.falhas_seguidas = 0
+        self._aberto_ate = None
+        self._testando = False
+
+    def cancelar_teste(self):
+        """A chamada de teste foi cancelada antes de terminar: libera o teste para a próxima."""
+        self._testando = False
+
+    def registrar_falha(self):
+        self.falhas_seguidas += 1
+        if self._testando or (self._aberto_ate is None and self.falhas_seguidas >= self.limite_falhas):
+            self._aberto_ate = self.relogio() + self.tempo_aberto
+            self._testando = False
+            self.aberturas += 1
+            print(f"Planilha: circuito aberto por {self.tempo_aberto:g}s após {self.falhas_seguidas} falha(s) seguida(s).")
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from .consulta import ORDEM_DATA, Consulta, executar
+from .colunar import Orcamento, normalizar_status
+from .indice import IndiceDePlanilha
+
+# --- Status usados nos resumos ---
+STATUS_FINALIZADOS = ["09 Pronto", "11 Entregue", "12 Enviar e-mail", "20 Cancelado"]
+# A planilha usa as duas grafias para a revisão
+STATUS_REVISAO = ["04 Revisar", "04 Revisão"]
+
+# Os mesmos, já normalizados: usados pelo resumo e pelo /painel
+FINALIZADOS_NORMALIZADOS = frozenset(normalizar_status(s) for s in STATUS_FINALIZADOS)
+
+
+def consulta_atrasados(hoje: date) -> Consulta:
+    """Orçamentos não finalizados com entrega antes de hoje, em ordem de data."""
+    return Consulta(entrega_ate=hoje - timedelta(days=1), excluir_status=tuple(STATUS_FINALIZADOS), ordem=ORDEM_DATA)
+
+
+def projetos_atrasados(indice: IndiceDePlanilha, hoje: date) -> list[Orcamento]:
+    return list(executar(consulta_atrasados(hoje), indice))
+
+
+@dataclass
+class Resumo:
+    atrasados: list[Orcamento]
+    para_hoje: list[Orcamento]
+    em_revisao: list[Orcamento]
+
+    def categorias(self) -> dict[str, list[Orcamento]]:
+        return {"🚨 Atrasados": self.atrasados, "📦 Entrega Hoje": self.para_hoje, "🔍 Em Revisão": self.em_revisao}
+
+    def filtrar(self, status: set[str]) -> "Resumo":
+        """Apenas os orçamentos cujos status normalizados estão em `status`."""
+        return Resumo(*([r for r in lista if r.status_normalizado in status] for lista in self.categorias().values()))
+
+    def assinatura(self) -> frozenset[tuple[str, str]]:
+        """Identifica o conteúdo do resumo para saber se ele mudou desde a última vez."""
+        return frozenset((categoria, r.id) for categoria, lista in self.categorias().items() for r in lista)
+
+
+def calcular_resumo(indice: IndiceDePlanilha, hoje: date) -> Resumo:
+    """Calcula de uma só vez os conjuntos atrasado, entrega hoje e em revisão."""
+    para_hoje = [r for r in indice.entre_datas(hoje, hoje) if r.status_normalizado not in FINALIZADOS_NORMALIZADOS]
+    em_revisao = [r for status in STATUS_REVISAO for r in indice.com_status(status)]
+    return Resumo(projetos_atrasados(indice, hoje), para_hoje, em_revisao)
@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+from .colunar import COLUNA_DATA, COLUNA_QTD_DOCS, COLUNA_STATUS, LARGURA_LINHA, TabelaColunar
+
+# --- Intervalos lidos da aba ---
+# Apenas as colunas usadas pelo bot: B a E (entrega, cliente, orçamento, qtd. docs) e H (status).
+INTERVALOS_USADOS = ["B:E", "H:H"]
+
+# Tipos de evento emitidos pelo sincronizador
+ADICIONADO = "adicionado"
+REMOVIDO = "removido"
+STATUS_ALTERADO = "status_alterado"
+
+
+@dataclass(frozen=True)
+class EventoDeLinha:
+    """Mudança detectada em um orçamento (identificado pela coluna D) entre duas sincronizações."""
+    tipo: str
+    id: str
+    linha: list[str]
+    status_anterior: str | None = None
+
+    @property
+    def status(self) -> str:
+        return self.linha[COLUNA_STATUS]
+
+
+# --- Sincronizador ---
+class SincronizadorDePlanilha:
+    """Lê apenas as colunas usadas da aba e compara com o que foi visto da última vez.
+
+    `buscar()` é bloqueante (faz um único `batch_get`) e deve rodar no pool de
+    threads. `processar()` guarda o resultado em colunas (`TabelaColunar`) e
+    compara com a leitura anterior; também é pesado (hash, colunas e comparação
+    percorrem todas as linhas) e deve rodar em uma thread. Os eventos que ele
+    devolve são entregues aos ouvintes com `avisar()`, no event loop. A tabela
+    é `None` quando nada mudou, para que o cache possa reaproveitar o snapshot
+    e os índices já construídos.
+    """
+
+    def __init__(self, referencia_datas: date | None = None):
+        self.referencia_datas = referencia_datas  # Data usada para deduzir o ano de 'dd/mm' (padrão: hoje)
+        self.ultima_tabela: TabelaColunar | None = None
+        # Status de cada linha na última leitura: a tabela é a mesma do snapshot e pode receber
+        # mudanças otimistas, que precisam ser avisadas quando chegarem de fato à planilha
+        self._status_lidos: array | None = None
+        self._assinatura: bytes | None = None  # Resumo (hash) da última leitura, para saber se algo mudou
+        self.ouvintes: list[Callable[[list[EventoDeLinha]], None]] = []
+
+    def buscar(self, worksheet) -> list[list[str]]:
+        """Lê os intervalos usados e remonta as linhas nas posições originais das colunas."""
+        colunas_b_e, coluna_h = worksheet.batch_get(INTERVALOS_USADOS)
+        total = max(len(colunas_b_e), len(coluna_h))
+        linhas = []
+        for i in range(total):
+            linha = [""] * LARGURA_LINHA
+            if i < len(colunas_b_e):
+                valores = colunas_b_e[i][:COLUNA_QTD_DOCS - COLUNA_DATA + 1]
+                linha[COLUNA_DATA:COLUNA_DATA + len(valores)] = valores
+            if i < len(coluna_h) and coluna_h[i]:
+                linha[COLUNA_STATUS] = coluna_h[i][0]
+            linhas.append(linha)
+        return linhas
+
+    def definir_base(self, tabela: TabelaColunar):
+        """Usa uma tabela já conhecida (ex: a salva em disco) como a última leitura."""
+        self.ultima_tabela = tabela
+        self._status_lidos = array("H", tabela.status)
+        self._assinatura = None
+
+    def esquecer(self):
+        """Descarta a última leitura; a próxima é tratada como a primeira (ex: ao trocar de aba)."""
+        self.ultima_tabela = self._status_lidos = self._assinatura = None
+
+    def processar(self, linhas: list[list[str]]) -> tuple[TabelaColunar | None, list[EventoDeLinha]]:
+        """Guarda a nova leitura (em colunas) e devolve (tabela, mudanças). A tabela é None se nada mudou.
+
+        Não avisa os ouvintes: bloqueante, roda em uma thread (ver `avisar`).
+        """
+        assinatura = _assinar(linhas)
+        if assinatura == self._assinatura:
+            return None, []
+        tabela = TabelaColunar(linhas, self.referencia_datas)
+        anterior, status_anteriores = self.ultima_tabela, self._status_lidos
+        self.ultima_tabela, self._assinatura = tabela, assinatura
+        self._status_lidos = array("H", tabela.status)
+        eventos = comparar(anterior, status_anteriores, tabela) if anterior is not None else []
+        return tabela, eventos
+
+    def avisar(self, eventos: list[EventoDeLinha]):
+        """Entrega as mudanças aos ouvintes. Roda no event loop (os ouvintes podem usar recursos dele)."""
+        if eventos:
+            for ouvinte in self.ouvintes:
+                ouvinte(eventos)
+
+    async def registrar(self, linhas: list[list[str]]) -> TabelaColunar | None:
+        """`processar` em uma thread e `avisar` no event loop. Devolve None se nada mudou."""
+        tabela, eventos = await asyncio.to_thread(self.processar, linhas)
+        self.avisar(eventos)
+        return tabela
+
+
+def _assinar(linhas: list[list[str]]) -> bytes:
+    """Resumo das linhas lidas; guardar só isso evita manter a leitura inteira em memória."""
+    texto = "\x1e".join("\x1f".join(linha) for linha in linhas)
+    return hashlib.blake2b(texto.encode("utf-8", "surrogatepass"), digest_size=32).digest()
+
+
+def _por_id(tabela: TabelaColunar) -> dict[str, int]:
+    resultado = {}
+    for posicao, id_orcamento in enumerate(tabela.ids):
+        if id_orcamento:
+            resultado.setdefault(id_orcamento, posicao)
+    return resultado
+
+
+def comparar(anterior: TabelaColunar, status_anteriores: array, nova: TabelaColunar) -> list[EventoDeLinha]:
+    """Compara duas leituras, usando o número do orçamento como chave.
+
+    `status_anteriores` são os códigos de status de `anterior` no momento em que ela foi lida.
+    """
+    antes = _por_id(anterior)
+    depois = _por_id(nova)
+    eventos = []
+    for id_orcamento, posicao in depois.items():
+        posicao_anterior = antes.get(id_orcamento)
+        if posicao_anterior is None:
+            eventos.append(EventoDeLinha(ADICIONADO, id_orcamento, nova.linha(posicao)))
+            continue
+        status_anterior = anterior.textos_status[status_anteriores[posicao_anterior]]
+        if status_anterior.strip() != nova.texto_status(posicao).strip():
+            eventos.append(EventoDeLinha(STATUS_ALTERADO, id_orcamento, nova.linha(posicao), status_anterior))
+    for id_orcamento, posicao in antes.items():
+        if id_orcamento not in depois:
+            linha = anterior.linha(posicao)
+            linha[COLUNA_STATUS] = anterior.textos_status[status_anteriores[posicao]]
+            eventos.append(EventoDeLinha(REMOVIDO, id_orcamento, linha, linha[COLUNA_STATUS]))
+    return eventos
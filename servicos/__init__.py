@@ -0,0 +1,11 @@
+"""Serviços de apoio aos cogs que não dependem da planilha."""
+from .lembretes import AgendadorDeLembretes, ArmazemDeLembretes, Lembrete
+from .limites import BaldeDeFichas, ConsultasEmAndamento, LimitadorDeUso, LimiteDeUsoExcedido, ler_limite
+from .metricas import COTA_SHEETS_POR_MINUTO, RegistroDeMetricas, metricas
+from .paginacao import ListaPreguicosa, Paginador
+from .saude import ServidorDeSaude
+
+__all__ = ["AgendadorDeLembretes", "ArmazemDeLembretes", "Lembrete",
+           "BaldeDeFichas", "ConsultasEmAndamento", "LimitadorDeUso", "LimiteDeUsoExcedido", "ler_limite",
+           "ListaPreguicosa", "Paginador",
+           "COTA_SHEETS_POR_MINUTO", "RegistroDeMetricas", "metricas", "ServidorDeSaude"]
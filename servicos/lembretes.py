@@ -0,0 +1,175 @@
+import asyncio
+import heapq
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import discord
+
+# Erros de entrega que não adianta repetir (usuário ou canal apagado, DM fechada e sem canal de origem)
+ERROS_PERMANENTES = (discord.NotFound, discord.Forbidden)
+# Espera antes de tentar de novo uma entrega que falhou: dobra a cada falha, até o máximo
+ESPERA_RETENTATIVA = 30
+ESPERA_RETENTATIVA_MAXIMA = 3600
+
+
+@dataclass
+class Lembrete:
+    id: int
+    usuario_id: int
+    canal_id: int | None
+    mensagem: str
+    vence_em: float  # timestamp Unix
+
+
+# --- Armazenamento em SQLite ---
+class ArmazemDeLembretes:
+    """Guarda os lembretes pendentes em disco para que sobrevivam a reinícios."""
+
+    def __init__(self, caminho: str):
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute(
+            """CREATE TABLE IF NOT EXISTS lembretes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                usuario_id INTEGER NOT NULL,
+                canal_id INTEGER,
+                mensagem TEXT NOT NULL,
+                vence_em REAL NOT NULL
+            )"""
+        )
+        self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_lembretes_usuario ON lembretes (usuario_id)")
+        self.conexao.commit()
+
+    def adicionar(self, usuario_id: int, canal_id: int | None, mensagem: str, vence_em: float) -> Lembrete:
+        cursor = self.conexao.execute(
+            "INSERT INTO lembretes (usuario_id, canal_id, mensagem, vence_em) VALUES (?, ?, ?, ?)",
+            (usuario_id, canal_id, mensagem, vence_em),
+        )
+        self.conexao.commit()
+        return Lembrete(cursor.lastrowid, usuario_id, canal_id, mensagem, vence_em)
+
+    def obter(self, lembrete_id: int) -> Lembrete | None:
+        linha = self.conexao.execute(
+            "SELECT id, usuario_id, canal_id, mensagem, vence_em FROM lembretes WHERE id = ?", (lembrete_id,)
+        ).fetchone()
+        return Lembrete(*linha) if linha else None
+
+    def remover(self, lembrete_id: int, usuario_id: int | None = None) -> bool:
+        """Apaga um lembrete. Se `usuario_id` for informado, só apaga se pertencer a ele."""
+        if usuario_id is None:
+            cursor = self.conexao.execute("DELETE FROM lembretes WHERE id = ?", (lembrete_id,))
+        else:
+            cursor = self.conexao.execute("DELETE FROM lembretes WHERE id = ? AND usuario_id = ?", (lembrete_id, usuario_id))
+        self.conexao.commit()
+        return cursor.rowcount > 0
+
+    def do_usuario(self, usuario_id: int) -> list[Lembrete]:
+        linhas = self.conexao.execute(
+            "SELECT id, usuario_id, canal_id, mensagem, vence_em FROM lembretes WHERE usuario_id = ? ORDER BY vence_em",
+            (usuario_id,),
+        ).fetchall()
+        return [Lembrete(*linha) for linha in linhas]
+
+    def vencimentos(self) -> list[tuple[float, int]]:
+        """Apenas (vence_em, id) de todos os pendentes: o suficiente para montar a fila."""
+        return self.conexao.execute("SELECT vence_em, id FROM lembretes").fetchall()
+
+    def fechar(self):
+        self.conexao.close()
+
+
+# --- Agendador ---
+class AgendadorDeLembretes:
+    """Uma única tarefa que entrega os lembretes na hora certa.
+
+    A fila em memória é um heap de `(vence_em, id)`; o texto fica no SQLite e só
+    é lido na hora da entrega. Cancelamentos apagam do banco e a entrada do heap
+    é descartada quando chega a sua vez.
+
+    Cada entrega roda em uma tarefa própria, para que um envio lento não atrase
+    os demais. O lembrete só sai do banco depois de entregue (ou de um erro
+    permanente); nos outros erros ele volta para a fila com uma espera crescente
+    e, se o bot reiniciar antes, é reenviado na volta.
+    """
+
+    def __init__(self, armazem: ArmazemDeLembretes, entregar: Callable[[Lembrete], Awaitable[None]]):
+        self.armazem = armazem
+        self.entregar = entregar
+        self._fila: list[tuple[float, int]] = []
+        self._acordar = asyncio.Event()
+        self._tarefa: asyncio.Task | None = None
+        self._entregas: set[asyncio.Task] = set()
+        self._falhas: dict[int, int] = {}  # id -> entregas seguidas que falharam
+
+    @property
+    def pendentes(self) -> int:
+        return len(self._fila)
+
+    def atrasados(self, tolerancia: float = 0) -> int:
+        """Quantos lembretes já deveriam ter sido entregues há mais de `tolerancia` segundos."""
+        limite = time.time() - tolerancia
+        return sum(1 for vence_em, _ in self._fila if vence_em < limite)
+
+    def iniciar(self):
+        """Recarrega os lembretes salvos (os vencidos saem na primeira volta) e inicia o despachante."""
+        self._fila = self.armazem.vencimentos()
+        heapq.heapify(self._fila)
+        self._tarefa = asyncio.create_task(self._despachar())
+
+    def parar(self):
+        if self._tarefa:
+            self._tarefa.cancel()
+        for entrega in self._entregas:
+            entrega.cancel()  # Continuam no banco e são entregues no próximo início
+
+    def agendar(self, usuario_id: int, canal_id: int | None, mensagem: str, segundos: float) -> Lembrete:
+        lembrete = self.armazem.adicionar(usuario_id, canal_id, mensagem, time.time() + segundos)
+        heapq.heappush(self._fila, (lembrete.vence_em, lembrete.id))
+        self._acordar.set()
+        return lembrete
+
+    def cancelar(self, lembrete_id: int, usuario_id: int) -> bool:
+        return self.armazem.remover(lembrete_id, usuario_id)
+
+    async def _despachar(self):
+        while True:
+            if not self._fila:
+                await self._esperar(None)
+                continue
+            vence_em, lembrete_id = self._fila[0]
+            espera = vence_em - time.time()
+            if espera > 0:
+                await self._esperar(espera)
+                continue
+            heapq.heappop(self._fila)
+            lembrete = self.armazem.obter(lembrete_id)
+            if lembrete is None:  # Cancelado
+                self._falhas.pop(lembrete_id, None)
+                continue
+            entrega = asyncio.create_task(self._entregar(lembrete))
+            self._entregas.add(entrega)
+            entrega.add_done_callback(self._entregas.discard)
+
+    async def _entregar(self, lembrete: Lembrete):
+        try:
+            await self.entregar(lembrete)
+        except ERROS_PERMANENTES as e:
+            print(f"Lembrete {lembrete.id} descartado: não é possível entregá-lo ({e}).")
+        except Exception as e:
+            falhas = self._falhas[lembrete.id] = self._falhas.get(lembrete.id, 0) + 1
+            espera = min(ESPERA_RETENTATIVA * 2 ** (falhas - 1), ESPERA_RETENTATIVA_MAXIMA)
+            print(f"Erro ao entregar o lembrete {lembrete.id}: {e}. Nova tentativa em {espera}s.")
+            heapq.heappush(self._fila, (time.time() + espera, lembrete.id))
+            self._acordar.set()
+            return
+        self._falhas.pop(lembrete.id, None)
+        self.armazem.remover(lembrete.id)
+
+    async def _esperar(self, segundos: float | None):
+        """Dorme até o próximo vencimento ou até um novo lembrete ser agendado."""
+        self._acordar.clear()
+        try:
+            await asyncio.wait_for(self._acordar.wait(), segundos)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+from discord import app_commands
+
+
+def ler_limite(texto: str) -> tuple[int, float]:
+    """Converte '5/30' (5 usos a cada 30 segundos) em (capacidade, período)."""
+    usos, segundos = texto.split("/")
+    return int(usos), float(segundos)
+
+
+# --- Token Bucket ---
+class BaldeDeFichas:
+    """Token bucket: guarda até `capacidade` fichas e repõe `capacidade` a cada `periodo` segundos.
+
+    Permite rajadas curtas de até `capacidade` usos, mas limita a média de longo prazo.
+    """
+
+    __slots__ = ("capacidade", "por_segundo", "fichas", "atualizado_em")
+
+    def __init__(self, capacidade: int, periodo: float):
+        self.capacidade = capacidade
+        self.por_segundo = capacidade / periodo
+        self.fichas = float(capacidade)
+        self.atualizado_em = time.monotonic()
+
+    def _repor(self, agora: float):
+        self.fichas = min(self.capacidade, self.fichas + (agora - self.atualizado_em) * self.por_segundo)
+        self.atualizado_em = agora
+
+    def espera(self, custo: float = 1) -> float:
+        """Segundos até haver `custo` fichas (0 se já houver)."""
+        self._repor(time.monotonic())
+        return max(0.0, (custo - self.fichas) / self.por_segundo)
+
+    def consumir(self, custo: float = 1):
+        self.fichas -= custo
+
+    def cheio(self) -> bool:
+        self._repor(time.monotonic())
+        return self.fichas >= self.capacidade
+
+
+class LimiteDeUsoExcedido(app_commands.CheckFailure):
+    """Levantada quando um usuário (ou o servidor) esgota o limite de uso dos comandos."""
+
+    def __init__(self, escopo: str, tentar_em: float):
+        self.escopo = escopo          # "usuario" ou "servidor"
+        self.tentar_em = tentar_em    # Segundos até poder usar de novo
+        super().__init__(f"Limite de uso ({escopo}) excedido. Tente novamente em {tentar_em:.0f}s.")
+
+
+# --- Limitador por Usuário e por Servidor ---
+class LimitadorDeUso:
+    """Um token bucket por usuário e outro por servidor.
+
+    Um comando só é aceito se houver ficha nos dois; caso contrário nenhum dos
+    dois é cobrado, para que um usuário bloqueado não gaste o limite do servidor.
+    """
+
+    def __init__(self, limite_usuario: tuple[int, float], limite_servidor: tuple[int, float], maximo_baldes: int = 1000):
+        self.limite_usuario = limite_usuario
+        self.limite_servidor = limite_servidor
+        self.maximo_baldes = maximo_baldes
+        self._baldes: dict[tuple[str, int], BaldeDeFichas] = {}
+
+    def _balde(self, escopo: str, chave: int, limite: tuple[int, float]) -> BaldeDeFichas:
+        balde = self._baldes.get((escopo, chave))
+        if balde is None:
+            if len(self._baldes) >= self.maximo_baldes:
+                # Baldes cheios se comportam como novos: podem ser descartados sem mudar nada
+                self._baldes = {k: b for k, b in self._baldes.items() if not b.cheio()}
+            balde = self._baldes[(escopo, chave)] = BaldeDeFichas(*limite)
+        return balde
+
+    def verificar(self, usuario_id: int, servidor_id: int | None, custo: float = 1):
+        """Cobra o uso ou levanta `LimiteDeUsoExcedido` com o tempo de espera."""
+        baldes = [("usuario", self._balde("usuario", usuario_id, self.limite_usuario))]
+        if servidor_id is not None:
+            baldes.append(("servidor", self._balde("servidor", servidor_id, self.limite_servidor)))
+        for escopo, balde in baldes:
+            espera = balde.espera(custo)
+            if espera > 0:
+                raise LimiteDeUsoExcedido(escopo, espera)
+        for _, balde in baldes:
+            balde.consumir(custo)
+
+
+# --- Agrupamento de Consultas Idênticas ---
+class ConsultasEmAndamento:
+    """Consultas idênticas feitas ao mesmo tempo compartilham uma única execução e o mesmo resultado.
+
+    Diferente de um cache, o resultado não é guardado: assim que a execução
+    termina, a próxima consulta com a mesma chave roda de novo.
+    """
+
+    def __init__(self):
+        self._tarefas: dict[Hashable, asyncio.Task] = {}
+        self.agrupadas = 0  # Quantas consultas reaproveitaram uma execução em andamento
+
+    async def executar(self, chave: Hashable, calcular: Callable[[], Awaitable[Any]]) -> Any:
+        tarefa = self._tarefas.get(chave)
+        if tarefa is None:
+            tarefa = asyncio.create_task(calcular())
+            self._tarefas[chave] = tarefa
+            tarefa.add_done_callback(lambda _: self._tarefas.pop(chave, None))
+        else:
+            self.agrupadas += 1
+        # shield: se quem chamou for cancelado, a execução continua para os demais
+        return await asyncio.shield(tarefa)
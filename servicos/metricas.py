@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+from collections import deque
+
+# Limite de leituras por minuto da API do Google Sheets (cota padrão por usuário)
+COTA_SHEETS_POR_MINUTO = int(os.environ.get("SHEETS_COTA_POR_MINUTO", 60))
+
+# Limites (em segundos) dos buckets do histograma exportado para o Prometheus
+BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+
+class Metrica:
+    """Contadores e latências de uma operação (um comando ou um tipo de chamada ao Sheets)."""
+
+    def __init__(self, amostras: int = 1000):
+        self.total = 0
+        self.erros = 0
+        self.soma = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.recentes: deque[float] = deque(maxlen=amostras)  # Para os percentis
+
+    def registrar(self, segundos: float, erro: bool):
+        self.total += 1
+        self.erros += erro
+        self.soma += segundos
+        self.recentes.append(segundos)
+        for i, limite in enumerate(BUCKETS):
+            if segundos <= limite:
+                self.buckets[i] += 1
+
+    def percentis(self) -> tuple[float, float, float]:
+        """p50, p95 e p99 (em segundos) das últimas amostras."""
+        if not self.recentes:
+            return 0.0, 0.0, 0.0
+        ordenadas = sorted(self.recentes)
+        ultimo = len(ordenadas) - 1
+        return tuple(ordenadas[min(ultimo, int(p * len(ordenadas)))] for p in (0.50, 0.95, 0.99))
+
+
+# --- Registro de Métricas ---
+class RegistroDeMetricas:
+    """Métricas do processo inteiro. Compartilhado entre os cogs e o servidor web (thread-safe)."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.comandos: dict[str, Metrica] = {}
+        self.sheets: dict[str, Metrica] = {}
+        self._chamadas_sheets: deque[float] = deque()
+        self.iniciado_em = time.time()
+
+    def registrar_comando(self, nome: str, segundos: float, erro: bool = False):
+        with self._trava:
+            self.comandos.setdefault(nome, Metrica()).registrar(segundos, erro)
+
+    def registrar_sheets(self, nome: str, segundos: float, erro: bool = False):
+        with self._trava:
+            self.sheets.setdefault(nome, Metrica()).registrar(segundos, erro)
+            agora = time.monotonic()
+            self._chamadas_sheets.append(agora)
+            self._descartar_antigas(agora)
+
+    def _descartar_antigas(self, agora: float):
+        while self._chamadas_sheets and agora - self._chamadas_sheets[0] > 60:
+            self._chamadas_sheets.popleft()
+
+    def chamadas_sheets_por_minuto(self) -> int:
+        with self._trava:
+            self._descartar_antigas(time.monotonic())
+            return len(self._chamadas_sheets)
+
+    def exportar_prometheus(self) -> str:
+        """Todas as métricas no formato de texto do Prometheus."""
+        linhas = []
+        with self._trava:
+            for grupo, metricas in (("comando", self.comandos), ("sheets", self.sheets)):
+                prefixo = f"bot_{grupo}"
+                itens = sorted(metricas.items())
+                # Cada família de métricas precisa vir agrupada
+                linhas.append(f"# TYPE {prefixo}_total counter")
+                linhas.extend(f'{prefixo}_total{{nome="{nome}"}} {m.total}' for nome, m in itens)
+                linhas.append(f"# TYPE {prefixo}_erros_total counter")
+                linhas.extend(f'{prefixo}_erros_total{{nome="{nome}"}} {m.erros}' for nome, m in itens)
+                linhas.append(f"# TYPE {prefixo}_segundos histogram")
+                for nome, m in itens:
+                    for limite, quantidade in zip(BUCKETS, m.buckets):
+                        linhas.append(f'{prefixo}_segundos_bucket{{nome="{nome}",le="{limite}"}} {quantidade}')
+                    linhas.append(f'{prefixo}_segundos_bucket{{nome="{nome}",le="+Inf"}} {m.total}')
+                    linhas.append(f'{prefixo}_segundos_sum{{nome="{nome}"}} {m.soma:.6f}')
+                    linhas.append(f'{prefixo}_segundos_count{{nome="{nome}"}} {m.total}')
+            self._descartar_antigas(time.monotonic())
+            linhas.append("# TYPE bot_sheets_chamadas_ultimo_minuto gauge")
+            linhas.append(f"bot_sheets_chamadas_ultimo_minuto {len(self._chamadas_sheets)}")
+            linhas.append("# TYPE bot_sheets_cota_por_minuto gauge")
+            linhas.append(f"bot_sheets_cota_por_minuto {COTA_SHEETS_POR_MINUTO}")
+        return "\n".join(linhas) + "\n"
+
+
+# Instância única usada por todo o bot
+metricas = RegistroDeMetricas()
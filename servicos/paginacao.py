@@ -0,0 +1,145 @@
+from typing import Any, Callable, Iterable, Sequence
+
+import discord
+
+
+# --- Resultados Sob Demanda ---
+class ListaPreguicosa:
+    """Lê um iterador só até onde for pedido, guardando o que já foi lido para voltar de página.
+
+    Uma lista comum também é aceita; nesse caso o total já é conhecido desde o início.
+    """
+
+    def __init__(self, itens: Iterable[Any]):
+        if isinstance(itens, Sequence):
+            self._lidos, self._fonte = itens, None
+        else:
+            self._lidos, self._fonte = [], iter(itens)
+
+    def _ler_ate(self, quantidade: int):
+        while self._fonte is not None and len(self._lidos) < quantidade:
+            try:
+                self._lidos.append(next(self._fonte))
+            except StopIteration:
+                self._fonte = None
+
+    def fatia(self, inicio: int, fim: int) -> Sequence[Any]:
+        self._ler_ate(fim)
+        return self._lidos[inicio:fim]
+
+    def tem_mais_que(self, quantidade: int) -> bool:
+        self._ler_ate(quantidade + 1)
+        return len(self._lidos) > quantidade
+
+    @property
+    def lidos(self) -> int:
+        return len(self._lidos)
+
+    @property
+    def total(self) -> int | None:
+        """Quantidade de itens, ou None se o iterador ainda não chegou ao fim."""
+        return len(self._lidos) if self._fonte is None else None
+
+    def __bool__(self) -> bool:
+        return self.tem_mais_que(0)
+
+
+# --- Paginação de Resultados ---
+class Paginador(discord.ui.View):
+    """Mostra uma lista longa em páginas de um embed, com botões de anterior/próxima.
+
+    Só os itens da página exibida são formatados, então o custo de cada página
+    depende do tamanho da página e não do tamanho do resultado. Os itens também
+    podem vir de um iterador (ou `ListaPreguicosa`), lido só até a página pedida.
+    """
+
+    def __init__(
+        self,
+        itens: Iterable[Any],
+        formatar: Callable[[Any], str],
+        titulo: str,
+        cor: discord.Color = discord.Color.blue(),
+        por_pagina: int = 15,
+        agrupar: Callable[[Any], str] | None = None,
+        autor_id: int | None = None,
+        timeout: float = 300,
+        aviso: str | None = None,
+    ):
+        super().__init__(timeout=timeout)
+        self.itens = itens if isinstance(itens, ListaPreguicosa) else ListaPreguicosa(itens)
+        self.formatar = formatar
+        self.titulo = titulo
+        self.cor = cor
+        self.por_pagina = por_pagina
+        self.agrupar = agrupar
+        self.autor_id = autor_id
+        self.aviso = aviso  # Texto extra no rodapé (ex: dados ainda não sincronizados)
+        self.pagina_atual = 0
+        self.mensagem: discord.WebhookMessage | None = None
+        self._atualizar_botoes()
+
+    @property
+    def total_paginas(self) -> int | None:
+        """None enquanto os itens ainda não foram lidos até o fim."""
+        total = self.itens.total
+        return max(1, -(-total // self.por_pagina)) if total is not None else None
+
+    def montar_pagina(self, numero: int) -> discord.Embed:
+        inicio = numero * self.por_pagina
+        linhas = []
+        grupo_anterior = None
+        for item in self.itens.fatia(inicio, inicio + self.por_pagina):
+            if self.agrupar:
+                grupo = self.agrupar(item)
+                if grupo != grupo_anterior:
+                    linhas.append(f"**{grupo[:100]}**")
+                    grupo_anterior = grupo
+            # Limita cada linha para que a página nunca passe do limite de 4096 caracteres do embed
+            linhas.append(self.formatar(item)[:200])
+        embed = discord.Embed(title=self.titulo, description="\n".join(linhas), color=self.cor)
+        if self.total_paginas is not None:
+            rodape = f"Página {numero + 1} de {self.total_paginas} • {self.itens.total} resultado(s)"
+        else:
+            rodape = f"Página {numero + 1} • {self.itens.lidos}+ resultado(s)"
+        embed.set_footer(text=f"{rodape} • {self.aviso}" if self.aviso else rodape)
+        return embed
+
+    async def enviar(self, interaction: discord.Interaction, ephemeral: bool = True):
+        """Envia a primeira página como resposta (followup) da interação."""
+        if not self.itens.tem_mais_que(self.por_pagina):
+            await interaction.followup.send(embed=self.montar_pagina(0), ephemeral=ephemeral)
+            self.stop()
+            return
+        self.mensagem = await interaction.followup.send(embed=self.montar_pagina(0), view=self, ephemeral=ephemeral, wait=True)
+
+    def _atualizar_botoes(self):
+        self.anterior.disabled = self.pagina_atual == 0
+        self.proxima.disabled = not self.itens.tem_mais_que((self.pagina_atual + 1) * self.por_pagina)
+
+    async def _mudar_pagina(self, interaction: discord.Interaction, passo: int):
+        if passo > 0 and not self.itens.tem_mais_que((self.pagina_atual + 1) * self.por_pagina):
+            passo = 0
+        self.pagina_atual = max(self.pagina_atual + passo, 0)
+        self._atualizar_botoes()
+        await interaction.response.edit_message(embed=self.montar_pagina(self.pagina_atual), view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.autor_id is not None and interaction.user.id != self.autor_id:
+            await interaction.response.send_message("Só quem executou o comando pode mudar de página.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        if self.mensagem:
+            try:
+                await self.mensagem.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(label="◀ Anterior", style=discord.ButtonStyle.secondary)
+    async def anterior(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._mudar_pagina(interaction, -1)
+
+    @discord.ui.button(label="Próxima ▶", style=discord.ButtonStyle.secondary)
+    async def proxima(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._mudar_pagina(interaction, 1)
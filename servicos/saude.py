@@ -0,0 +1,113 @@
+import json
+import math
+import time
+
+from aiohttp import web
+
+from .metricas import metricas
+
+
+# --- Servidor de Saúde ---
+class ServidorDeSaude:
+    """Servidor HTTP leve (aiohttp) que roda no mesmo event loop do bot.
+
+    - `/` e `/healthz` (liveness): falham se o bot ficou desconectado do gateway
+      por mais de `tolerancia_desconexao` segundos, para que a plataforma o reinicie.
+    - `/readyz` (readiness): falha enquanto o bot não está pronto para responder
+      (gateway, snapshot da planilha e fila de lembretes).
+    - `/metrics`: métricas no formato do Prometheus.
+    """
+
+    def __init__(self, bot, porta: int, tolerancia_desconexao: float = 600, limite_lembretes_atrasados: int = 50):
+        self.bot = bot
+        self.porta = porta
+        self.tolerancia_desconexao = tolerancia_desconexao
+        self.limite_lembretes_atrasados = limite_lembretes_atrasados
+        self.desconectado_desde = time.monotonic()  # Até o primeiro on_ready
+        self._runner: web.AppRunner | None = None
+
+        bot.add_listener(self._ao_conectar, "on_ready")
+        bot.add_listener(self._ao_conectar, "on_resumed")
+        bot.add_listener(self._ao_desconectar, "on_disconnect")
+
+        self.app = web.Application()
+        self.app.router.add_get("/", self.vivo)
+        self.app.router.add_get("/healthz", self.vivo)
+        self.app.router.add_get("/readyz", self.pronto)
+        self.app.router.add_get("/metrics", self.exportar_metricas)
+
+    async def _ao_conectar(self):
+        self.desconectado_desde = None
+
+    async def _ao_desconectar(self):
+        if self.desconectado_desde is None:
+            self.desconectado_desde = time.monotonic()
+
+    async def iniciar(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "0.0.0.0", self.porta).start()
+        print(f"Servidor de saúde ouvindo na porta {self.porta}.")
+
+    async def parar(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    # --- Verificações ---
+    def verificar(self) -> tuple[bool, dict]:
+        """Monta o relatório de prontidão. Devolve (pronto, detalhes)."""
+        latencia = self.bot.latency
+        gateway_ok = self.bot.is_ready() and not self.bot.is_closed()
+        detalhes = {
+            "gateway": {
+                "conectado": gateway_ok,
+                "latencia_ms": round(latencia * 1000) if math.isfinite(latencia) else None,
+            }
+        }
+        pronto = gateway_ok
+
+        planilha = self.bot.get_cog("SpreadsheetCommands")
+        if planilha and planilha.leitor:
+            # Leitor: o que importa é quando o sincronizador conferiu a planilha pela última vez
+            publicacao = planilha.publicacao
+            idade = round(time.time() - publicacao.conferido_em) if publicacao else None
+            atualizado = idade is not None and idade <= 2 * planilha.cache.idade_maxima
+            detalhes["planilha"] = {"papel": "leitor", "idade_snapshot_s": idade, "atualizada": atualizado,
+                                    "versao_publicada": publicacao.versao if publicacao else None}
+            pronto = pronto and atualizado
+        elif planilha and planilha.worksheet:
+            snapshot = planilha.cache.snapshot
+            idade = round(snapshot.idade) if snapshot else None
+            # Aceita até o dobro da idade máxima antes de considerar o snapshot preso
+            atualizado = idade is not None and idade <= 2 * planilha.cache.idade_maxima
+            detalhes["planilha"] = {"papel": "sincronizador", "conectada": True, "idade_snapshot_s": idade, "atualizada": atualizado,
+                                    "circuito": planilha.acesso.disjuntor.estado}
+            pronto = pronto and atualizado
+        else:
+            detalhes["planilha"] = {"conectada": False}
+
+        utilidades = self.bot.get_cog("UtilityCommands")
+        if utilidades:
+            atrasados = utilidades.lembretes.atrasados(tolerancia=60)
+            detalhes["lembretes"] = {"pendentes": utilidades.lembretes.pendentes, "atrasados": atrasados}
+            pronto = pronto and atrasados <= self.limite_lembretes_atrasados
+
+        detalhes["sheets_chamadas_ultimo_minuto"] = metricas.chamadas_sheets_por_minuto()
+        return pronto, detalhes
+
+    async def vivo(self, request: web.Request) -> web.Response:
+        desconectado = 0 if self.desconectado_desde is None else time.monotonic() - self.desconectado_desde
+        if desconectado > self.tolerancia_desconexao:
+            return web.Response(status=503, text=f"Sem conexão com o Discord há {round(desconectado)}s.")
+        return web.Response(text="Bot de comandos está online!")
+
+    async def pronto(self, request: web.Request) -> web.Response:
+        pronto, detalhes = self.verificar()
+        return web.Response(
+            status=200 if pronto else 503,
+            text=json.dumps({"pronto": pronto, **detalhes}, ensure_ascii=False),
+            content_type="application/json",
+        )
+
+    async def exportar_metricas(self, request: web.Request) -> web.Response:
+        return web.Response(text=metricas.exportar_prometheus(), content_type="text/plain", charset="utf-8")